@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Generate the phoneme EMG library used by the demo's Phoneme Builder.
+
+Takes the first --exemplars test-split windows of every phoneme (no TensorFlow model
+required) and writes the packed library format (see vocl_demo/utils/emg_library.py):
+    vocl_demo/data/phoneme_emg_library.npy
+    vocl_demo/data/phoneme_emg_library_index.npz
+
+--from-legacy repacks an old per-key phoneme_emg_library.npz instead (one exemplar each).
+
+Usage:
+    python3 generate_phoneme_library.py --exemplars 8
+    python3 generate_phoneme_library.py --from-legacy vocl_demo/data/phoneme_emg_library.npz
+"""
+
+import os
+import sys
+import argparse
+
+import numpy as np
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vocl_demo')
+sys.path.insert(0, DEMO_DIR)
+
+from utils.emg_library import LIBRARY_PATH, DEFAULT_CONFIDENCE, pack_exemplars, save_library
+
+
+def exemplars_from_test_split(max_exemplars, table=None):
+    """
+    {phoneme: [(emg, confidence, sample_index), ...]} from the test split, in class order.
+    
+    Without a prediction table the first test rows of each phoneme are taken with the
+    default confidence. With one (pipeline.PredictionTable over the test split), rows
+    are ranked by the model's probability for their true class, which is stored as the
+    exemplar's confidence.
+    """
+    from utils.pipeline import PHONEMES, X_DATA_PATH, Y_DATA_PATH, load_test_indices
+
+    X = np.load(X_DATA_PATH).reshape(-1, 4, 5)
+    y = np.load(Y_DATA_PATH)
+    test_indices = load_test_indices(n_samples=len(X))
+    y_test = y[test_indices]
+
+    exemplars = {}
+    phoneme_index = {}
+    for class_index, phoneme in enumerate(PHONEMES[1:], start=1):
+        positions = np.flatnonzero(y_test == class_index)
+        if table is None:
+            confidences = np.full(len(positions), DEFAULT_CONFIDENCE)
+        else:
+            confidences = table.probabilities[positions, class_index]
+            order = np.argsort(-confidences, kind='stable')
+            positions, confidences = positions[order], confidences[order]
+        exemplars[phoneme] = [
+            (X[test_indices[pos]], float(conf), int(test_indices[pos]))
+            for pos, conf in zip(positions[:max_exemplars], confidences[:max_exemplars])
+        ]
+        phoneme_index[phoneme] = class_index
+    return exemplars, phoneme_index
+
+
+def exemplars_from_legacy(path):
+    """Read the old {p}_emg / {p}_index / {p}_confidence / {p}_sample_idx npz."""
+    exemplars = {}
+    phoneme_index = {}
+    with np.load(path, allow_pickle=False) as data:
+        phonemes = data['metadata_phonemes'] if 'metadata_phonemes' in data else \
+            [k[:-len('_emg')] for k in data if k.endswith('_emg')]
+        for phoneme in map(str, phonemes):
+            exemplars[phoneme] = [(
+                data[f"{phoneme}_emg"],
+                float(data[f"{phoneme}_confidence"]) if f"{phoneme}_confidence" in data else DEFAULT_CONFIDENCE,
+                int(data[f"{phoneme}_sample_idx"]) if f"{phoneme}_sample_idx" in data else -1,
+            )]
+            phoneme_index[phoneme] = int(data[f"{phoneme}_index"]) if f"{phoneme}_index" in data else 0
+    return exemplars, phoneme_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the packed phoneme EMG library")
+    parser.add_argument('--exemplars', type=int, default=8, help="Exemplars kept per phoneme")
+    parser.add_argument('--from-legacy', metavar='NPZ', help="Repack an old per-key .npz library")
+    parser.add_argument('--output', default=LIBRARY_PATH)
+    args = parser.parse_args()
+
+    if args.from_legacy:
+        exemplars, phoneme_index = exemplars_from_legacy(args.from_legacy)
+    else:
+        exemplars, phoneme_index = exemplars_from_test_split(args.exemplars)
+
+    missing = [p for p, items in exemplars.items() if not items]
+    if missing:
+        print(f"No exemplars for: {' '.join(missing)}")
+
+    library = pack_exemplars(exemplars, phoneme_index)
+    save_library(library, args.output)
+    print(f"Saved {len(library)} phonemes x {library.exemplars} exemplars "
+          f"{library.emg.shape} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
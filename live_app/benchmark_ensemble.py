@@ -0,0 +1,103 @@
+"""
+Compare the multi-window-size ensemble against the single WINDOW_SIZE = 5 model.
+
+Each 30-sample test window from training_data1 is pushed through the shared
+StreamBuffer; every member scores the trailing slice that ends at the same sample,
+so all models see the same instant of the same stream.
+
+Usage (from live_app/):
+    python benchmark_ensemble.py
+    python benchmark_ensemble.py --model 10=../models/LSTM_10 --weights 5=1,10=0.5 --fusion log
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+from tensorflow.keras.models import load_model
+from ensemble import EnsemblePredictor, discover_models, parse_weights
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'chris_final', 'training_data1')
+X_STREAM = os.path.join(DATA_DIR, 'X_all44_413_4_30_30.npy')
+Y_STREAM = os.path.join(DATA_DIR, 'y_all44_413_4_30_30.npy')
+SINGLE_WINDOW = 5
+
+
+def load_stream_test_split(seed=489):
+    # Same split procedure as Model_Training_Final.ipynb (80/20, random_state=489)
+    from sklearn.model_selection import train_test_split
+
+    X = np.load(X_STREAM).astype(np.float32)
+    y = np.load(Y_STREAM)
+    _, X_test, _, y_test = train_test_split(X, y, test_size=0.2, random_state=seed)
+    return X_test, y_test
+
+
+def time_per_window(fn, repeats=200):
+    # Median single-window latency in milliseconds
+    fn()  # Warm-up (graph tracing)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ensemble vs single-model inference")
+    parser.add_argument('--model', action='append', default=[], help="Extra member as SIZE=PATH (repeatable)")
+    parser.add_argument('--weights', default='', help="Fusion weights as SIZE=W,SIZE=W")
+    parser.add_argument('--fusion', default='mean', choices=['mean', 'log'])
+    args = parser.parse_args()
+
+    model_paths = discover_models()
+    for item in args.model:
+        size, path = item.split('=', 1)
+        model_paths[int(size)] = path
+
+    if SINGLE_WINDOW not in model_paths:
+        raise FileNotFoundError(f"No model found for window size {SINGLE_WINDOW}")
+
+    print(f"Ensemble members: {model_paths}")
+
+    ensemble = EnsemblePredictor(model_paths, weights=parse_weights(args.weights), fusion=args.fusion, loader=load_model)
+    X_test, y_test = load_stream_test_split()
+
+    # Stream every test window through the shared buffer and collect trailing slices per size
+    windows = {size: [] for size in ensemble.window_sizes}
+    for example in X_test:
+        ensemble.reset()
+        ensemble.push(example.T)  # (30, 4) rows in time order
+        for size in ensemble.window_sizes:
+            windows[size].append(ensemble.buffer.window(size).copy())
+    windows = {size: np.stack(w) for size, w in windows.items()}
+
+    fused, member_probs = ensemble.predict_windows(windows)
+
+    print(f"\nTest windows: {len(y_test)}")
+    for size in ensemble.window_sizes:
+        accuracy = np.mean(np.argmax(member_probs[size], axis=1) == y_test)
+        print(f"  window {size:>2}: accuracy {accuracy:.4f}")
+    print(f"  ensemble : accuracy {np.mean(np.argmax(fused, axis=1) == y_test):.4f} ({args.fusion} fusion)")
+
+    # Single-window latency: single model, ensemble run concurrently, ensemble run serially
+    single_windows = {SINGLE_WINDOW: windows[SINGLE_WINDOW][:1]}
+    all_windows = {size: w[:1] for size, w in windows.items()}
+
+    single_ms = time_per_window(lambda: ensemble.predict_windows(single_windows))
+    parallel_ms = time_per_window(lambda: ensemble.predict_windows(all_windows))
+    serial_ms = time_per_window(
+        lambda: [ensemble._run_member(size, w) for size, w in all_windows.items()]
+    )
+
+    print(f"\nLatency per window (median):")
+    print(f"  single model (window {SINGLE_WINDOW}): {single_ms:.2f} ms")
+    print(f"  ensemble, concurrent      : {parallel_ms:.2f} ms")
+    print(f"  ensemble, serial          : {serial_ms:.2f} ms")
+
+    ensemble.close()
+
+
+if __name__ == "__main__":
+    main()
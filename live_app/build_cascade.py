@@ -0,0 +1,127 @@
+"""
+Train and calibrate the cascade's first stage, then measure the cascade on a recorded session.
+
+1. Fits logistic regression on window features (X_all44_3220_4_5_5 training split,
+   minus a held-out calibration slice)
+2. Calibrates its max-probability gate on the calibration slice so the windows it
+   answers agree with the full model at least --target-agreement of the time; the
+   test split is only used for the reported metrics
+3. Saves it as models/cascade_stage1_5.npz (pass to DataThread(cascade_stage1=...))
+4. Replays a recording window by window and reports escalation rate, agreement
+   with the full model and average CPU time per window vs the full model alone
+
+Usage (from live_app/):
+    python build_cascade.py
+    python build_cascade.py --recording ../data/chris_final/ABCs/silent_ABCs.csv --target-agreement 0.98
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from tensorflow.keras.models import load_model
+from cascade import CascadePredictor, FirstStageModel, calibrate_threshold
+
+LIVE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(LIVE_DIR, '..', 'data', 'chris_final', 'training_data1')
+MODEL_PATH = os.path.join(LIVE_DIR, 'LSTM_all44_seed489_5_5_224k')
+STAGE1_PATH = os.path.join(LIVE_DIR, '..', 'models', 'cascade_stage1_5.npz')
+RECORDING = os.path.join(LIVE_DIR, '..', 'data', 'chris_final', 'ABCs', 'silent_ABCs.csv')
+WINDOW_SIZE = 5
+
+
+def load_split(seed=489):
+    # Same split procedure as Model_Training_Final.ipynb (80/20, random_state=489)
+    from sklearn.model_selection import train_test_split
+
+    X = np.load(os.path.join(DATA_DIR, 'X_all44_3220_4_5_5.npy')).astype(np.float32)
+    y = np.load(os.path.join(DATA_DIR, 'y_all44_3220_4_5_5.npy'))
+    return train_test_split(X, y, test_size=0.2, random_state=seed)
+
+
+def load_recording_windows(csv_file):
+    # Same columns/cutoff as TestStreamThread, min-max normalized like the training data
+    column_names = [' EXG Channel 0', ' EXG Channel 1', ' EXG Channel 2', ' EXG Channel 3']
+    data = pd.read_csv(csv_file, skiprows=4, usecols=column_names)[10:]
+    data = (data - data.min()) / (data.max() - data.min())
+
+    samples = data.to_numpy(dtype=np.float32)
+    n = len(samples) // WINDOW_SIZE
+    # (n, WINDOW_SIZE, 4) -> (n, 4, WINDOW_SIZE)
+    return samples[:n * WINDOW_SIZE].reshape(n, WINDOW_SIZE, 4).transpose(0, 2, 1)
+
+
+def full_model_probs(model, windows, batch_size=1024):
+    return np.concatenate([
+        np.asarray(model(windows[i:i + batch_size], training=False))
+        for i in range(0, len(windows), batch_size)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and evaluate the two-stage cascade")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--recording', default=RECORDING)
+    parser.add_argument('--target-agreement', type=float, default=0.99)
+    parser.add_argument('--calibration-fraction', type=float, default=0.2,
+                        help="Share of the training split held out to calibrate the threshold")
+    parser.add_argument('--max-batch', type=int, default=16)
+    parser.add_argument('--output', default=STAGE1_PATH)
+    args = parser.parse_args()
+
+    model = load_model(args.model)
+    X_train, X_test, y_train, y_test = load_split()
+
+    # Calibration slice from the training split, so the test metrics stay unseen
+    from sklearn.model_selection import train_test_split
+    X_fit, X_cal, y_fit, _ = train_test_split(X_train, y_train, test_size=args.calibration_fraction,
+                                              random_state=489)
+
+    # 1-3. Train, calibrate against the full model's decisions, save
+    stage1 = FirstStageModel.fit(X_fit, y_fit)
+    full_cal = np.argmax(full_model_probs(model, X_cal), axis=1)
+    stage1.threshold = calibrate_threshold(stage1.predict_proba(X_cal), full_cal, args.target_agreement)
+    stage1.save(args.output)
+    print(f"Saved first stage to {args.output} (threshold {stage1.threshold:.4f})")
+
+    full_test = np.argmax(full_model_probs(model, X_test), axis=1)
+    cascade = CascadePredictor(stage1, model, max_batch=args.max_batch)
+    test_probs, test_escalated = cascade.predict_batch(X_test)
+    test_labels = np.argmax(test_probs, axis=1)
+    print(f"\nTest split ({len(y_test)} windows, not used for fitting or calibration):")
+    print(f"  full model accuracy: {np.mean(full_test == y_test):.4f}")
+    print(f"  cascade accuracy   : {np.mean(test_labels == y_test):.4f}")
+    print(f"  agreement with full: {np.mean(test_labels == full_test):.4f}")
+    print(f"  escalation rate    : {test_escalated.mean():.2%}")
+
+    # 4. Replay a recorded session one window at a time, as PredictionThread sees it
+    windows = load_recording_windows(args.recording)
+    reference = np.argmax(full_model_probs(model, windows), axis=1)
+
+    start = time.process_time()
+    for window in windows:
+        model(window[np.newaxis], training=False)
+    full_cpu = (time.process_time() - start) / len(windows)
+
+    cascade = CascadePredictor(stage1, model, max_batch=args.max_batch)
+    predictions = {}
+    start = time.process_time()
+    for i, window in enumerate(windows):
+        for key, probs, _ in cascade.submit(i, window):
+            predictions[key] = np.argmax(probs)
+    for key, probs, _ in cascade.flush():
+        predictions[key] = np.argmax(probs)
+    cascade_cpu = (time.process_time() - start) / len(windows)
+
+    cascade_labels = np.array([predictions[i] for i in range(len(windows))])
+
+    print(f"\nRecorded session {os.path.basename(args.recording)} ({len(windows)} windows):")
+    print(f"  escalation rate            : {cascade.escalation_rate:.2%}")
+    print(f"  agreement with full model  : {np.mean(cascade_labels == reference):.4f}")
+    print(f"  CPU per window, full model : {full_cpu * 1000:.3f} ms")
+    print(f"  CPU per window, cascade    : {cascade_cpu * 1000:.3f} ms (max batch {args.max_batch})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import numpy as np
+
+
+def window_features(windows):
+    """
+    Cheap per-window features for the first-stage classifier.
+
+    Args:
+        windows: Array of shape (N, 4, size), channel-major like the training data
+
+    Returns:
+        Array of shape (N, 4 * size + 16): raw samples plus per-channel mean/std/min/max
+    """
+    windows = np.asarray(windows, dtype=np.float32)
+    n = len(windows)
+    return np.concatenate([
+        windows.reshape(n, -1),
+        windows.mean(axis=2),
+        windows.std(axis=2),
+        windows.min(axis=2),
+        windows.max(axis=2),
+    ], axis=1)
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class FirstStageModel:
+    """
+    Multinomial logistic regression on window features, evaluated with plain numpy.
+
+    A forward pass is one (N, 36) x (36, 45) matrix product - microseconds per window.
+    """
+
+    def __init__(self, coef, intercept, mean, scale, threshold=1.0):
+        self.coef = np.asarray(coef, dtype=np.float32)  # (classes, features)
+        self.intercept = np.asarray(intercept, dtype=np.float32)  # (classes,)
+        self.mean = np.asarray(mean, dtype=np.float32)  # Feature standardization
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.threshold = float(threshold)  # Calibrated max-probability gate
+
+    @classmethod
+    def fit(cls, X, y, classes=45, C=1.0):
+        """Train on (N, 4, size) windows with scikit-learn (only needed offline)."""
+        from sklearn.linear_model import LogisticRegression
+
+        features = window_features(X)
+        mean = features.mean(axis=0)
+        scale = features.std(axis=0) + 1e-6
+
+        clf = LogisticRegression(C=C, max_iter=2000)
+        clf.fit((features - mean) / scale, y)
+
+        # Expand to all classes so column i is always PHONEMES[i]
+        coef = np.zeros((classes, features.shape[1]), dtype=np.float32)
+        intercept = np.full(classes, -1e4, dtype=np.float32)
+        coef[clf.classes_] = clf.coef_
+        intercept[clf.classes_] = clf.intercept_
+
+        return cls(coef, intercept, mean, scale)
+
+    def predict_proba(self, windows):
+        features = (window_features(windows) - self.mean) / self.scale
+        return _softmax(features @ self.coef.T + self.intercept)
+
+    def save(self, path):
+        np.savez(path, coef=self.coef, intercept=self.intercept,
+                 mean=self.mean, scale=self.scale, threshold=self.threshold)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['coef'], data['intercept'], data['mean'], data['scale'], float(data['threshold']))
+
+
+def calibrate_threshold(stage1_probs, reference_labels, target_agreement=0.99):
+    """
+    Lowest max-probability threshold whose accepted windows agree with the reference often enough.
+
+    Args:
+        stage1_probs: First-stage probabilities (N, classes) on a calibration set
+        reference_labels: Labels to agree with (full-model argmax, or ground truth)
+        target_agreement: Required agreement rate on the windows stage 1 would answer
+
+    Returns:
+        Threshold in [0, 1]; 1.0 means "always escalate"
+    """
+    confidence = stage1_probs.max(axis=1)
+    correct = np.argmax(stage1_probs, axis=1) == reference_labels
+
+    # Accept windows from most to least confident; agreement of each accepted prefix
+    order = np.argsort(confidence)[::-1]
+    prefix_agreement = np.cumsum(correct[order]) / np.arange(1, len(order) + 1)
+
+    passing = np.nonzero(prefix_agreement >= target_agreement)[0]
+    if len(passing) == 0:
+        return 1.0
+
+    # Largest accepted prefix meeting the target; gate just at its least confident window
+    return float(confidence[order[passing[-1]]])
+
+
+class CascadePredictor:
+    """
+    Two-stage cascade: the first stage answers confident windows, the full model the rest.
+
+    Windows are processed in arrival order. Confident windows queued behind an escalated
+    one wait for it, so results always come out in stream order.
+    """
+
+    def __init__(self, stage1, full_model, max_batch=16):
+        """
+        Args:
+            stage1: FirstStageModel with a calibrated threshold
+            full_model: Keras model (called directly, batched)
+            max_batch: Escalated windows per full-model call
+        """
+        self.stage1 = stage1
+        self.full_model = full_model
+        self.max_batch = max_batch
+
+        self.pending = []  # [(key, window, stage1_probs or None)]
+        self.escalated = 0
+        self.total = 0
+
+    def submit(self, key, window):
+        """
+        Score one (4, size) window with stage 1; queue it for the full model if unsure.
+
+        Returns:
+            List of (key, probabilities, stage) ready in stream order (may be empty)
+        """
+        probs = self.stage1.predict_proba(window[np.newaxis])[0]
+        self.total += 1
+
+        if probs.max() >= self.stage1.threshold:
+            self.pending.append((key, window, probs))
+        else:
+            self.pending.append((key, window, None))
+            self.escalated += 1
+
+        waiting = sum(1 for _, _, p in self.pending if p is None)
+        if waiting >= self.max_batch or waiting == 0:
+            return self.flush()
+        return []
+
+    def flush(self):
+        """Run the full model once over every escalated window and release the queue."""
+        if not self.pending:
+            return []
+
+        escalated = [i for i, (_, _, probs) in enumerate(self.pending) if probs is None]
+        full_probs = {}
+        if escalated:
+            batch = np.stack([self.pending[i][1] for i in escalated]).astype(np.float32)
+            output = np.asarray(self.full_model(batch, training=False))
+            full_probs = dict(zip(escalated, output))
+
+        results = []
+        for i, (key, _, probs) in enumerate(self.pending):
+            if probs is None:
+                results.append((key, full_probs[i], 'full'))
+            else:
+                results.append((key, probs, 'stage1'))
+
+        self.pending = []
+        return results
+
+    def predict_batch(self, windows):
+        """
+        Offline cascade over an (N, 4, size) array: one stage-1 pass, one batched full pass.
+
+        Returns:
+            Tuple of (probabilities (N, classes), escalated mask (N,))
+        """
+        windows = np.asarray(windows, dtype=np.float32)
+        probs = self.stage1.predict_proba(windows)
+        escalate = probs.max(axis=1) < self.stage1.threshold
+
+        escalated = np.nonzero(escalate)[0]
+        for start in range(0, len(escalated), self.max_batch):
+            idx = escalated[start:start + self.max_batch]
+            probs[idx] = np.asarray(self.full_model(windows[idx], training=False))
+
+        return probs, escalate
+
+    @property
+    def escalation_rate(self):
+        return self.escalated / self.total if self.total else 0.0
@@ -0,0 +1,88 @@
+"""
+Decode a recording utterance by utterance with the CTC sequence model, offline.
+
+Utterances are the BUTTON (EXG Channel 4) segments of the recording, or one --start/--end
+range. All of them are decoded in one batched forward pass. With --compare the script also
+replays the same samples through the windowed production model one 5-sample window at a
+time, as PredictionThread does, and reports the cost per second of signal for both.
+
+Usage (from live_app/):
+    python decode_utterance.py --model ../models/LSTM_all44_ctc_64_64
+    python decode_utterance.py --model ../models/LSTM_all44_ctc_64_64 --start 6300 --end 7100 --compare
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from sequence_model import SAMPLE_RATE, SequenceDecoder, button_segments
+
+LIVE_DIR = os.path.dirname(os.path.abspath(__file__))
+WINDOW_MODEL = os.path.join(LIVE_DIR, 'LSTM_all44_seed489_5_5_224k')
+RECORDING = os.path.join(LIVE_DIR, '..', 'data', 'chris_final', 'ABCs', 'silent_ABCs.csv')
+WINDOW_SIZE = 5
+
+
+def load_recording(csv_file):
+    # Same columns/cutoff as TestStreamThread, min-max normalized like the training data
+    column_names = [' EXG Channel 0', ' EXG Channel 1', ' EXG Channel 2', ' EXG Channel 3', ' EXG Channel 4']
+    data = pd.read_csv(csv_file, skiprows=4, usecols=column_names)[10:]
+    channels = data[column_names[:4]]
+    signal = ((channels - channels.min()) / (channels.max() - channels.min())).to_numpy(dtype=np.float32)
+    return signal, data[column_names[4]].to_numpy()
+
+
+def window_loop(model, buffers):
+    # One model call per WINDOW_SIZE chunk, channel-major like the live predictor
+    for buffer in buffers:
+        for start in range(0, len(buffer) - WINDOW_SIZE + 1, WINDOW_SIZE):
+            model(buffer[start:start + WINDOW_SIZE].T[np.newaxis], training=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode recorded utterances with the CTC sequence model")
+    parser.add_argument('--model', required=True, help="Saved model from train_sequence.py")
+    parser.add_argument('--recording', default=RECORDING)
+    parser.add_argument('--start', type=int, help="First sample of a single utterance (skips BUTTON segmentation)")
+    parser.add_argument('--end', type=int)
+    parser.add_argument('--compare', action='store_true', help="Also time the window-by-window loop")
+    parser.add_argument('--window-model', default=WINDOW_MODEL)
+    args = parser.parse_args()
+
+    signal, button = load_recording(args.recording)
+    if args.start is not None or args.end is not None:
+        spans = [(args.start or 0, args.end or len(signal))]
+    else:
+        spans = button_segments(button)
+    buffers = [signal[start:end] for start, end in spans]
+
+    decoder = SequenceDecoder(args.model)
+    decoder.decode(buffers[:1])  # Warm-up (graph tracing)
+
+    start = time.perf_counter()
+    decoded = decoder.decode(buffers)
+    sequence_time = time.perf_counter() - start
+
+    for (begin, end), phonemes in zip(spans, decoded):
+        print(f"[{begin:>7}, {end:>7}) {' '.join(phonemes) or '_'}")
+
+    seconds = sum(len(b) for b in buffers) / SAMPLE_RATE
+    print(f"\n{len(buffers)} utterances, {seconds:.2f}s of signal")
+    print(f"Sequence model (one batched pass): {sequence_time * 1000 / seconds:8.2f} ms per second of signal")
+
+    if args.compare:
+        from tensorflow.keras.models import load_model
+
+        model = load_model(args.window_model)
+        window_loop(model, buffers[:1])  # Warm-up
+
+        start = time.perf_counter()
+        window_loop(model, buffers)
+        loop_time = time.perf_counter() - start
+        print(f"Window loop ({WINDOW_SIZE}-sample windows):   {loop_time * 1000 / seconds:8.2f} ms per second of signal")
+        print(f"Speed-up: {loop_time / sequence_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+CHANNELS = 4  # DLI, OOS, OOI, PLA
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models')
+MODEL_TEMPLATE = "LSTM_all44_seed489_{size}_{size}_224k"  # Naming used by Model_Training_Final.ipynb
+ENSEMBLE_WINDOW_SIZES = [5, 10, 20, 30]  # Window sizes we have training sets for
+
+
+def discover_models(model_dir=MODEL_DIR, window_sizes=ENSEMBLE_WINDOW_SIZES):
+    """
+    Find trained models for each window size following the notebook naming scheme.
+
+    Returns:
+        Dictionary mapping window size to model path (only sizes that exist on disk)
+    """
+    models = {}
+    for size in window_sizes:
+        path = os.path.join(model_dir, MODEL_TEMPLATE.format(size=size))
+        if os.path.exists(path):
+            models[size] = path
+    return models
+
+
+class StreamBuffer:
+    """
+    Shared rolling buffer of the most recent samples, stored channel-major (4, capacity).
+
+    Every sample is written twice (at pos and pos + capacity) so the latest `size`
+    samples are always one contiguous slice - windows are views, never copies.
+    """
+
+    def __init__(self, capacity, channels=CHANNELS):
+        self.capacity = capacity
+        self.channels = channels
+        self.data = np.zeros((channels, 2 * capacity), dtype=np.float32)
+        self.pos = 0  # Next write position in [0, capacity)
+        self.count = 0  # Total samples written
+
+    def append(self, samples):
+        # samples: (n, channels) rows in time order, like the DataFrame chunks from ProcessingThread
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim == 1:
+            samples = samples.reshape(1, -1)
+
+        # Only the newest `capacity` samples can ever be read back
+        samples = samples[-self.capacity:]
+        n = len(samples)
+
+        idx = (self.pos + np.arange(n)) % self.capacity
+        self.data[:, idx] = samples.T
+        self.data[:, idx + self.capacity] = samples.T
+
+        self.pos = (self.pos + n) % self.capacity
+        self.count += n
+
+    def window(self, size):
+        # View of the last `size` samples, shape (channels, size), oldest first
+        if size > self.capacity:
+            raise ValueError(f"Window size {size} exceeds buffer capacity {self.capacity}")
+        end = self.pos + self.capacity
+        return self.data[:, end - size:end]
+
+    def has(self, size):
+        return self.count >= size
+
+    def reset(self):
+        self.data[:] = 0
+        self.pos = 0
+        self.count = 0
+
+
+class EnsemblePredictor:
+    """
+    Runs one model per window size over the same stream and fuses their softmax outputs.
+
+    All windows end at the newest sample, so every member scores the same instant.
+    Members run concurrently on a thread pool (TensorFlow releases the GIL inside ops),
+    so adding models costs roughly the slowest member rather than the sum of all of them.
+    """
+
+    def __init__(self, model_paths, weights=None, fusion='mean', loader=None):
+        """
+        Args:
+            model_paths: Dictionary mapping window size to model path (or loaded model)
+            weights: Optional dictionary mapping window size to fusion weight (default: equal)
+            fusion: 'mean' (weighted arithmetic mean) or 'log' (weighted geometric mean)
+            loader: Callable used to load model paths (default: keras load_model)
+        """
+        if not model_paths:
+            raise ValueError("EnsemblePredictor needs at least one model")
+        if fusion not in ('mean', 'log'):
+            raise ValueError(f"Unknown fusion mode: {fusion}")
+
+        if loader is None:
+            from tensorflow.keras.models import load_model
+            loader = load_model
+
+        self.window_sizes = sorted(model_paths)
+        self.models = {}
+        for size in self.window_sizes:
+            model = model_paths[size]
+            self.models[size] = loader(model) if isinstance(model, str) else model
+
+        weights = weights or {}
+        self.weights = {size: float(weights.get(size, 1.0)) for size in self.window_sizes}
+        self.fusion = fusion
+
+        self.buffer = StreamBuffer(max(self.window_sizes))
+        self.executor = ThreadPoolExecutor(max_workers=len(self.window_sizes), thread_name_prefix="ensemble")
+
+    def push(self, samples):
+        # Add newly processed samples (n, channels) to the shared buffer
+        self.buffer.append(samples)
+
+    def reset(self):
+        self.buffer.reset()
+
+    def _run_member(self, size, windows):
+        # windows: (batch, channels, size)
+        return np.asarray(self.models[size](windows, training=False))
+
+    def predict_windows(self, windows_by_size):
+        """
+        Run every member concurrently and fuse the results.
+
+        Args:
+            windows_by_size: Dictionary mapping window size to a (batch, 4, size) array;
+                             all batches must be time-aligned row for row
+
+        Returns:
+            Tuple of (fused_probabilities (batch, classes), member_probabilities dict)
+        """
+        futures = {
+            size: self.executor.submit(self._run_member, size, windows)
+            for size, windows in windows_by_size.items()
+        }
+        member_probs = {size: future.result() for size, future in futures.items()}
+        return self.fuse(member_probs), member_probs
+
+    def fuse(self, member_probs):
+        # Renormalize weights over the members that actually produced output
+        sizes = list(member_probs)
+        weights = np.array([self.weights[size] for size in sizes], dtype=np.float64)
+        weights = weights / weights.sum()
+
+        stacked = np.stack([member_probs[size] for size in sizes])  # (members, batch, classes)
+
+        if self.fusion == 'log':
+            fused = np.exp(np.tensordot(weights, np.log(stacked + 1e-12), axes=1))
+            return fused / fused.sum(axis=-1, keepdims=True)
+
+        return np.tensordot(weights, stacked, axes=1)
+
+    def predict(self):
+        """
+        Score the newest instant in the shared buffer with every member that has enough samples.
+
+        Returns:
+            Fused probability vector (classes,), or None if no member has a full window yet
+        """
+        windows = {
+            size: self.buffer.window(size)[np.newaxis]
+            for size in self.window_sizes
+            if self.buffer.has(size)
+        }
+        if not windows:
+            return None
+
+        fused, _ = self.predict_windows(windows)
+        return fused[0]
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+def parse_weights(spec):
+    """Parse a "5=1.0,10=0.5" weight string into {5: 1.0, 10: 0.5}."""
+    weights = {}
+    if spec:
+        for item in spec.split(','):
+            size, weight = item.split('=')
+            weights[int(size)] = float(weight)
+    return weights
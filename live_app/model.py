@@ -7,11 +7,16 @@ from queue import Queue
 from collections import deque
 from tensorflow.keras.models import load_model
 import helper
+from ensemble import EnsemblePredictor
+from cascade import CascadePredictor, FirstStageModel
+from streaming import StreamingPredictor
+from sequence_model import SequenceDecoder
 
 ## GLOBALS
 data_queue = Queue() # Queue to store data indices
 processed_data_queue = Queue() # Queue to store processed data
 predictions_queue = helper.buffer_queue # Queue to store predictions
+UTTERANCE_START = 'utterance_start' # Marker queued ahead of the first chunk of each button press
 
 PHONEMES = ['_', 'B', 'D', 'F', 'G', 'HH', 'JH', 'K', 'L', 'M', 'N', 'P', 'R', 'S', 'T', 'V', 'W', 'Y', 'Z', 'CH', 'SH', 'NG', 'DH', 'TH', 'ZH', 'WH', 'AA', 'AI(R)', 'I(R)', 'A(R)', 'ER', 'EY', 'IY', 'AY', 'OW', 'UW', 'AE', 'EH', 'IH', 'AO', 'AH', 'UH', 'OO', 'AW', 'OY']
 WINDOW_SIZE = 5  # Number of data points to be used for prediction
@@ -19,13 +24,27 @@ WINDOW_SIZE = 5  # Number of data points to be used for prediction
 EMG_DATA = pd.DataFrame() # DataFrame to store EMG data
 CURRENT_PHONEMES = [] # List to store current phonemes
 
+def to_window(data_chunk):
+    # Chunks are (samples, channels) DataFrames; the model was trained on (channels, samples) windows
+    return np.asarray(data_chunk, dtype=np.float32).T
+
 class DataThread(threading.Thread):
-    def __init__(self, threadID, csv_file, model_path):
+    def __init__(self, threadID, csv_file, model_path, ensemble_models=None, ensemble_weights=None, cascade_stage1=None,
+                 streaming_model=None, sequence_model=None):
         threading.Thread.__init__(self)
         self.threadID = threadID
         self.daemon = True  # The thread will exit when the main program exits
         self.csv_file = csv_file  # Mock CSV file path
         self.model_path = model_path  # LSTM/RNN model path
+        self.ensemble_models = ensemble_models  # Optional {window_size: model_path} for ensemble mode
+        self.ensemble_weights = ensemble_weights  # Optional {window_size: weight} for ensemble mode
+        self.cascade_stage1 = cascade_stage1  # Optional first-stage model path (.npz) for cascade mode
+        self.streaming_model = streaming_model  # Optional streaming model path for hop-1 inference
+        self.sequence_model = sequence_model  # Optional CTC model path for whole-utterance decoding
+
+        if cascade_stage1 and (ensemble_models or streaming_model):
+            # Fail here, in the caller's thread, rather than inside run()
+            raise ValueError("cascade_stage1 can't be combined with ensemble_models or streaming_model")
 
         # Logging
         
@@ -48,9 +67,15 @@ class DataThread(threading.Thread):
 
     def run(self):
         # Create threads
-        stream_thread = TestStreamThread(1.1, self.csv_file, self.logger)
-        process_thread = ProcessingThread(1.2, self.logger)
-        predict_thread = PredictionThread(1.3, self.model_path, self.logger)
+        sequence_decoder = SequenceDecoder(self.sequence_model) if self.sequence_model else None
+        stream_thread = TestStreamThread(1.1, self.csv_file, self.logger, sequence_decoder=sequence_decoder)
+        process_thread = ProcessingThread(1.2, self.logger,
+                                          aligned_chunks=bool(self.ensemble_models or self.streaming_model))
+        predict_thread = PredictionThread(1.3, self.model_path, self.logger,
+                                          ensemble_models=self.ensemble_models,
+                                          ensemble_weights=self.ensemble_weights,
+                                          cascade_stage1=self.cascade_stage1,
+                                          streaming_model=self.streaming_model)
 
         # Start Threads
         if helper.ready_state.is_set():
@@ -72,7 +97,7 @@ class DataThread(threading.Thread):
 #         self.logger.info(f"Thread {self.threadID} initialized.")
 
 class TestStreamThread(threading.Thread):
-    def __init__(self, threadID, csv_file, logger):
+    def __init__(self, threadID, csv_file, logger, sequence_decoder=None):
         threading.Thread.__init__(self)
         self.threadID = threadID
         self.daemon = True  # The thread will exit when the main program exits
@@ -82,6 +107,8 @@ class TestStreamThread(threading.Thread):
         self.memory_limit = 1e7 # Memory limit for the DataFrame
         self.chunks_ingested = 0 # Number of chunks ingested
         self.current_chunk = 0 # Current chunk being processed
+        self.utterance_start = None # First chunk of the current button press
+        self.sequence_decoder = sequence_decoder # Optional SequenceDecoder for the final pass
         
         self.logger = logger
         self.logger.info(f"Thread {self.threadID} initialized.")
@@ -126,12 +153,17 @@ class TestStreamThread(threading.Thread):
             if EMG_DATA.memory_usage(index=True, deep=True).sum() > self.memory_limit:
                 EMG_DATA = EMG_DATA[WINDOW_SIZE:]
                 self.current_chunk -= 1
+                if self.utterance_start is not None:
+                    self.utterance_start = max(self.utterance_start - 1, 0)
 
             # If the button is in the 'running' state
             if helper.button_state.is_set():
                 self.logger.info("Button is in 'running' state.")
 
-                # Update the button state
+                # Update the button state (remember where the utterance started)
+                if not self.running_state:
+                    self.utterance_start = self.current_chunk
+                    helper.queuePut(data_queue, UTTERANCE_START)
                 self.running_state = True
 
                 # Put the chunk indices in the queue
@@ -142,13 +174,15 @@ class TestStreamThread(threading.Thread):
                 self.logger.info("Button just set to 'stopped' state.")
 
                 # Create a thread to process the final phonemes
-                final_processing_thread = FinalProcessing(4, self.logger)
+                final_processing_thread = FinalProcessing(4, self.logger, sequence_decoder=self.sequence_decoder,
+                                                          chunks=(self.utterance_start, self.current_chunk))
 
                 # Start the thread
                 final_processing_thread.start()
 
                 # Update the button state
                 self.running_state = False
+                self.utterance_start = None
 
             # If the button is and has been in the 'stopped' state
             else:
@@ -162,10 +196,11 @@ class TestStreamThread(threading.Thread):
             time.sleep(0.004)  
 
 class ProcessingThread(threading.Thread):
-    def __init__(self, threadID, logger):
+    def __init__(self, threadID, logger, aligned_chunks=False):
         threading.Thread.__init__(self)
         self.threadID = threadID
         self.daemon = True  # The thread will exit when the main program exits
+        self.aligned_chunks = aligned_chunks # Slice chunk k at row k*WINDOW_SIZE (ensemble/streaming modes)
         
         self.logger = logger
         self.logger.info(f"Thread {self.threadID} initialized.")
@@ -177,24 +212,52 @@ class ProcessingThread(threading.Thread):
             # Get the chunk index from the queue
             index = helper.queueGet(data_queue)
 
+            # Pass utterance boundaries through in order with the chunks
+            if index == UTTERANCE_START:
+                helper.queuePut(processed_data_queue, UTTERANCE_START)
+                continue
+
             self.logger.info(f"Processing data chunk {index}.")
 
             # Normalize the data using Min-Max normalization
             df_normalized = (EMG_DATA - EMG_DATA.min()) / (EMG_DATA.max() - EMG_DATA.min())
 
-            # Get the data chunk
-            data_chunk = df_normalized.iloc[index:index + WINDOW_SIZE]
+            # Get the data chunk. Ensemble and streaming modes need consecutive, non-overlapping
+            # chunks (chunk indices count WINDOW_SIZE-row chunks) to rebuild the stream
+            start = index * WINDOW_SIZE if self.aligned_chunks else index
+            data_chunk = df_normalized.iloc[start:start + WINDOW_SIZE]
 
             # Put the processed data in the queue
             helper.queuePut(processed_data_queue, {index : data_chunk})
 
 class PredictionThread(threading.Thread):
-    def __init__(self, threadID, model_path, logger):
+    def __init__(self, threadID, model_path, logger, ensemble_models=None, ensemble_weights=None, cascade_stage1=None,
+                 streaming_model=None):
         threading.Thread.__init__(self)
         self.threadID = threadID
         self.daemon = True  # The thread will exit when the main program exits
 
-        self.model = load_model(model_path) # Load LSTM/RNN model
+        self.ensemble = None
+        self.cascade = None
+        self.streamer = None
+
+        if streaming_model:
+            # Streaming mode: one prediction per sample, carrying conv/LSTM state across chunks
+            self.model = None
+            self.streamer = StreamingPredictor.from_keras(load_model(streaming_model))
+        elif ensemble_models:
+            # Ensemble mode: one model per window size, all fed from one shared buffer
+            self.model = None
+            self.ensemble = EnsemblePredictor(ensemble_models, weights=ensemble_weights, loader=load_model)
+        else:
+            self.model = load_model(model_path) # Load LSTM/RNN model
+
+        if cascade_stage1 and self.model is None:
+            # The cascade escalates to the single full model, which these modes don't load
+            raise ValueError("cascade_stage1 can't be combined with ensemble_models or streaming_model")
+        if cascade_stage1:
+            # Cascade mode: tiny first stage answers confident windows, full model the rest
+            self.cascade = CascadePredictor(FirstStageModel.load(cascade_stage1), self.model)
 
         helper.ready_state.set() # Set the ready state
         
@@ -204,48 +267,107 @@ class PredictionThread(threading.Thread):
     def run(self):
         self.logger.info(f"Thread {self.threadID} started.")
 
-        global CURRENT_PHONEMES
-
         while True:
             # Get the processed data from the queue
             data = helper.queueGet(processed_data_queue)
 
+            # New button press: don't carry conv/LSTM state over from the previous utterance
+            if data == UTTERANCE_START:
+                if self.streamer is not None:
+                    self.streamer.reset()
+                continue
+
+            index, data_chunk = list(data.items())[0]
+
+            if self.cascade is not None:
+                self.run_cascade(index, data_chunk)
+                continue
+
+            if self.streamer is not None:
+                self.run_streaming(index, data_chunk)
+                continue
+
             # Predict phoneme
-            phoneme = self.predict_phoneme(list(data.values())[0])
+            phoneme = self.predict_phoneme(data_chunk)
 
-            self.logger.info(f"Predicted phoneme {list(data.keys())[0]}: {phoneme}.")
+            self.logger.info(f"Predicted phoneme {index}: {phoneme}.")
 
-            # Create a response to be sent to the main application
-            response = {
-            "responseType": "singlePhoneme",
-            "body": {
-                "class": phoneme,
-                "id": list(data.keys())[0],
-                "row": 4,
-                "col": WINDOW_SIZE,
-                "data": list(data.values())[0]
-                }
+            self.publish(index, phoneme, data_chunk)
+
+    def publish(self, index, phoneme, data_chunk):
+        global CURRENT_PHONEMES
+
+        # Create a response to be sent to the main application
+        response = {
+        "responseType": "singlePhoneme",
+        "body": {
+            "class": phoneme,
+            "id": index,
+            "row": 4,
+            "col": WINDOW_SIZE,
+            "data": data_chunk
             }
+        }
+
+        # Add the response to the queue
+        helper.queuePut(predictions_queue, response)
 
-            # Add the response to the queue
-            helper.queuePut(predictions_queue, response)
+        # Add the phoneme to the list of current phonemes
+        CURRENT_PHONEMES.append(phoneme)
 
-            # Add the phoneme to the list of current phonemes
-            CURRENT_PHONEMES.append(phoneme)
+    def run_cascade(self, index, data_chunk):
+        # Stage 1 answers confident windows; unsure ones wait for a batched full-model call
+        results = self.cascade.submit((index, data_chunk), to_window(data_chunk))
+
+        # Nothing else waiting upstream - don't hold escalated windows back any longer
+        if processed_data_queue.empty():
+            results += self.cascade.flush()
+
+        for (key, chunk), prediction, stage in results:
+            phoneme = PHONEMES[np.argmax(prediction)]
+            self.logger.info(f"Predicted phoneme {key} ({stage}): {phoneme}.")
+            self.publish(key, phoneme, chunk)
+
+    def run_streaming(self, index, data_chunk):
+        # Hop of 1 sample: advance the stream row by row, each step costs the same
+        predictions = self.streamer.step_many(np.asarray(data_chunk, dtype=np.float32))
+
+        for offset, prediction in enumerate(predictions):
+            sample_id = index * WINDOW_SIZE + offset
+            phoneme = PHONEMES[np.argmax(prediction)]
+            self.logger.info(f"Predicted phoneme {sample_id} (streaming): {phoneme}.")
+            self.publish(sample_id, phoneme, data_chunk.iloc[offset:offset + 1])
 
     def predict_phoneme(self, input_data):
+        if self.ensemble is not None:
+            return self.predict_phoneme_ensemble(input_data)
+
         # Predict class softmax probabilities
-        prediction = self.model.predict(np.array(input_data).reshape(1, 4, 5), verbose=0)
+        prediction = self.model.predict(to_window(input_data)[np.newaxis], verbose=0)
 
         # Return the phoneme with the highest probability
         return PHONEMES[np.argmax(prediction, axis=1)[0]]
 
+    def predict_phoneme_ensemble(self, input_data):
+        # Add the new chunk to the shared buffer, then score the newest instant with every model
+        self.ensemble.push(np.asarray(input_data))
+        prediction = self.ensemble.predict()
+
+        # Not enough samples buffered yet for any model
+        if prediction is None:
+            return PHONEMES[0]
+
+        return PHONEMES[np.argmax(prediction)]
+
 class FinalProcessing(threading.Thread):
-    def __init__(self, threadID, logger):
+    def __init__(self, threadID, logger, sequence_decoder=None, chunks=None):
         threading.Thread.__init__(self)
         self.threadID = threadID
         self.daemon = True
 
+        self.sequence_decoder = sequence_decoder # Optional SequenceDecoder
+        self.chunks = chunks # (first, end) chunk indices of the utterance in EMG_DATA
+
         self.logger = logger
 
     def run(self):
@@ -255,16 +377,12 @@ class FinalProcessing(threading.Thread):
 
         self.logger.info(f"Phoneme list: {CURRENT_PHONEMES}")
 
-        # Initialize the processed list with the first phoneme
-        processed_phonemes = [CURRENT_PHONEMES[0]]
-        
-        # Iterate through the predicted phonemes
-        for phoneme in CURRENT_PHONEMES[1:]:
-            # If the current phoneme is different from the last phoneme in the processed list
-            # or it's a space (representing a pause), append it to the processed list
-            if phoneme != processed_phonemes[-1] or phoneme == '-':
-                processed_phonemes.append(phoneme)
-                
+        if self.sequence_decoder is not None and self.chunks is not None:
+            # Decode the whole utterance in one forward pass instead of merging window predictions
+            processed_phonemes = self.decode_utterance() or [PHONEMES[0]]
+        else:
+            processed_phonemes = self.merge_window_phonemes()
+
         # Convert the list of processed phonemes to a string
         phoneme_string = ' '.join(processed_phonemes)
 
@@ -290,3 +408,26 @@ class FinalProcessing(threading.Thread):
 
         # Clear the predicted phonemes list
         CURRENT_PHONEMES = []
+
+    def merge_window_phonemes(self):
+        # Initialize the processed list with the first phoneme
+        processed_phonemes = [CURRENT_PHONEMES[0]]
+        
+        # Iterate through the predicted phonemes
+        for phoneme in CURRENT_PHONEMES[1:]:
+            # If the current phoneme is different from the last phoneme in the processed list
+            # or it's a space (representing a pause), append it to the processed list
+            if phoneme != processed_phonemes[-1] or phoneme == '-':
+                processed_phonemes.append(phoneme)
+
+        return processed_phonemes
+
+    def decode_utterance(self):
+        # Normalize like ProcessingThread, then take every sample of the button press
+        df_normalized = (EMG_DATA - EMG_DATA.min()) / (EMG_DATA.max() - EMG_DATA.min())
+        first, end = self.chunks
+        utterance = df_normalized.iloc[first * WINDOW_SIZE:end * WINDOW_SIZE].to_numpy(dtype=np.float32)
+
+        phonemes = self.sequence_decoder.decode_one(utterance)
+        self.logger.info(f"Sequence model decoded {len(utterance)} samples: {phonemes}")
+        return phonemes
@@ -0,0 +1,156 @@
+import numpy as np
+
+PHONEMES = ['_', 'B', 'D', 'F', 'G', 'HH', 'JH', 'K', 'L', 'M', 'N', 'P', 'R', 'S', 'T', 'V', 'W', 'Y', 'Z', 'CH', 'SH', 'NG', 'DH', 'TH', 'ZH', 'WH', 'AA', 'AI(R)', 'I(R)', 'A(R)', 'ER', 'EY', 'IY', 'AY', 'OW', 'UW', 'AE', 'EH', 'IH', 'AO', 'AH', 'UH', 'OO', 'AW', 'OY']
+CHANNELS = 4
+SAMPLE_RATE = 250  # Hz (4ms between samples)
+BLANK = 0  # '_' (silence/rest) doubles as the CTC blank
+FRAME_STRIDE = 2  # Samples per output frame (the first conv is strided)
+CONV_KERNEL = 5  # Samples seen by each output frame
+
+
+def build_sequence_model(filters=64, units=64):
+    """
+    Utterance-level CTC model over whole variable-length segments.
+
+    Inputs are [samples (batch, time, 4), lengths (batch,)]; the output is per-frame
+    logits over PHONEMES at SAMPLE_RATE / FRAME_STRIDE, and the bidirectional LSTM gives
+    every frame the whole utterance as context.
+
+    The strided conv pads explicitly (CONV_KERNEL // 2 zeros on each side, then 'valid'),
+    so frame i always covers samples 2i-2 .. 2i+2 - with padding='same' the left padding
+    depends on whether T is odd or even, and a row would see different frames alone than
+    inside a longer padded batch. Together with the lengths masking the batch padding
+    in the LSTM, a padded batch decodes like its rows one by one.
+    """
+    import tensorflow as tf
+    from tensorflow.keras import layers
+
+    samples = layers.Input(shape=(None, CHANNELS), name='samples')
+    lengths = layers.Input(shape=(), dtype='int32', name='lengths')
+
+    x = layers.ZeroPadding1D(CONV_KERNEL // 2)(samples)
+    x = layers.Conv1D(filters, CONV_KERNEL, strides=FRAME_STRIDE, activation='relu', padding='valid')(x)
+    mask = layers.Lambda(
+        lambda args: tf.sequence_mask((args[0] + FRAME_STRIDE - 1) // FRAME_STRIDE, tf.shape(args[1])[1]),
+        name='frame_mask'
+    )([lengths, x])
+    x = layers.Bidirectional(layers.LSTM(units, return_sequences=True))(x, mask=mask)
+    logits = layers.Dense(len(PHONEMES), name='logits')(x)
+
+    return tf.keras.Model([samples, lengths], logits)
+
+
+def frame_lengths(sample_lengths):
+    """Number of output frames for each input length (ceil division by the stride)."""
+    return (np.asarray(sample_lengths) + FRAME_STRIDE - 1) // FRAME_STRIDE
+
+
+def pad_batch(buffers):
+    """
+    Stack variable-length (T_i, 4) buffers into one zero-padded batch.
+
+    Returns:
+        Tuple of (batch (N, T_max, 4) float32, lengths (N,) int32)
+    """
+    lengths = np.array([len(b) for b in buffers], dtype=np.int32)
+    batch = np.zeros((len(buffers), max(lengths.max(), 1), CHANNELS), dtype=np.float32)
+    for i, buffer in enumerate(buffers):
+        batch[i, :len(buffer)] = buffer
+    return batch, lengths
+
+
+def greedy_decode(logits, frames):
+    """
+    Best-path CTC decoding: argmax per frame, collapse repeats, drop blanks.
+
+    Args:
+        logits: Array (N, frames_max, classes)
+        frames: Valid frames per row
+
+    Returns:
+        List of phoneme index lists
+    """
+    best = np.argmax(logits, axis=2)
+    sequences = []
+    for path, length in zip(best, frames):
+        path = path[:length]
+        # Keep a frame if it differs from the previous one and isn't blank
+        keep = np.concatenate([[True], path[1:] != path[:-1]]) & (path != BLANK)
+        sequences.append(path[keep].tolist())
+    return sequences
+
+
+def button_segments(button, rolling_window=5):
+    """
+    Start/end indices of button-pressed segments, as in Data_Processing_Final.ipynb.
+
+    Args:
+        button: Raw BUTTON (EXG Channel 4) values; min-max normalized, rounded and
+            flipped here so 1 means pressed
+        rolling_window: Centered rolling max that bridges short dropouts
+
+    Returns:
+        List of (start, end) sample indices
+    """
+    button = np.asarray(button, dtype=np.float64)
+    span = button.max() - button.min()
+    pressed = 1.0 - np.round((button - button.min()) / span if span else np.zeros_like(button))
+
+    # Centered rolling max (NaN edges in pandas never count as a change)
+    half = rolling_window // 2
+    windows = np.lib.stride_tricks.sliding_window_view(pressed, rolling_window)
+    rolling = np.zeros_like(pressed)
+    rolling[half:len(pressed) - half] = windows.max(axis=1)
+
+    change = np.diff(rolling, prepend=rolling[0])
+    starts = np.nonzero(change == 1)[0].tolist()
+    ends = np.nonzero(change == -1)[0].tolist()
+    if rolling[0] == 1:
+        starts.insert(0, 0)
+    if rolling[-1] == 1:
+        ends.append(len(rolling) - 1)
+    return list(zip(starts, ends))
+
+
+def edit_distance(a, b):
+    """Levenshtein distance between two phoneme sequences."""
+    row = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        previous, row[0] = row[0], i
+        for j, y in enumerate(b, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (x != y))
+    return row[-1]
+
+
+class SequenceDecoder:
+    """Decode whole utterance buffers into phoneme sequences in a single batched pass."""
+
+    def __init__(self, model):
+        """
+        Args:
+            model: Path to a saved model from build_sequence_model(), or the model itself
+        """
+        if isinstance(model, str):
+            import tensorflow as tf
+            model = tf.keras.models.load_model(model, compile=False)
+        self.model = model
+
+    def logits(self, buffers):
+        batch, lengths = pad_batch(buffers)
+        return np.asarray(self.model([batch, lengths], training=False)), frame_lengths(lengths)
+
+    def decode(self, buffers):
+        """
+        Args:
+            buffers: List of (T_i, 4) normalized sample arrays (time-major)
+
+        Returns:
+            List of phoneme lists, one per buffer
+        """
+        if not buffers:
+            return []
+        logits, frames = self.logits(buffers)
+        return [[PHONEMES[i] for i in sequence] for sequence in greedy_decode(logits, frames)]
+
+    def decode_one(self, buffer):
+        return self.decode([np.asarray(buffer, dtype=np.float32)])[0]
@@ -0,0 +1,120 @@
+import numpy as np
+
+CHANNELS = 4
+CLASSES = 45
+
+
+def build_streaming_model(filters=64, units=64, hidden=64, kernel_size=3):
+    """
+    Streaming-friendly classifier that runs along the time axis.
+
+    The production model treats the 4 channels as its sequence axis, so nothing can be
+    carried from one window to the next. This variant takes (time, channels) input with a
+    causal Conv1D and a unidirectional LSTM, and emits a prediction at every sample - so
+    a stream can be advanced one sample at a time by keeping the conv history and the
+    LSTM state.
+    """
+    import tensorflow as tf
+    from tensorflow.keras import layers
+
+    return tf.keras.Sequential([
+        layers.InputLayer(input_shape=(None, CHANNELS)),
+        layers.Conv1D(filters, kernel_size, activation='relu', padding='causal'),
+        layers.LSTM(units, return_sequences=True),
+        layers.Dense(hidden, activation='relu'),
+        layers.Dense(CLASSES, activation='softmax'),
+    ])
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class StreamingPredictor:
+    """
+    Incremental numpy inference for build_streaming_model() weights.
+
+    Each step consumes one (4,) sample: one causal conv output over the last kernel_size
+    samples, one LSTM cell update and the dense head. Cost per step is constant no matter
+    how long the stream (or the equivalent window) is.
+    """
+
+    def __init__(self, conv_kernel, conv_bias, lstm_kernel, lstm_recurrent, lstm_bias,
+                 hidden_kernel, hidden_bias, output_kernel, output_bias):
+        self.conv_kernel = np.asarray(conv_kernel, dtype=np.float32)  # (k, channels, filters)
+        self.conv_bias = np.asarray(conv_bias, dtype=np.float32)
+        self.lstm_kernel = np.asarray(lstm_kernel, dtype=np.float32)  # (filters, 4 * units)
+        self.lstm_recurrent = np.asarray(lstm_recurrent, dtype=np.float32)  # (units, 4 * units)
+        self.lstm_bias = np.asarray(lstm_bias, dtype=np.float32)
+        self.hidden_kernel = np.asarray(hidden_kernel, dtype=np.float32)
+        self.hidden_bias = np.asarray(hidden_bias, dtype=np.float32)
+        self.output_kernel = np.asarray(output_kernel, dtype=np.float32)
+        self.output_bias = np.asarray(output_bias, dtype=np.float32)
+
+        self.kernel_size = self.conv_kernel.shape[0]
+        self.units = self.lstm_recurrent.shape[0]
+        self.reset()
+
+    @classmethod
+    def from_keras(cls, model):
+        """Pull the weights out of a model built by build_streaming_model()."""
+        conv, lstm, hidden, output = [l for l in model.layers if l.get_weights()]
+        return cls(*conv.get_weights(), *lstm.get_weights(), *hidden.get_weights(), *output.get_weights())
+
+    def reset(self):
+        # Causal padding is zeros, so an all-zero history matches a fresh full recomputation
+        self.history = np.zeros((self.kernel_size, self.conv_kernel.shape[1]), dtype=np.float32)
+        self.h = np.zeros(self.units, dtype=np.float32)
+        self.c = np.zeros(self.units, dtype=np.float32)
+
+    def step(self, sample):
+        """
+        Advance the stream by one sample.
+
+        Args:
+            sample: Array of shape (4,) - one normalized sample for every channel
+
+        Returns:
+            Softmax probabilities (45,) for the newest sample
+        """
+        # Causal conv: shift the sample history left by one, apply kernel to the last k samples
+        self.history[:-1] = self.history[1:]
+        self.history[-1] = sample
+        conv = np.maximum(np.einsum('kc,kcf->f', self.history, self.conv_kernel) + self.conv_bias, 0)
+
+        # LSTM cell (Keras gate order: input, forget, cell, output)
+        z = conv @ self.lstm_kernel + self.h @ self.lstm_recurrent + self.lstm_bias
+        i, f, g, o = np.split(z, 4)
+        self.c = _sigmoid(f) * self.c + _sigmoid(i) * np.tanh(g)
+        self.h = _sigmoid(o) * np.tanh(self.c)
+
+        hidden = np.maximum(self.h @ self.hidden_kernel + self.hidden_bias, 0)
+        logits = hidden @ self.output_kernel + self.output_bias
+        exp = np.exp(logits - logits.max())
+        return exp / exp.sum()
+
+    def step_many(self, samples):
+        """Advance over (n, 4) samples; returns (n, 45) probabilities."""
+        return np.stack([self.step(sample) for sample in np.asarray(samples, dtype=np.float32)])
+
+
+def validate_against_full(model, sequence, atol=1e-4):
+    """
+    Check incremental outputs against a full recomputation over the same sequence.
+
+    Args:
+        model: Keras model from build_streaming_model()
+        sequence: Array of shape (T, 4)
+
+    Returns:
+        Maximum absolute difference between the two (raises AssertionError above atol)
+    """
+    sequence = np.asarray(sequence, dtype=np.float32)
+    full = np.asarray(model(sequence[np.newaxis], training=False))[0]
+
+    streamed = StreamingPredictor.from_keras(model).step_many(sequence)
+
+    max_diff = float(np.abs(full - streamed).max())
+    if max_diff > atol:
+        raise AssertionError(f"Streaming outputs differ from full recomputation by {max_diff:.2e}")
+    return max_diff
@@ -0,0 +1,199 @@
+"""
+Train the utterance-level CTC sequence model on the segments of the raw training recording.
+
+The recording is cleaned and segmented exactly like Data_Processing_Final.ipynb (outlier
+patches, min-max normalization, BUTTON segments, 10 segments per phoneme in PHONEMES
+order), but instead of cutting every segment into fixed 5-sample windows the segments are
+kept whole. Training utterances are several segments joined by stretches of the
+recording's silence region, labelled with their phoneme sequence; CTC learns the
+alignment. Segments 1-8 of every phoneme are used for training, 9-10 for testing.
+
+Afterwards the script reports the phoneme error rate on held-out utterances and saves the
+model as models/LSTM_all44_ctc_{filters}_{units}.
+
+Usage (from live_app/):
+    python train_sequence.py --csv ../data_all44.csv
+    python train_sequence.py --csv ../data_all44.csv --max-phonemes 8 --epochs 80
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from sequence_model import (BLANK, FRAME_STRIDE, PHONEMES, SAMPLE_RATE, build_sequence_model, button_segments,
+                            edit_distance, frame_lengths, greedy_decode, pad_batch)
+
+LIVE_DIR = os.path.dirname(os.path.abspath(__file__))
+CSV_PATH = os.path.join(LIVE_DIR, '..', 'data_all44.csv')
+MODELS_DIR = os.path.join(LIVE_DIR, '..', 'models')
+
+CUTOFF = 10  # Bad rows at the start of the recording
+AVG_PAD = 200  # Samples on either side averaged to fill an outlier patch
+SILENCE_RANGE = (186000, 198000)  # Rest region used for silence in the notebook
+SEGMENTS_PER_PHONEME = 10
+TEST_SEGMENTS = 2  # Last segments of every phoneme held out
+
+# (start, end, column) patches from Data_Processing_Final.ipynb; None patches every channel
+OUTLIER_PATCHES = [
+    (13750, 16000, 'PLA'), (30500, 33750, 'PLA'), (42500, 45500, 'PLA'), (68250, 71700, None),
+    (83750, 86500, 'PLA'), (110000, 114000, None), (127000, 130000, 'PLA'), (134000, 137500, None),
+    (150200, 152000, 'PLA'), (170000, 174000, None), (189500, 190500, None), (204000, 207250, None),
+    (219500, 222500, None),
+]
+
+
+def load_recording(csv_file):
+    """
+    Clean and normalize the raw recording the way the notebook does.
+
+    Returns:
+        Tuple of (signal (N, 4) float32, {phoneme index: [(start, end), ...]})
+    """
+    data = pd.read_csv(csv_file, skiprows=4).iloc[:, 1:6]
+    data.columns = ['DLI', 'OOS', 'OOI', 'PLA', 'BUTTON']
+    data = data.iloc[CUTOFF:].reset_index(drop=True)
+
+    for start, end, column in OUTLIER_PATCHES:
+        columns = [column] if column else list(data.columns)
+        around = np.r_[start - AVG_PAD:start, end:end + AVG_PAD]
+        data.loc[start:end - 1, columns] = data[columns].iloc[around].mean().values
+
+    segments = button_segments(data['BUTTON'].to_numpy())
+    channels = data[['DLI', 'OOS', 'OOI', 'PLA']]
+    signal = ((channels - channels.min()) / (channels.max() - channels.min())).to_numpy(dtype=np.float32)
+
+    by_phoneme = {
+        PHONEMES.index(phoneme): segments[i:i + SEGMENTS_PER_PHONEME]
+        for i, phoneme in zip(range(0, len(segments), SEGMENTS_PER_PHONEME), PHONEMES[1:])
+    }
+    return signal, by_phoneme
+
+
+def synthesize_utterances(signal, segments, count, max_phonemes, rng, gap=(10, 60)):
+    """
+    Join random phoneme segments with silence into labelled utterances.
+
+    Args:
+        segments: [(phoneme index, start, end)] to draw from
+
+    Returns:
+        Tuple of (list of (T_i, 4) arrays, list of label lists)
+    """
+    silence = signal[SILENCE_RANGE[0]:SILENCE_RANGE[1]]
+
+    def rest():
+        length = rng.integers(*gap)
+        offset = rng.integers(0, len(silence) - length)
+        return silence[offset:offset + length]
+
+    utterances, labels = [], []
+    for _ in range(count):
+        picks = rng.integers(0, len(segments), size=rng.integers(1, max_phonemes + 1))
+        pieces, label = [rest()], []
+        for pick in picks:
+            phoneme, start, end = segments[pick]
+            pieces += [signal[start:end], rest()]
+            label.append(phoneme)
+        utterances.append(np.concatenate(pieces))
+        labels.append(label)
+    return utterances, labels
+
+
+def pad_labels(labels):
+    lengths = np.array([len(l) for l in labels], dtype=np.int32)
+    dense = np.zeros((len(labels), lengths.max()), dtype=np.int32)
+    for i, label in enumerate(labels):
+        dense[i, :len(label)] = label
+    return dense, lengths
+
+
+def phoneme_error_rate(model, utterances, labels, batch_size=64):
+    errors = total = 0
+    for i in range(0, len(utterances), batch_size):
+        batch, lengths = pad_batch(utterances[i:i + batch_size])
+        logits = np.asarray(model([batch, lengths], training=False))
+        for decoded, label in zip(greedy_decode(logits, frame_lengths(lengths)), labels[i:i + batch_size]):
+            errors += edit_distance(decoded, label)
+            total += len(label)
+    return errors / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the utterance-level CTC sequence model")
+    parser.add_argument('--csv', default=CSV_PATH, help="Raw training recording (data_all44.csv)")
+    parser.add_argument('--filters', type=int, default=64)
+    parser.add_argument('--units', type=int, default=64)
+    parser.add_argument('--utterances', type=int, default=6000, help="Synthesized training utterances")
+    parser.add_argument('--max-phonemes', type=int, default=6)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--epochs', type=int, default=60)
+    parser.add_argument('--patience', type=int, default=8)
+    args = parser.parse_args()
+
+    tf.random.set_seed(489)
+    rng = np.random.default_rng(489)
+
+    signal, by_phoneme = load_recording(args.csv)
+    split = SEGMENTS_PER_PHONEME - TEST_SEGMENTS
+    train_segments = [(p, s, e) for p, segs in by_phoneme.items() for s, e in segs[:split]]
+    test_segments = [(p, s, e) for p, segs in by_phoneme.items() for s, e in segs[split:]]
+    print(f"{len(train_segments)} training segments, {len(test_segments)} test segments")
+
+    train_x, train_y = synthesize_utterances(signal, train_segments, args.utterances, args.max_phonemes, rng)
+    test_x, test_y = synthesize_utterances(signal, test_segments, args.utterances // 5, args.max_phonemes, rng)
+
+    model = build_sequence_model(filters=args.filters, units=args.units)
+    optimizer = tf.keras.optimizers.Adam(1e-3)
+
+    @tf.function(reduce_retracing=True)
+    def train_step(batch, lengths, labels, label_lengths):
+        with tf.GradientTape() as tape:
+            logits = model([batch, lengths], training=True)
+            loss = tf.reduce_mean(tf.nn.ctc_loss(
+                labels=labels, logits=logits,
+                label_length=label_lengths, logit_length=(lengths + FRAME_STRIDE - 1) // FRAME_STRIDE,
+                logits_time_major=False, blank_index=BLANK
+            ))
+        optimizer.apply_gradients(zip(tape.gradient(loss, model.trainable_variables), model.trainable_variables))
+        return loss
+
+    best_per, best_weights, stale = np.inf, None, 0
+    for epoch in range(args.epochs):
+        order = rng.permutation(len(train_x))
+        losses = []
+        for i in range(0, len(order), args.batch_size):
+            idx = order[i:i + args.batch_size]
+            batch, lengths = pad_batch([train_x[j] for j in idx])
+            labels, label_lengths = pad_labels([train_y[j] for j in idx])
+            losses.append(float(train_step(batch, lengths, labels, label_lengths)))
+
+        per = phoneme_error_rate(model, test_x, test_y)
+        print(f"Epoch {epoch + 1}: loss {np.mean(losses):.4f}, test PER {per:.4f}")
+
+        # Early stopping on the held-out phoneme error rate
+        if per < best_per:
+            best_per, best_weights, stale = per, model.get_weights(), 0
+        else:
+            stale += 1
+            if stale >= args.patience:
+                break
+
+    model.set_weights(best_weights)
+
+    filepath = os.path.join(MODELS_DIR, f"LSTM_all44_ctc_{args.filters}_{args.units}")
+    model.save(filepath)
+    print(f"Saved {filepath} (test PER {best_per:.4f})")
+
+    # One batched forward pass over every test utterance
+    batch, lengths = pad_batch(test_x)
+    start = time.perf_counter()
+    model([batch, lengths], training=False)
+    elapsed = time.perf_counter() - start
+    seconds = lengths.sum() / SAMPLE_RATE
+    print(f"Decoded {len(test_x)} utterances ({seconds:.1f}s of signal) in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Train the streaming (hop = 1 sample) model to match the windowed production model.
+
+Targets come from the production model itself: for every 30-sample training window
+(X_all44_413_4_30_30) the windowed model scores each trailing 5-sample slice, and the
+streaming model learns to reproduce those per-sample probabilities (mixed with the true
+label). Afterwards the script
+
+- validates incremental StreamingPredictor outputs against a full recomputation
+- measures per-step cost for growing stream lengths, next to the cost of recomputing
+  a whole window at every hop
+
+Usage (from live_app/):
+    python train_streaming.py
+    python train_streaming.py --units 32 --epochs 300
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.models import load_model
+from streaming import CLASSES, StreamingPredictor, build_streaming_model, validate_against_full
+
+LIVE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(LIVE_DIR, '..', 'data', 'chris_final', 'training_data1')
+TEACHER_PATH = os.path.join(LIVE_DIR, 'LSTM_all44_seed489_5_5_224k')
+MODELS_DIR = os.path.join(LIVE_DIR, '..', 'models')
+TEACHER_WINDOW = 5
+
+
+def teacher_targets(teacher, X):
+    """
+    Production-model probabilities for every trailing 5-sample slice.
+
+    Args:
+        X: Windows of shape (N, 4, T), channel-major
+
+    Returns:
+        Array of shape (N, T, classes); the first TEACHER_WINDOW - 1 steps are zero
+    """
+    n, channels, steps = X.shape
+    # All trailing slices as one batch: (N, steps - 4, 4, 5)
+    slices = np.lib.stride_tricks.sliding_window_view(X, TEACHER_WINDOW, axis=2).transpose(0, 2, 1, 3)
+    probs = teacher.predict(slices.reshape(-1, channels, TEACHER_WINDOW), batch_size=2048, verbose=0)
+
+    targets = np.zeros((n, steps, CLASSES), dtype=np.float32)
+    targets[:, TEACHER_WINDOW - 1:] = probs.reshape(n, steps - TEACHER_WINDOW + 1, CLASSES)
+    return targets
+
+
+def per_step_ms(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and validate the streaming model")
+    parser.add_argument('--teacher', default=TEACHER_PATH)
+    parser.add_argument('--filters', type=int, default=64)
+    parser.add_argument('--units', type=int, default=64)
+    parser.add_argument('--alpha', type=float, default=0.7, help="Weight of the teacher target vs the label")
+    parser.add_argument('--epochs', type=int, default=500)
+    parser.add_argument('--patience', type=int, default=50)
+    args = parser.parse_args()
+
+    from sklearn.model_selection import train_test_split
+
+    tf.random.set_seed(489)
+
+    X = np.load(os.path.join(DATA_DIR, 'X_all44_413_4_30_30.npy')).astype(np.float32)
+    y = np.load(os.path.join(DATA_DIR, 'y_all44_413_4_30_30.npy'))
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=489)
+
+    teacher = load_model(args.teacher)
+
+    def targets_for(X_split, y_split):
+        soft = teacher_targets(teacher, X_split)
+        hard = tf.keras.utils.to_categorical(y_split, CLASSES)[:, np.newaxis, :]
+        targets = args.alpha * soft + (1 - args.alpha) * hard
+        # Only score steps where the teacher had a full window
+        weights = np.zeros(targets.shape[:2], dtype=np.float32)
+        weights[:, TEACHER_WINDOW - 1:] = 1.0
+        return targets, weights
+
+    train_targets, train_weights = targets_for(X_train, y_train)
+    test_targets, test_weights = targets_for(X_test, y_test)
+
+    # Streaming model runs along time: (N, T, 4)
+    seq_train, seq_test = X_train.transpose(0, 2, 1), X_test.transpose(0, 2, 1)
+
+    model = build_streaming_model(filters=args.filters, units=args.units, hidden=args.units)
+    model.compile(loss='categorical_crossentropy', optimizer='adam', weighted_metrics=['accuracy'])
+    model.fit(
+        seq_train, train_targets,
+        sample_weight=train_weights,
+        batch_size=32,
+        epochs=args.epochs,
+        verbose=2,
+        validation_data=(seq_test, test_targets, test_weights),
+        callbacks=[tf.keras.callbacks.EarlyStopping(
+            monitor='val_loss', patience=args.patience, restore_best_weights=True
+        )]
+    )
+
+    filepath = os.path.join(MODELS_DIR, f"LSTM_all44_streaming_{args.filters}_{args.units}")
+    model.save(filepath)
+    print(f"Saved {filepath}")
+
+    # Accuracy at the end of each window, and agreement with the windowed model per sample
+    streamed = np.asarray(model(seq_test, training=False))
+    teacher_labels = np.argmax(teacher_targets(teacher, X_test), axis=2)[:, TEACHER_WINDOW - 1:]
+    print(f"\nStreaming accuracy (last sample): {np.mean(np.argmax(streamed[:, -1], axis=1) == y_test):.4f}")
+    print(f"Windowed accuracy (last window) : {np.mean(teacher_labels[:, -1] == y_test):.4f}")
+    print(f"Per-sample agreement with windowed model: "
+          f"{np.mean(np.argmax(streamed[:, TEACHER_WINDOW - 1:], axis=2) == teacher_labels):.4f}")
+
+    # Incremental vs full recomputation over one long stream (test windows back to back)
+    stream = seq_test.reshape(-1, 4)
+    print(f"\nMax |incremental - full| over {len(stream)} samples: {validate_against_full(model, stream):.2e}")
+
+    # Per-step cost: constant for the streaming predictor, grows with the window for recomputation
+    predictor = StreamingPredictor.from_keras(model)
+    sample = stream[0]
+    print(f"\n{'stream/window length':>20} {'incremental (ms/step)':>22} {'recompute window (ms/step)':>27}")
+    for length in (5, 30, 300, 3000):
+        predictor.reset()
+        predictor.step_many(stream[:length] if length <= len(stream) else np.resize(stream, (length, 4)))
+        incremental = per_step_ms(lambda: predictor.step(sample), 500)
+
+        window = tf.constant(np.resize(stream, (1, length, 4)))
+        model(window, training=False)
+        recompute = per_step_ms(lambda: model(window, training=False), 20)
+        print(f"{length:>20} {incremental:>22.4f} {recompute:>27.4f}")
+
+
+if __name__ == "__main__":
+    main()
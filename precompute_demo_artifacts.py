@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Precompute every demo artifact from the model and the X_all44/y_all44 data.
+
+Stages (each skipped when the hashes of its inputs and outputs match the manifest):
+    predictions  One batched forward pass over the test split, saved as the pipeline's
+                 prediction table (vocl_demo/cache/predictions_<key>.npz)
+    library      Packed phoneme EMG library, exemplars ranked by model confidence
+                 (vocl_demo/data/phoneme_emg_library.npy + _index.npz)
+    phrases      Phrase data for app_pregenerated.py: EMG windows gathered from the
+                 library, predicted phonemes and confidences, corrected text
+                 (vocl_demo/demo_data/demo_phrases.json)
+
+Corrected text is the reference phrase unless --llm is given, in which case the Groq
+corrector is asked (results are kept in the manifest and reused while the phoneme
+sequence is unchanged).
+
+The manifest with input/output hashes is vocl_demo/demo_data/precompute_manifest.json.
+
+Usage:
+    python3 precompute_demo_artifacts.py
+    python3 precompute_demo_artifacts.py --llm --exemplars 8
+    python3 precompute_demo_artifacts.py --force phrases
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+import numpy as np
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vocl_demo')
+sys.path.insert(0, DEMO_DIR)
+
+from utils.emg_library import LIBRARY_PATH, index_path, load_library, pack_exemplars, save_library
+from generate_phoneme_library import exemplars_from_test_split
+
+DEMO_DATA_PATH = os.path.join(DEMO_DIR, 'demo_data', 'demo_phrases.json')
+MANIFEST_PATH = os.path.join(DEMO_DIR, 'demo_data', 'precompute_manifest.json')
+STAGES = ('predictions', 'library', 'phrases')
+PREDICT_BATCH = 4096
+
+# Phrases shown by app_pregenerated.py: reference text -> phonemes
+PHRASES = {
+    'Hello': 'HH EH L OW',
+    'Help me': 'HH EH L P M IY',
+    'I love you': 'AY L AH V Y UW',
+    'Thank you': 'TH AE NG K Y UW',
+    'How are you': 'HH AW AA R Y UW',
+}
+
+
+def _digest(*parts):
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part if isinstance(part, bytes) else json.dumps(part, sort_keys=True).encode())
+    return hasher.hexdigest()
+
+
+def _file_digest(path):
+    from utils.pipeline import _hash_path
+    return _hash_path(path).hexdigest()
+
+
+class Manifest:
+    """Input/output hashes of the last successful run of every stage."""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.data = {'stages': {}, 'llm_text': {}}
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.data.update(json.load(f))
+
+    def is_current(self, stage, inputs):
+        """True if the stage last ran with these inputs and its outputs are unchanged."""
+        record = self.data['stages'].get(stage)
+        if record is None or record['inputs'] != inputs:
+            return False
+        return all(os.path.exists(path) and _file_digest(path) == digest
+                   for path, digest in self._outputs(record).items())
+
+    def record(self, stage, inputs, outputs):
+        self.data['stages'][stage] = {
+            'inputs': inputs,
+            'outputs': {os.path.relpath(path, DEMO_DIR): _file_digest(path) for path in outputs},
+        }
+        self.save()
+
+    def output_digest(self, stage):
+        """Combined hash of a stage's recorded outputs (input of the stages after it)."""
+        return _digest(self.data['stages'][stage]['outputs'])
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+
+    @staticmethod
+    def _outputs(record):
+        return {os.path.join(DEMO_DIR, path): digest for path, digest in record['outputs'].items()}
+
+
+def run_predictions(manifest, force):
+    """
+    Prediction table for the test split, one batched pass (content-addressed by model + data).
+
+    Returns:
+        PredictionTable
+    """
+    from utils.pipeline import (
+        CACHE_DIR, X_DATA_PATH, PredictionTable, load_emg_model, load_test_indices, prediction_cache_key
+    )
+
+    key = prediction_cache_key()
+    cache_path = os.path.join(CACHE_DIR, f"predictions_{key[:16]}.npz")
+    inputs = {'prediction_key': key}
+
+    if not force and manifest.is_current('predictions', inputs):
+        print(f"predictions: up to date ({os.path.relpath(cache_path, DEMO_DIR)})")
+        return PredictionTable.load(cache_path)
+
+    X = np.load(X_DATA_PATH, mmap_mode='r').reshape(-1, 4, 5)
+    X_test = np.asarray(X[load_test_indices(n_samples=len(X))], dtype=np.float32)
+    model = load_emg_model()
+    probabilities = np.concatenate([
+        np.asarray(model.predict(X_test[start:start + PREDICT_BATCH], verbose=0))
+        for start in range(0, len(X_test), PREDICT_BATCH)
+    ])
+
+    table = PredictionTable(probabilities)
+    table.save(cache_path)
+    manifest.record('predictions', inputs, [cache_path])
+    print(f"predictions: {len(table)} test rows -> {os.path.relpath(cache_path, DEMO_DIR)}")
+    return table
+
+
+def run_library(manifest, table, exemplars, force):
+    """Packed phoneme library with the most confident test windows of each phoneme."""
+    from utils.pipeline import Y_DATA_PATH
+
+    inputs = {
+        'predictions': manifest.output_digest('predictions'),
+        'labels': _file_digest(Y_DATA_PATH),
+        'exemplars': exemplars,
+    }
+    if not force and manifest.is_current('library', inputs):
+        print("library: up to date")
+        return load_library()
+
+    per_phoneme, phoneme_index = exemplars_from_test_split(exemplars, table=table)
+    library = pack_exemplars(per_phoneme, phoneme_index, max_exemplars=exemplars)
+    save_library(library, LIBRARY_PATH)
+    manifest.record('library', inputs, [LIBRARY_PATH, index_path(LIBRARY_PATH)])
+    print(f"library: {len(library)} phonemes x {library.exemplars} exemplars")
+    return library
+
+
+def _llm_text(manifest, phoneme_sequence):
+    """Corrected text from the LLM, cached in the manifest by phoneme sequence."""
+    cached = manifest.data['llm_text'].get(phoneme_sequence)
+    if cached:
+        return cached
+
+    from utils.cloud_llm import correct_phonemes_with_groq
+    text = correct_phonemes_with_groq(phoneme_sequence.split(), timeout=15)
+    if text:
+        manifest.data['llm_text'][phoneme_sequence] = text
+    return text
+
+
+def run_phrases(manifest, table, library, use_llm, force):
+    """Phrase data for app_pregenerated.py, from one gather per phrase and the prediction table."""
+    from utils.pipeline import PHONEMES, X_DATA_PATH, load_test_indices
+
+    inputs = {
+        'predictions': manifest.output_digest('predictions'),
+        'library': manifest.output_digest('library'),
+        'phrases': PHRASES,
+        'llm': use_llm,
+    }
+    if not force and manifest.is_current('phrases', inputs):
+        print("phrases: up to date")
+        return
+
+    # Library exemplars store rows of the full data; the table is indexed by test position
+    n_samples = len(np.load(X_DATA_PATH, mmap_mode='r').reshape(-1, 4, 5))
+    test_indices = load_test_indices(n_samples=n_samples)
+    position = np.full(n_samples, -1, dtype=np.int64)
+    position[test_indices] = np.arange(len(test_indices))
+
+    demo_data = {}
+    for name, reference in PHRASES.items():
+        phonemes = [p for p in reference.split() if p in library]
+        windows, _ = library.gather(phonemes)
+        rows = np.fromiter((library.rows[p] for p in phonemes), dtype=np.int64, count=len(phonemes))
+        positions = position[library.sample_index[rows, 0]]
+        if not (positions >= 0).all():
+            raise ValueError(f"Phrase '{name}': library exemplars are not in the test split - library and "
+                             f"test split out of sync, rerun generate_phoneme_library.py")
+
+        predicted = table.argmax[positions]
+        phoneme_sequence = ' '.join(PHONEMES[i] for i in predicted)
+        corrected_text = (_llm_text(manifest, phoneme_sequence) if use_llm else None) or name
+
+        demo_data[name] = {
+            'phrase_name': name,
+            'index': int(positions[0]),
+            'emg_data': np.round(windows[0].astype(float), 4).tolist(),
+            'emg_windows': np.round(windows.astype(float), 4).tolist(),
+            'true_phoneme': phonemes[0],
+            'reference_phonemes': ' '.join(phonemes),
+            'phoneme_sequence': phoneme_sequence,
+            'confidences': np.round(table.confidence[positions].astype(float), 4).tolist(),
+            'corrected_text': corrected_text,
+        }
+
+    with open(DEMO_DATA_PATH, 'w') as f:
+        json.dump(demo_data, f, indent=2)
+    manifest.record('phrases', inputs, [DEMO_DATA_PATH])
+    print(f"phrases: {len(demo_data)} phrases -> {os.path.relpath(DEMO_DATA_PATH, DEMO_DIR)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute demo artifacts (skips unchanged stages)")
+    parser.add_argument('--exemplars', type=int, default=8, help="Library exemplars per phoneme")
+    parser.add_argument('--llm', action='store_true', help="Ask the LLM corrector for phrase text")
+    parser.add_argument('--force', nargs='*', choices=STAGES, metavar='STAGE',
+                        help="Rerun these stages (all if none are named)")
+    args = parser.parse_args()
+
+    forced = set(STAGES if args.force == [] else args.force or [])
+    manifest = Manifest()
+
+    table = run_predictions(manifest, 'predictions' in forced)
+    library = run_library(manifest, table, args.exemplars, 'library' in forced)
+    run_phrases(manifest, table, library, args.llm, 'phrases' in forced)
+    manifest.save()
+
+
+if __name__ == "__main__":
+    main()
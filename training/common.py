@@ -0,0 +1,129 @@
+"""
+Shared helpers for the model training scripts.
+
+Data loading and the train/test split follow Model_Training_Final.ipynb
+(80/20 split, random_state=489), so every script is evaluated on the same
+test windows as the production model.
+"""
+
+import os
+import re
+import glob
+import time
+import numpy as np
+
+PHONEMES = ['_', 'B', 'D', 'F', 'G', 'HH', 'JH', 'K', 'L', 'M', 'N', 'P', 'R', 'S', 'T', 'V', 'W', 'Y', 'Z', 'CH', 'SH', 'NG', 'DH', 'TH', 'ZH', 'WH', 'AA', 'AI(R)', 'I(R)', 'A(R)', 'ER', 'EY', 'IY', 'AY', 'OW', 'UW', 'AE', 'EH', 'IH', 'AO', 'AH', 'UH', 'OO', 'AW', 'OY']
+CLASSES = len(PHONEMES)
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DATA_DIR = os.path.join(REPO_DIR, 'data', 'chris_final', 'training_data1')
+MODELS_DIR = os.path.join(REPO_DIR, 'models')
+TEACHER_PATH = os.path.join(MODELS_DIR, 'LSTM_all44_seed489_5_5_224k')
+
+SEED = 489
+TEST_SIZE = 0.2
+
+
+def parse_filename(filename):
+    """Parse X_all44_{N}_{CHANNELS}_{SIZE}_{STEP}.npy into (num_examples, channels, size)."""
+    match = re.search(r"X_all44_(\d+)_(\d+)_(\d+)_(\d+).npy", filename)
+    if not match:
+        raise ValueError("Invalid filename format")
+    return int(match.group(1)), int(match.group(2)), int(match.group(3))
+
+
+def find_dataset(size=5, data_dir=DATA_DIR):
+    """Find the X/y file pair for a window size."""
+    matches = glob.glob(os.path.join(data_dir, f"X_all44_*_4_{size}_{size}.npy"))
+    if not matches:
+        raise FileNotFoundError(f"No X_all44 dataset with window size {size} in {data_dir}")
+    X_path = matches[0]
+    y_path = os.path.join(data_dir, os.path.basename(X_path).replace('X_', 'y_', 1))
+    return X_path, y_path
+
+
+def load_split(size=5, seed=SEED, data_dir=DATA_DIR):
+    """
+    Load an X_all44/y_all44 pair and split it like the training notebook.
+
+    Returns:
+        Tuple of (X_train, X_test, y_train, y_test) with X shaped (N, 4, size) float32
+    """
+    from sklearn.model_selection import train_test_split
+
+    X_path, y_path = find_dataset(size, data_dir)
+    _, channels, size = parse_filename(os.path.basename(X_path))
+
+    X = np.load(X_path).reshape(-1, channels, size).astype(np.float32)
+    y = np.load(y_path)
+
+    return train_test_split(X, y, test_size=TEST_SIZE, random_state=seed)
+
+
+def load_keras_model(path):
+    """Load a Keras SavedModel directory for training/evaluation."""
+    import tensorflow as tf
+    return tf.keras.models.load_model(path)
+
+
+def accuracy(model, X, y, batch_size=1024):
+    """Top-1 accuracy of a softmax (or logits) model."""
+    predictions = model.predict(X, batch_size=batch_size, verbose=0)
+    return float(np.mean(np.argmax(predictions, axis=1) == y))
+
+
+def count_params(model):
+    return int(model.count_params())
+
+
+def count_flops(model):
+    """
+    Approximate forward-pass FLOPs for one window (2 x multiply-accumulates).
+
+    Covers the layer types used by our classifiers (Conv1D, LSTM, GRU, Dense);
+    other layers are treated as free.
+    """
+    macs = 0
+    for layer in model.layers:
+        name = type(layer).__name__
+        input_shape = layer.input_shape if not isinstance(layer.input_shape, list) else layer.input_shape[0]
+        output_shape = layer.output_shape
+
+        if name == 'Conv1D':
+            in_channels, out_steps = input_shape[2], output_shape[1]
+            macs += out_steps * layer.filters * layer.kernel_size[0] * in_channels
+        elif name in ('LSTM', 'GRU'):
+            steps, features = input_shape[1], input_shape[2]
+            gates = 4 if name == 'LSTM' else 3
+            macs += steps * gates * layer.units * (features + layer.units)
+        elif name == 'Dense':
+            macs += int(np.prod(input_shape[1:])) * layer.units
+    return 2 * macs
+
+
+def single_window_latency(model, input_shape, repeats=200):
+    """
+    Median CPU latency (ms) of one (1, *input_shape) forward pass.
+
+    Calls the model directly instead of model.predict, which adds several
+    milliseconds of per-call overhead that would hide the model's own cost.
+    """
+    import tensorflow as tf
+
+    window = tf.constant(np.random.rand(1, *input_shape).astype(np.float32))
+    model(window, training=False)  # Warm-up
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model(window, training=False)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def soften(probabilities, temperature):
+    """Re-temper softmax outputs: softmax(log(p) / T)."""
+    logits = np.log(np.clip(probabilities, 1e-12, 1.0)) / temperature
+    logits -= logits.max(axis=1, keepdims=True)
+    soft = np.exp(logits)
+    return (soft / soft.sum(axis=1, keepdims=True)).astype(np.float32)
@@ -0,0 +1,176 @@
+"""
+Knowledge distillation of the production classifier into small student models.
+
+The teacher (models/LSTM_all44_seed489_5_5_224k) labels the X_all44 training
+windows with its softmax outputs; students are trained on a mix of those soft
+targets (tempered by --temperature) and the hard labels. Every student that
+fits the parameter/FLOP budget is trained, evaluated and saved next to the
+teacher with the same (None, 4, 5) -> (None, 45) softmax signature.
+
+Usage (from the repository root):
+    python training/distill.py
+    python training/distill.py --max-params 20000 --max-flops 100000 --temperature 4
+"""
+
+import os
+import json
+import argparse
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers
+
+from common import (
+    CLASSES, MODELS_DIR, TEACHER_PATH, load_split, load_keras_model, accuracy,
+    count_params, count_flops, single_window_latency, soften
+)
+
+# Candidate student architectures (smallest first)
+STUDENTS = {
+    'mlp32': dict(kind='mlp', hidden=[32]),
+    'mlp64x64': dict(kind='mlp', hidden=[64, 64]),
+    'conv16_lstm16': dict(kind='lstm', filters=16, units=16, dense=0),
+    'conv32_lstm32': dict(kind='lstm', filters=32, units=32, dense=32),
+    'conv64_lstm32': dict(kind='lstm', filters=64, units=32, dense=64),
+    'conv64_gru48': dict(kind='gru', filters=64, units=48, dense=64),
+}
+
+
+def build_student(spec, input_shape):
+    """Build a student that outputs logits (softmax is added at export time)."""
+    model = tf.keras.Sequential([layers.InputLayer(input_shape=input_shape)])
+
+    if spec['kind'] == 'mlp':
+        model.add(layers.Flatten())
+        for units in spec['hidden']:
+            model.add(layers.Dense(units, activation='relu'))
+    else:
+        model.add(layers.Conv1D(spec['filters'], 3, activation='relu', padding='same'))
+        recurrent = layers.LSTM if spec['kind'] == 'lstm' else layers.GRU
+        model.add(recurrent(spec['units']))
+        if spec['dense']:
+            model.add(layers.Dense(spec['dense'], activation='relu'))
+
+    model.add(layers.Dense(CLASSES))
+    return model
+
+
+def distillation_loss(temperature, alpha):
+    """
+    Loss over concatenated targets [one-hot labels | tempered teacher probabilities].
+
+    alpha weights the soft (teacher) term; the T^2 factor keeps its gradient scale
+    independent of the temperature (Hinton et al.).
+    """
+    def loss(y_true, logits):
+        hard, soft = y_true[:, :CLASSES], y_true[:, CLASSES:]
+        hard_loss = tf.keras.losses.categorical_crossentropy(hard, logits, from_logits=True)
+        soft_student = tf.nn.softmax(logits / temperature)
+        soft_loss = tf.keras.losses.kl_divergence(soft, soft_student) * temperature ** 2
+        return alpha * soft_loss + (1 - alpha) * hard_loss
+    return loss
+
+
+def hard_accuracy(y_true, logits):
+    return tf.keras.metrics.categorical_accuracy(y_true[:, :CLASSES], logits)
+
+
+def export_student(logits_model):
+    """Wrap a logits student with softmax so it matches the teacher's output."""
+    inputs = tf.keras.Input(shape=logits_model.input_shape[1:])
+    outputs = layers.Softmax()(logits_model(inputs))
+    return tf.keras.Model(inputs, outputs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distill the production model into small students")
+    parser.add_argument('--teacher', default=TEACHER_PATH)
+    parser.add_argument('--size', type=int, default=5, help="Window size (X_all44_*_4_SIZE_SIZE)")
+    parser.add_argument('--max-params', type=int, default=None)
+    parser.add_argument('--max-flops', type=int, default=None)
+    parser.add_argument('--students', default=','.join(STUDENTS), help="Comma-separated student names")
+    parser.add_argument('--temperature', type=float, default=4.0)
+    parser.add_argument('--alpha', type=float, default=0.7)
+    parser.add_argument('--epochs', type=int, default=1000)
+    parser.add_argument('--patience', type=int, default=100)
+    parser.add_argument('--batch-size', type=int, default=128)
+    args = parser.parse_args()
+
+    tf.random.set_seed(489)
+
+    X_train, X_test, y_train, y_test = load_split(args.size)
+    input_shape = X_train.shape[1:]
+
+    teacher = load_keras_model(args.teacher)
+    teacher_probs = teacher.predict(X_train, batch_size=1024, verbose=0)
+
+    # Targets: [one-hot labels | teacher probabilities softened by T]
+    targets = np.concatenate([
+        tf.keras.utils.to_categorical(y_train, CLASSES),
+        soften(teacher_probs, args.temperature)
+    ], axis=1)
+    test_targets = np.concatenate([
+        tf.keras.utils.to_categorical(y_test, CLASSES),
+        soften(teacher.predict(X_test, batch_size=1024, verbose=0), args.temperature)
+    ], axis=1)
+
+    teacher_report = {
+        'accuracy': accuracy(teacher, X_test, y_test),
+        'params': count_params(teacher),
+        'flops': count_flops(teacher),
+        'latency_ms': single_window_latency(teacher, input_shape),
+    }
+
+    reports = {'teacher': teacher_report}
+
+    for name in args.students.split(','):
+        student = build_student(STUDENTS[name], input_shape)
+        params, flops = count_params(student), count_flops(student)
+
+        if (args.max_params and params > args.max_params) or (args.max_flops and flops > args.max_flops):
+            print(f"Skipping {name}: {params} params / {flops} FLOPs over budget")
+            continue
+
+        print(f"\nTraining student {name} ({params} params, {flops} FLOPs)")
+
+        student.compile(
+            optimizer='adam',
+            loss=distillation_loss(args.temperature, args.alpha),
+            metrics=[hard_accuracy]
+        )
+        student.fit(
+            X_train, targets,
+            batch_size=args.batch_size,
+            epochs=args.epochs,
+            verbose=2,
+            validation_data=(X_test, test_targets),
+            callbacks=[tf.keras.callbacks.EarlyStopping(
+                monitor='val_hard_accuracy', mode='max', patience=args.patience, restore_best_weights=True
+            )]
+        )
+
+        exported = export_student(student)
+        report = {
+            'accuracy': accuracy(exported, X_test, y_test),
+            'params': params,
+            'flops': flops,
+            'latency_ms': single_window_latency(exported, input_shape),
+            'temperature': args.temperature,
+            'alpha': args.alpha,
+            'teacher': os.path.basename(os.path.normpath(args.teacher)),
+        }
+        reports[name] = report
+
+        # Save next to the teacher, following its naming scheme
+        filepath = os.path.join(MODELS_DIR, f"LSTM_all44_seed489_{args.size}_{args.size}_{name}_distilled")
+        exported.save(filepath)
+        with open(os.path.join(filepath, 'distillation_report.json'), 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved {filepath}")
+
+    print(f"\n{'model':<16} {'accuracy':>9} {'params':>9} {'FLOPs':>10} {'latency (ms)':>13}")
+    for name, report in reports.items():
+        print(f"{name:<16} {report['accuracy']:>9.4f} {report['params']:>9} {report['flops']:>10} {report['latency_ms']:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Structured pruning of the production Conv1D/LSTM classifier.
+
+Starting from models/LSTM_all44_seed489_5_5_224k, each step removes the least
+important Conv1D filters, LSTM units and hidden Dense units, copies the
+surviving weights into a physically smaller model of the same architecture and
+fine-tunes it on the X_all44_3220_4_5_5 split. The next step prunes the
+fine-tuned model further, so the ratios are cumulative.
+
+Importance of a unit is the L1 norm of its incoming weights plus the L1 norm of
+the weights that read it downstream, each normalized by its layer's mean.
+
+Usage (from the repository root):
+    python training/prune.py
+    python training/prune.py --ratios 0.25,0.5,0.75 --finetune-epochs 100
+"""
+
+import os
+import json
+import argparse
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras import layers, regularizers
+
+from common import (
+    CLASSES, MODELS_DIR, TEACHER_PATH, load_split, load_keras_model, accuracy,
+    count_params, count_flops, single_window_latency
+)
+
+DEFAULT_RATIOS = [0.25, 0.5, 0.625, 0.75, 0.875, 0.9375]
+
+
+def get_layers(model):
+    """Locate the Conv1D, LSTM, hidden Dense and output Dense layers of the notebook architecture."""
+    conv = [l for l in model.layers if isinstance(l, layers.Conv1D)]
+    lstm = [l for l in model.layers if isinstance(l, layers.LSTM)]
+    dense = [l for l in model.layers if isinstance(l, layers.Dense)]
+    if len(conv) != 1 or len(lstm) != 1 or len(dense) != 2:
+        raise ValueError("Expected Conv1D -> LSTM -> Dense -> Dense (see Model_Training_Final.ipynb)")
+    return conv[0], lstm[0], dense[0], dense[1]
+
+
+def build_model(input_shape, filters, units, hidden):
+    """Same architecture as Model_Training_Final.ipynb with configurable widths."""
+    return tf.keras.Sequential([
+        layers.Conv1D(filters, 3, activation='relu', input_shape=input_shape, padding='same'),
+        layers.Dropout(0.5),
+        layers.LSTM(units, kernel_regularizer=regularizers.l2(1e-4)),
+        layers.Dropout(0.5),
+        layers.Dense(hidden, activation='relu'),
+        layers.Dense(CLASSES, activation='softmax')
+    ])
+
+
+def _normalized(x):
+    return x / (x.mean() + 1e-12)
+
+
+def _lstm_columns(keep, units):
+    # LSTM weights are laid out as [input | forget | cell | output] gate blocks of `units` columns
+    return np.concatenate([gate * units + keep for gate in range(4)])
+
+
+def unit_importance(model):
+    """
+    Score every Conv1D filter, LSTM unit and hidden Dense unit.
+
+    Returns:
+        Tuple of (filter_scores, lstm_scores, hidden_scores)
+    """
+    conv, lstm, dense, output = get_layers(model)
+    conv_kernel, _ = conv.get_weights()  # (kernel, in, F)
+    lstm_kernel, lstm_recurrent, _ = lstm.get_weights()  # (F, 4U), (U, 4U)
+    dense_kernel, _ = dense.get_weights()  # (U, D)
+    output_kernel, _ = output.get_weights()  # (D, classes)
+    units = lstm.units
+
+    filter_scores = (_normalized(np.abs(conv_kernel).sum(axis=(0, 1)))
+                     + _normalized(np.abs(lstm_kernel).sum(axis=1)))
+
+    gate_in = np.abs(lstm_kernel).sum(axis=0) + np.abs(lstm_recurrent).sum(axis=0)
+    lstm_scores = (_normalized(gate_in.reshape(4, units).sum(axis=0))
+                   + _normalized(np.abs(dense_kernel).sum(axis=1)))
+
+    hidden_scores = (_normalized(np.abs(dense_kernel).sum(axis=0))
+                     + _normalized(np.abs(output_kernel).sum(axis=1)))
+
+    return filter_scores, lstm_scores, hidden_scores
+
+
+def _top(scores, count):
+    # Indices of the `count` highest scores, kept in original order
+    return np.sort(np.argsort(scores)[::-1][:count])
+
+
+def prune_model(model, filters, units, hidden):
+    """
+    Build a physically smaller copy of `model` keeping the most important units.
+
+    Args:
+        model: Keras model with the notebook architecture
+        filters, units, hidden: Widths to keep for Conv1D, LSTM and hidden Dense
+
+    Returns:
+        New (compiled) Keras model with sliced weights
+    """
+    conv, lstm, dense, output = get_layers(model)
+    filter_scores, lstm_scores, hidden_scores = unit_importance(model)
+
+    keep_f = _top(filter_scores, filters)
+    keep_u = _top(lstm_scores, units)
+    keep_d = _top(hidden_scores, hidden)
+    cols = _lstm_columns(keep_u, lstm.units)
+
+    conv_kernel, conv_bias = conv.get_weights()
+    lstm_kernel, lstm_recurrent, lstm_bias = lstm.get_weights()
+    dense_kernel, dense_bias = dense.get_weights()
+    output_kernel, output_bias = output.get_weights()
+
+    pruned = build_model(model.input_shape[1:], filters, units, hidden)
+    new_conv, new_lstm, new_dense, new_output = get_layers(pruned)
+
+    new_conv.set_weights([conv_kernel[:, :, keep_f], conv_bias[keep_f]])
+    new_lstm.set_weights([lstm_kernel[keep_f][:, cols], lstm_recurrent[keep_u][:, cols], lstm_bias[cols]])
+    new_dense.set_weights([dense_kernel[keep_u][:, keep_d], dense_bias[keep_d]])
+    new_output.set_weights([output_kernel[keep_d], output_bias])
+
+    pruned.compile(loss='sparse_categorical_crossentropy', optimizer='adam', metrics=['accuracy'])
+    return pruned
+
+
+def evaluate(model, X_test, y_test, input_shape):
+    return {
+        'accuracy': accuracy(model, X_test, y_test),
+        'params': count_params(model),
+        'flops': count_flops(model),
+        'latency_ms': single_window_latency(model, input_shape),
+    }
+
+
+def save_curve(curve, path):
+    """Save the accuracy/latency curve as JSON and, if matplotlib is available, as a plot."""
+    with open(f"{path}.json", 'w') as f:
+        json.dump(curve, f, indent=2)
+
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return
+
+    fig, ax = plt.subplots(figsize=(7, 5))
+    ax.plot([p['latency_ms'] for p in curve], [p['accuracy'] for p in curve], marker='o')
+    for point in curve:
+        ax.annotate(f"{point['ratio']:.0%}", (point['latency_ms'], point['accuracy']),
+                    textcoords='offset points', xytext=(5, 5), fontsize=8)
+    ax.set_xlabel('Single-window latency (ms)')
+    ax.set_ylabel('Test accuracy')
+    ax.set_title('Structured pruning: accuracy vs latency')
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(f"{path}.png", dpi=150)
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Iteratively prune the production classifier")
+    parser.add_argument('--model', default=TEACHER_PATH)
+    parser.add_argument('--ratios', default=','.join(str(r) for r in DEFAULT_RATIOS),
+                        help="Cumulative fractions of units to remove, ascending")
+    parser.add_argument('--finetune-epochs', type=int, default=200)
+    parser.add_argument('--patience', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=128)
+    args = parser.parse_args()
+
+    tf.random.set_seed(489)
+
+    X_train, X_test, y_train, y_test = load_split(5)
+    input_shape = X_train.shape[1:]
+
+    model = load_keras_model(args.model)
+    conv, lstm, dense, _ = get_layers(model)
+    widths = (conv.filters, lstm.units, dense.units)
+    name = os.path.basename(os.path.normpath(args.model))
+
+    curve = [dict(ratio=0.0, filters=widths[0], units=widths[1], hidden=widths[2],
+                  **evaluate(model, X_test, y_test, input_shape))]
+    print(f"Baseline: {curve[0]}")
+
+    for ratio in sorted(float(r) for r in args.ratios.split(',')):
+        filters, units, hidden = (max(1, int(round(w * (1 - ratio)))) for w in widths)
+
+        model = prune_model(model, filters, units, hidden)
+        model.fit(
+            X_train, y_train,
+            batch_size=args.batch_size,
+            epochs=args.finetune_epochs,
+            verbose=0,
+            validation_data=(X_test, y_test),
+            callbacks=[tf.keras.callbacks.EarlyStopping(
+                monitor='val_accuracy', mode='max', patience=args.patience, restore_best_weights=True
+            )]
+        )
+
+        point = dict(ratio=ratio, filters=filters, units=units, hidden=hidden,
+                     **evaluate(model, X_test, y_test, input_shape))
+        curve.append(point)
+        print(f"Pruned {ratio:.1%}: {point}")
+
+        model.save(os.path.join(MODELS_DIR, f"{name}_pruned{int(round(ratio * 100))}"))
+
+    save_curve(curve, os.path.join(MODELS_DIR, f"{name}_pruning_curve"))
+
+    print(f"\n{'ratio':>7} {'conv':>5} {'lstm':>5} {'dense':>6} {'accuracy':>9} {'params':>8} {'latency (ms)':>13}")
+    for p in curve:
+        print(f"{p['ratio']:>7.1%} {p['filters']:>5} {p['units']:>5} {p['hidden']:>6} "
+              f"{p['accuracy']:>9.4f} {p['params']:>8} {p['latency_ms']:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
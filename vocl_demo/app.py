@@ -7,20 +7,21 @@ Interactive phoneme builder with advanced EMG signal visualization.
 import streamlit as st
 import sys
 import os
-import base64
+from contextlib import closing
 
 # Configure environment
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
-os.environ['OMP_NUM_THREADS'] = '1'
-os.environ['TF_NUM_INTEROP_THREADS'] = '1'
-os.environ['TF_NUM_INTRAOP_THREADS'] = '1'
 
 # Add current directory to path (for Streamlit Cloud compatibility)
 script_dir = os.path.dirname(os.path.abspath(__file__))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from components.emg_visualizer import plot_phoneme_emg_grid
+# Host-aware thread settings, applied once per process before anything can import TensorFlow
+from utils.threading_policy import ensure_threading_profile
+ensure_threading_profile()
+
+from components.emg_visualizer import plot_phoneme_emg_grid_image, plot_probability_timeline
 from components.phoneme_display import display_phonemes
 from components.text_output import display_final_text
 from components.phoneme_builder import (
@@ -28,8 +29,17 @@ from components.phoneme_builder import (
     display_current_sequence,
     clear_sequence,
     remove_last_phoneme,
-    build_emg_sequence_from_library
+    build_emg_sequence_from_library,
+    get_phoneme_indices
 )
+from components.model_status import model_backend_available, render_model_status
+from components.live_playback import render_live_playback, render_recording_browser
+from components.perf_panel import render_perf_panel
+from utils.assets import get_app_css_html, get_favicon_html, get_image_bytes, get_logo_bytes
+from utils.perf import begin_rerun, end_rerun, span, timed
+
+# Per-rerun timing spans (sidebar "Performance" panel)
+begin_rerun()
 
 # Page configuration
 st.set_page_config(
@@ -40,28 +50,7 @@ st.set_page_config(
 )
 
 # Add favicon using JavaScript (runs after page load)
-try:
-    logo_path = os.path.join(os.path.dirname(__file__), 'logo.png')
-    if os.path.exists(logo_path):
-        with open(logo_path, 'rb') as f:
-            logo_data = base64.b64encode(f.read()).decode()
-        favicon_script = f"""
-        <script>
-            (function() {{
-                const link = document.createElement('link');
-                link.rel = 'icon';
-                link.type = 'image/png';
-                link.href = 'data:image/png;base64,{logo_data}';
-                // Remove existing favicon if any
-                const existing = document.querySelector('link[rel="icon"]');
-                if (existing) existing.remove();
-                document.head.appendChild(link);
-            }})();
-        </script>
-        """
-        st.markdown(favicon_script, unsafe_allow_html=True)
-except:
-    pass
+st.markdown(get_favicon_html(), unsafe_allow_html=True)
 
 # Initialize session state variables if they don't exist
 if 'selected_phonemes' not in st.session_state:
@@ -71,173 +60,19 @@ if 'builder_processing' not in st.session_state:
 if 'builder_error' not in st.session_state:
     st.session_state['builder_error'] = None
 
-# Scientific UI CSS
-st.markdown("""
-<style>
-    /* Main styling - text centered in its column (from logo right to page right) */
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #000000;
-        text-align: center;
-        margin-bottom: 0.5rem;
-        letter-spacing: -0.5px;
-        font-family: 'Segoe UI', 'Helvetica Neue', Arial, sans-serif;
-    }
-    .sub-header {
-        font-size: 1rem;
-        color: #666666;
-        text-align: center;
-        margin-bottom: 2rem;
-        font-weight: 400;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-    
-    /* Scientific color scheme */
-    :root {
-        --primary-black: #000000;
-        --primary-dark-gray: #333333;
-        --accent-light-gray: #cccccc;
-        --bg-light: #f5f7fa;
-        --bg-card: #ffffff;
-        --text-primary: #212121;
-        --text-secondary: #546e7a;
-        --border-color: #e0e0e0;
-    }
-    
-    /* Button styling */
-    .stButton>button {
-        background: var(--primary-black);
-        color: white !important;
-        border: 2px solid var(--primary-dark-gray) !important;
-        border-radius: 6px;
-        padding: 0.5rem 1rem;
-        font-weight: 600;
-        font-size: 0.9rem;
-        transition: all 0.2s ease;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    .stButton>button:hover {
-        background: var(--primary-dark-gray);
-        color: white !important;
-        border-color: var(--primary-black) !important;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.15);
-        transform: translateY(-1px);
-    }
-    
-    /* Phoneme buttons */
-    button[kind="secondary"] {
-        background: var(--primary-black) !important;
-        color: white !important;
-        border: 2px solid var(--primary-dark-gray) !important;
-        border-radius: 6px;
-        font-weight: 600;
-        transition: all 0.2s ease;
-    }
-    button[kind="secondary"]:hover {
-        background: var(--primary-dark-gray) !important;
-        border-color: var(--primary-black) !important;
-        color: white !important;
-        transform: translateY(-1px);
-    }
-    
-    /* Tabs - Enhanced styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 0.5rem;
-        background-color: transparent;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        padding: 0.75rem 1.5rem;
-        font-weight: 600;
-        font-size: 1rem;
-        color: var(--text-secondary);
-        background-color: transparent;
-        border: 2px solid transparent;
-        border-radius: 8px 8px 0 0;
-        transition: all 0.2s ease;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background-color: var(--primary-black) !important;
-        color: white !important;
-        border-color: var(--primary-black) !important;
-        border-radius: 8px 8px 0 0;
-    }
-    
-    .stTabs [aria-selected="false"] {
-        background-color: #f5f7fa !important;
-        color: var(--text-secondary) !important;
-        border-color: var(--border-color) !important;
-    }
-    
-    .stTabs [aria-selected="false"]:hover {
-        background-color: #e8eaf0 !important;
-        color: var(--primary-black) !important;
-    }
-    
-    /* Cards and containers */
-    .stContainer {
-        border: 1px solid var(--border-color);
-        border-radius: 8px;
-        padding: 1rem;
-        background: var(--bg-card);
-        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-    }
-    
-    /* Code blocks */
-    .stCodeBlock {
-        background: #f8f9fa;
-        border-left: 4px solid var(--primary-black);
-        font-family: 'Courier New', monospace;
-        font-size: 0.9rem;
-    }
-    
-    /* Success messages */
-    .stSuccess {
-        background: linear-gradient(135deg, #d4edda, #c3e6cb);
-        border-left: 4px solid #28a745;
-        color: #155724;
-    }
-    
-    /* Warning messages */
-    .stWarning {
-        background: linear-gradient(135deg, #fff3cd, #ffeaa7);
-        border-left: 4px solid #ffc107;
-        color: #856404;
-    }
-    
-    /* Error messages */
-    .stError {
-        background: linear-gradient(135deg, #f8d7da, #f5c6cb);
-        border-left: 4px solid #dc3545;
-        color: #721c24;
-    }
-    
-    /* Info messages */
-    .stInfo {
-        background: linear-gradient(135deg, #d1ecf1, #bee5eb);
-        border-left: 4px solid #17a2b8;
-        color: #0c5460;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Scientific UI CSS (read once per server process)
+st.markdown(get_app_css_html(), unsafe_allow_html=True)
+
+# Background model loading where a model backend exists; the builder itself runs on
+# the pre-generated library and needs no TensorFlow
+pipeline = render_model_status() if model_backend_available() else None
 
 # Header with Logo - text centered from logo right edge to page right edge
 col_logo, col_title = st.columns([1.2, 8.8])
 with col_logo:
-    try:
-        logo_path = os.path.join(os.path.dirname(__file__), 'logo.png')
-        if os.path.exists(logo_path):
-            st.image(logo_path, width=120)
-        else:
-            st.image('vocl_demo/logo.png', width=120)
-    except:
-        try:
-            st.image('logo.png', width=120)
-        except:
-            pass
+    logo = get_logo_bytes()
+    if logo:
+        st.image(logo, width=120)
 
 with col_title:
     # Use CSS to center text in this column (which spans from logo right to page right)
@@ -253,11 +88,15 @@ This interactive demonstration simulates the VOCL experience. Build phoneme sequ
 
 # Navigation tabs
 st.markdown("---")
-page_tab1, page_tab2 = st.tabs(["Phoneme Builder", "Exhibits"])
+page_tab1, page_tab_playback, page_tab2 = st.tabs(["Phoneme Builder", "Live Playback", "Exhibits"])
 
-with page_tab1:
-    # Phoneme Builder Page Content
-    
+@st.fragment
+@timed()
+def render_builder():
+    """
+    Selector grid + current sequence. A phoneme click reruns only this fragment: the
+    sequence panel is nested in it because a click can't rerun a sibling fragment.
+    """
     # Two-column layout: Left = Phoneme selector, Right = Current sequence + Build button
     col_left, col_right = st.columns([2.5, 1])
     
@@ -275,132 +114,216 @@ with page_tab1:
             render_phoneme_selector("consonants")
     
     with col_right:
-        display_current_sequence()
-        
-        # Control buttons
-        col_btn1, col_btn2 = st.columns(2)
-        with col_btn1:
-            remove_last_phoneme()
-        with col_btn2:
-            clear_sequence()
-        
-        st.markdown("---")
+        render_sequence_panel()
+
+
+@st.fragment
+@timed()
+def render_sequence_panel():
+    """Current sequence and its controls. Remove/Clear rerun only this panel, not the grid."""
+    display_current_sequence()
+    
+    # Control buttons
+    col_btn1, col_btn2 = st.columns(2)
+    with col_btn1:
+        remove_last_phoneme()
+    with col_btn2:
+        clear_sequence()
+    
+    st.markdown("---")
+    
+    # Build Word button
+    if st.button("🔬 Analyze EMG Signals", type="primary", use_container_width=True):
+        selected_phonemes = st.session_state.get('selected_phonemes', [])
         
-        # Build Word button
-        if st.button("🔬 Analyze EMG Signals", type="primary", use_container_width=True):
-            selected_phonemes = st.session_state.get('selected_phonemes', [])
+        if not selected_phonemes:
+            st.warning("⚠️ Please select at least one phoneme first!")
+        else:
+            with st.spinner("Processing EMG signals..."):
+                try:
+                    # Build EMG sequence from pre-generated library
+                    emg_windows, phoneme_seq, _ = build_emg_sequence_from_library(selected_phonemes)
+                    
+                    if emg_windows is None or len(emg_windows) == 0:
+                        st.error("❌ Failed to build EMG sequence. Please check that phoneme_emg_library.npy exists.")
+                        st.session_state['builder_processing'] = False
+                    else:
+                        # Store in session state
+                        st.session_state['builder_emg_windows'] = emg_windows
+                        st.session_state['builder_phoneme_sequence'] = phoneme_seq
+                        st.session_state['builder_phonemes_list'] = phoneme_seq.split() if isinstance(phoneme_seq, str) else phoneme_seq
+                        st.session_state['builder_processing'] = True
+                        st.session_state['builder_error'] = None
+                    
+                    # Full rerun so the results fragments pick up the new analysis
+                    st.rerun()
+                    
+                except Exception as e:
+                    import traceback
+                    error_msg = str(e)
+                    st.error(f"❌ Error building word: {error_msg}")
+                    st.code(traceback.format_exc())
+                    st.session_state['builder_processing'] = False
+                    st.session_state['builder_error'] = error_msg
+
+
+def get_corrected_text(phoneme_seq):
+    """
+    LLM correction for a sequence, streamed into the panel as it is generated and
+    remembered in the session so reruns don't repeat the call.
+    """
+    cached = st.session_state.get('builder_corrected_text')
+    if cached and cached[0] == phoneme_seq:
+        return cached[1]
+    
+    from utils.cloud_llm import clean_corrected_text, stream_phonemes_with_groq
+    
+    phoneme_list = phoneme_seq.split() if isinstance(phoneme_seq, str) else phoneme_seq
+    placeholder = st.empty()
+    # closing(): a Stop/Rerun raised mid-stream still closes the HTTP response
+    with closing(stream_phonemes_with_groq(phoneme_list, timeout=15)) as stream:
+        with span('LLM first token'):
+            text = next(stream, '')
+        with span('LLM rest of stream'):
+            if text:
+                placeholder.markdown(f"**{text}▌**")
+            for token in stream:
+                text += token
+                placeholder.markdown(f"**{text}▌**")
+    placeholder.empty()
+    
+    corrected_text = clean_corrected_text(text) if text else None
+    st.session_state['builder_corrected_text'] = (phoneme_seq, corrected_text)
+    return corrected_text
+
+
+@st.fragment
+@timed()
+def render_results():
+    """Analysis results. Only redrawn on full reruns (i.e. after "Analyze EMG Signals")."""
+    st.markdown("---")
+    st.markdown("## Analysis Results")
+    
+    # EMG Signals Section (Full Width)
+    st.markdown("### Electromyographic Signal Visualization")
+    st.caption("Interactive EMG signals for each phoneme. Use zoom, pan, and hover tools to explore the data.")
+    
+    if 'builder_emg_windows' in st.session_state and 'builder_phonemes_list' in st.session_state:
+        try:
+            emg_windows = st.session_state['builder_emg_windows']
+            phonemes = st.session_state['builder_phonemes_list']
             
-            if not selected_phonemes:
-                st.warning("⚠️ Please select at least one phoneme first!")
-                st.rerun()
+            # Grid composed from cached per-phoneme tiles (no figure is kept per rerun)
+            grid_image = plot_phoneme_emg_grid_image(emg_windows, phonemes)
+            if grid_image is not None:
+                with span('st.image (EMG grid)'):
+                    st.image(grid_image, use_container_width=True)
             else:
-                with st.spinner("Processing EMG signals..."):
-                    try:
-                        # Build EMG sequence from pre-generated library
-                        emg_windows, phoneme_seq, _ = build_emg_sequence_from_library(selected_phonemes)
-                        
-                        if emg_windows is None or len(emg_windows) == 0:
-                            st.error("❌ Failed to build EMG sequence. Please check that phoneme_emg_library.npz exists.")
-                            st.session_state['builder_processing'] = False
-                        else:
-                            # Store in session state
-                            st.session_state['builder_emg_windows'] = emg_windows
-                            st.session_state['builder_phoneme_sequence'] = phoneme_seq
-                            st.session_state['builder_phonemes_list'] = phoneme_seq.split() if isinstance(phoneme_seq, str) else phoneme_seq
-                            st.session_state['builder_processing'] = True
-                            st.session_state['builder_error'] = None
-                        
-                        st.rerun()
-                        
-                    except Exception as e:
-                        import traceback
-                        error_msg = str(e)
-                        st.error(f"❌ Error building word: {error_msg}")
-                        st.code(traceback.format_exc())
-                        st.session_state['builder_processing'] = False
-                        st.session_state['builder_error'] = error_msg
-                        st.rerun()
+                st.warning("Could not generate EMG plots")
+        except Exception as e:
+            import traceback
+            st.warning("EMG plotting failed - showing placeholder")
+            st.error(f"Error: {str(e)}")
+            st.code(traceback.format_exc())
     
-    # Display results if processing is complete
-    if st.session_state.get('builder_processing', False):
-        st.markdown("---")
-        st.markdown("## Analysis Results")
-        
-        # EMG Signals Section (Full Width)
-        st.markdown("### Electromyographic Signal Visualization")
-        st.caption("Interactive EMG signals for each phoneme. Use zoom, pan, and hover tools to explore the data.")
-        
-        if 'builder_emg_windows' in st.session_state and 'builder_phonemes_list' in st.session_state:
+    # Two-column layout for phonemes and text
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### Phoneme Sequence")
+        if 'builder_phoneme_sequence' in st.session_state:
+            display_phonemes(st.session_state['builder_phoneme_sequence'])
+            
+            # Model confidences once the background loader has warmed up
+            if pipeline is not None:
+                try:
+                    phoneme_indices = get_phoneme_indices(st.session_state['builder_phonemes_list'])
+                    _, _, confidences = pipeline.build_emg_sequence(phoneme_indices)
+                    st.caption("Model confidence: " + " ".join(
+                        f"{p} {c:.0%}" for p, c in zip(st.session_state['builder_phonemes_list'], confidences)
+                    ))
+                except Exception as e:
+                    st.caption(f"Model confidence unavailable: {str(e)[:100]}")
+            else:
+                st.caption("Model still loading - showing library data only.")
+    
+    with col2:
+        st.markdown("### Reconstructed Text")
+        if 'builder_phoneme_sequence' in st.session_state:
+            phoneme_seq = st.session_state['builder_phoneme_sequence']
+            
+            # Try LLM correction with Groq API
             try:
-                emg_windows = st.session_state['builder_emg_windows']
-                phonemes = st.session_state['builder_phonemes_list']
+                from utils.cloud_llm import is_groq_available
                 
-                # Use matplotlib visualization
-                fig = plot_phoneme_emg_grid(emg_windows, phonemes)
-                if fig:
-                    st.pyplot(fig, use_container_width=True)
+                if is_groq_available():
+                    with st.spinner("Correcting phonemes with LLM..."):
+                        corrected_text = get_corrected_text(phoneme_seq)
+                        
+                        if corrected_text and len(corrected_text.strip()) > 0:
+                            display_final_text(corrected_text, success=True)
+                        else:
+                            st.info("ℹ️ LLM correction unavailable - showing raw phoneme sequence")
+                            display_final_text(phoneme_seq, success=False)
                 else:
-                    st.warning("Could not generate EMG plots")
-            except Exception as e:
-                import traceback
-                st.warning("EMG plotting failed - showing placeholder")
-                st.error(f"Error: {str(e)}")
-                st.code(traceback.format_exc())
-        
-        # Two-column layout for phonemes and text
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("### Phoneme Sequence")
-            if 'builder_phoneme_sequence' in st.session_state:
-                display_phonemes(st.session_state['builder_phoneme_sequence'])
-        
-        with col2:
-            st.markdown("### Reconstructed Text")
-            if 'builder_phoneme_sequence' in st.session_state:
-                phoneme_seq = st.session_state['builder_phoneme_sequence']
-                
-                # Try LLM correction with Groq API
-                try:
-                    from utils.cloud_llm import correct_phonemes_with_groq, is_groq_available
-                    
-                    if is_groq_available():
-                        with st.spinner("Correcting phonemes with LLM..."):
-                            if isinstance(phoneme_seq, str):
-                                phoneme_list = phoneme_seq.split()
-                            else:
-                                phoneme_list = phoneme_seq
-                            
-                            corrected_text = correct_phonemes_with_groq(phoneme_list, timeout=15)
-                            
-                            if corrected_text and len(corrected_text.strip()) > 0:
-                                display_final_text(corrected_text, success=True)
-                            else:
-                                st.info("ℹ️ LLM correction unavailable - showing raw phoneme sequence")
-                                display_final_text(phoneme_seq, success=False)
-                    else:
-                        st.info("ℹ️ LLM correction unavailable (API key not set)")
-                        st.caption("💡 Tip: Add GROQ_API_KEY to Streamlit secrets for LLM correction")
-                        display_final_text(phoneme_seq, success=False)
-                            
-                except ImportError:
-                    st.info("ℹ️ LLM not available - showing raw phonemes")
+                    st.info("ℹ️ LLM correction unavailable (API key not set)")
+                    st.caption("💡 Tip: Add GROQ_API_KEY to Streamlit secrets for LLM correction")
                     display_final_text(phoneme_seq, success=False)
-                except Exception as e:
-                    st.warning(f"⚠️ LLM error: {str(e)[:100]}")
-                    display_final_text(phoneme_seq, success=False)
-        
-        # Reset button
-        st.markdown("---")
-        if st.button("🔄 New Analysis", use_container_width=True):
-            st.session_state['builder_processing'] = False
-            st.rerun()
+                        
+            except ImportError:
+                st.info("ℹ️ LLM not available - showing raw phonemes")
+                display_final_text(phoneme_seq, success=False)
+            except Exception as e:
+                st.warning(f"⚠️ LLM error: {str(e)[:100]}")
+                display_final_text(phoneme_seq, success=False)
     
+    # Reset button
+    st.markdown("---")
+    if st.button("🔄 New Analysis", use_container_width=True):
+        st.session_state['builder_processing'] = False
+        st.rerun()
+
+
+@st.fragment
+@timed()
+def render_continuous_decoding():
+    """Sliding-window timeline (needs the model). Moving the hop slider reruns only this fragment."""
+    if pipeline is None or 'builder_emg_windows' not in st.session_state:
+        return
+    
+    st.markdown("### Continuous Decoding")
+    st.caption("The classifier slides across the joined EMG signal; lines show each phoneme's probability per sample, including confusions at the boundaries.")
+    hop = st.select_slider("Hop (samples)", options=[1, 2, 3, 4, 5], value=1, key="timeline_hop")
+    try:
+        result = pipeline.predict_timeline(st.session_state['builder_emg_windows'], hop=hop)
+        fig = plot_probability_timeline(result['timeline'], st.session_state['builder_phonemes_list'])
+        if fig:
+            st.plotly_chart(fig, use_container_width=True)
+        st.caption("Decoded: " + " ".join(
+            f"{phoneme} ({end - start})" for phoneme, start, end, _ in result['segments']
+        ))
+    except Exception as e:
+        st.warning(f"Continuous decoding failed: {str(e)[:100]}")
+
+
+with page_tab1:
+    # Phoneme Builder Page Content
+    render_builder()
+    
+    # Display results if processing is complete
+    if st.session_state.get('builder_processing', False):
+        render_results()
+        render_continuous_decoding()
     else:
         # Placeholder when no processing
         st.markdown("---")
         st.info("👈 Select phonemes from the grid above and click 'Analyze EMG Signals' to begin analysis.")
 
+with page_tab_playback:
+    render_live_playback(pipeline)
+    st.markdown("---")
+    render_recording_browser()
+
 with page_tab2:
     # Exhibits Page Content
     st.markdown("## Principal Component Analysis Exhibits")
@@ -415,9 +338,9 @@ with page_tab2:
     
     with col_img1:
         try:
-            img_path = os.path.join(os.path.dirname(__file__), 'pc1_correlation.png')
-            if os.path.exists(img_path):
-                st.image(img_path, use_container_width=True)
+            image = get_image_bytes('pc1_correlation.png')
+            if image:
+                st.image(image, use_container_width=True)
             else:
                 st.error("Image not found: pc1_correlation.png")
         except Exception as e:
@@ -445,9 +368,9 @@ with page_tab2:
     
     with col_img2:
         try:
-            img_path = os.path.join(os.path.dirname(__file__), 'pc1_timeseries.png')
-            if os.path.exists(img_path):
-                st.image(img_path, use_container_width=True)
+            image = get_image_bytes('pc1_timeseries.png')
+            if image:
+                st.image(image, use_container_width=True)
             else:
                 st.error("Image not found: pc1_timeseries.png")
         except Exception as e:
@@ -459,3 +382,7 @@ with page_tab2:
         
         The timeseries shows how PC1 evolves over time across attempted speech and silent conditions. Consistent patterns support the correlation findings, demonstrating similar neural activation even when speech production is absent.
         """)
+
+# Close this rerun's timing record, then draw the panel (it shows the finished rerun)
+end_rerun()
+render_perf_panel()
@@ -20,7 +20,7 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 if script_dir not in sys.path:
     sys.path.insert(0, script_dir)
 
-from components.emg_visualizer import plot_phoneme_emg_grid
+from components.emg_visualizer import close_figure, plot_phoneme_emg_grid
 from components.phoneme_display import display_phonemes
 from components.text_output import display_final_text
 from components.phoneme_builder import (
@@ -372,6 +372,7 @@ col_left, col_right = st.columns([2.5, 1])
             fig = plot_phoneme_emg_grid(emg_windows, phonemes)
             if fig:
                 st.pyplot(fig, use_container_width=True)
+                close_figure(fig)
             else:
                 st.warning("Could not generate EMG plots")
         except Exception as e:
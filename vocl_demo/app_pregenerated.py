@@ -9,7 +9,6 @@ import streamlit as st
 import json
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Page configuration
 st.set_page_config(
@@ -64,7 +63,11 @@ def plot_emg_signals(emg_data):
     channels = ['DLI', 'OOS', 'OOI', 'Platysma']
     colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
     
-    fig, axes = plt.subplots(4, 1, figsize=(10, 8), sharex=True)
+    from matplotlib.figure import Figure  # Only needed once a phrase is shown
+    
+    # Not registered with pyplot, so it is freed after st.pyplot renders it
+    fig = Figure(figsize=(10, 8))
+    axes = fig.subplots(4, 1, sharex=True)
     fig.suptitle('EMG Signal Channels', fontsize=14, fontweight='bold')
     
     time_points = np.arange(5) * 4  # 4ms per sample
@@ -76,7 +79,7 @@ def plot_emg_signals(emg_data):
         axes[i].set_ylim([0, 1])  # Normalized data range
     
     axes[-1].set_xlabel('Time (ms)', fontweight='bold')
-    plt.tight_layout()
+    fig.tight_layout()
     
     return fig
 
@@ -131,9 +134,9 @@ if demo_data is None:
     **To generate demo data:**
     1. Run in your working Python environment:
        ```bash
-       python3 generate_demo_data.py
+       python3 precompute_demo_artifacts.py
        ```
-    2. This will create the JSON file with pre-computed results
+    2. This will create the JSON file with pre-computed results (and the phoneme library)
     3. Then refresh this page
     """)
     st.stop()
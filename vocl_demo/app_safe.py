@@ -10,9 +10,11 @@ import os
 
 # Configure environment FIRST
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
-os.environ['OMP_NUM_THREADS'] = '1'
-os.environ['TF_NUM_INTEROP_THREADS'] = '1'
-os.environ['TF_NUM_INTRAOP_THREADS'] = '1'
+
+# Host-aware thread settings ("safe" single-threading on macOS)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from utils.threading_policy import ensure_threading_profile
+ensure_threading_profile()
 
 # Page configuration
 st.set_page_config(
@@ -79,11 +81,18 @@ st.success(f"✓ TensorFlow {tf_version} loaded successfully")
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.pipeline import get_pipeline
+from components.model_status import render_model_status
 from components.emg_visualizer import plot_emg_signals
 from components.phoneme_display import display_phonemes
 from components.text_output import display_final_text
 
+# Model loads in the background; the sidebar shows its progress and the page
+# reruns by itself once it is warmed up
+pipeline = render_model_status()
+
 # Rest of the app code...
-st.info("App is ready! Use the navigation sidebar to access features.")
+if pipeline is not None:
+    st.info("App is ready! Use the navigation sidebar to access features.")
+else:
+    st.info("Loading the EMG model - see the sidebar for progress.")
 
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Compare the interactive EMG renderers as the builder sequence grows.
+
+- subplots: plot_phoneme_emg_grid_interactive (4 SVG traces + axis updates per phoneme)
+- webgl:    plot_phoneme_emg_strip_webgl (4 Scattergl traces in total)
+
+Reported per sequence length: figure build time, trace count and the size of the
+figure JSON that Streamlit sends to the browser.
+
+Usage:
+    python vocl_demo/benchmarks/benchmark_interactive_plot.py
+    python vocl_demo/benchmarks/benchmark_interactive_plot.py --lengths 5 30 100 --repeats 5
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DEMO_DIR)
+
+from components.emg_visualizer import plot_phoneme_emg_grid_interactive, plot_phoneme_emg_strip_webgl
+
+
+def measure(build, emg_windows, phonemes, repeats):
+    """
+    Returns:
+        Tuple of (median build time in ms, trace count, JSON size in KB)
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fig = build(emg_windows, phonemes)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.median(timings), len(fig.data), len(fig.to_json()) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark interactive EMG figure builds")
+    parser.add_argument('--lengths', type=int, nargs='+', default=[4, 10, 30, 60, 120])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    renderers = {'subplots': plot_phoneme_emg_grid_interactive, 'webgl': plot_phoneme_emg_strip_webgl}
+    rng = np.random.default_rng(0)
+
+    print(f"{'phonemes':>8} {'renderer':>9} {'build (ms)':>11} {'traces':>7} {'JSON (KB)':>10}")
+    for length in args.lengths:
+        emg_windows = [rng.random((4, 5)) for _ in range(length)]
+        phonemes = [f'p{i}' for i in range(length)]
+        for name, build in renderers.items():
+            build_ms, traces, size_kb = measure(build, emg_windows, phonemes, args.repeats)
+            print(f"{length:>8} {name:>9} {build_ms:>11.1f} {traces:>7} {size_kb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
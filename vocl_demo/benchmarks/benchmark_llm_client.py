@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-token and total latency of the LLM correction clients, before and after
+connection pooling and streaming.
+
+Everything runs against the local stub (llm_stub_server.py), whose simulated
+per-connection cost stands in for the TCP + TLS handshake to the real API:
+
+    groq, new client per call   the old correct_phonemes_with_groq (Groq(...) every call)
+    groq, pooled                cloud_llm.correct_phonemes_with_groq (shared client)
+    groq, pooled + streaming    cloud_llm.stream_phonemes_with_groq (first token shown early)
+    ollama, requests.post       the old llm_corrector (no session)
+    ollama, pooled session      llm_corrector.correct_phonemes_with_llm
+
+Variants whose library (groq, requests) is not installed are skipped.
+
+Usage:
+    python vocl_demo/benchmarks/benchmark_llm_client.py
+    python vocl_demo/benchmarks/benchmark_llm_client.py --calls 50 --connect-ms 80 --first-token-ms 200
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DEMO_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from llm_stub_server import start_stub_server
+
+PHONEMES = ['HH', 'EH', 'L', 'OW', 'W', 'ER', 'L', 'D']
+
+
+def measure(call, calls):
+    """
+    Run call() calls times; call yields text pieces as they arrive.
+
+    Returns:
+        Tuple of (first-piece latencies ms, total latencies ms)
+    """
+    first, total = [], []
+    for _ in range(calls):
+        start = time.perf_counter()
+        ttft = None
+        for _ in call():
+            if ttft is None:
+                ttft = (time.perf_counter() - start) * 1000
+        total.append((time.perf_counter() - start) * 1000)
+        first.append(ttft if ttft is not None else total[-1])
+    return np.array(first), np.array(total)
+
+
+def groq_variants(base_url):
+    try:
+        from groq import Groq
+    except ImportError:
+        print("groq not installed - skipping the Groq client variants")
+        return {}
+
+    os.environ['GROQ_API_KEY'] = 'stub'
+    os.environ['GROQ_BASE_URL'] = base_url
+    from utils import cloud_llm
+
+    def per_call_client():
+        # What correct_phonemes_with_groq did before: a fresh client (and connection) per call
+        client = Groq(api_key=os.environ['GROQ_API_KEY'])
+        response = client.chat.completions.create(
+            model=cloud_llm.MODEL,
+            messages=[{"role": "user", "content": f"Phonemes: {' '.join(PHONEMES)}"}],
+            temperature=0.3, max_tokens=50, timeout=15
+        )
+        yield response.choices[0].message.content
+
+    def pooled():
+        yield cloud_llm.correct_phonemes_with_groq(PHONEMES)
+
+    def pooled_stream():
+        yield from cloud_llm.stream_phonemes_with_groq(PHONEMES)
+
+    return {
+        'groq, new client per call': per_call_client,
+        'groq, pooled': pooled,
+        'groq, pooled + streaming': pooled_stream,
+    }
+
+
+def ollama_variants(base_url):
+    try:
+        import requests
+    except ImportError:
+        print("requests not installed - skipping the Ollama client variants")
+        return {}
+
+    from utils.llm_corrector import correct_phonemes_with_llm
+
+    api_url = f"{base_url}/api/generate"
+
+    def unpooled():
+        response = requests.post(api_url, json={"model": "llama3.2:3b", "prompt": f"Phonemes: {' '.join(PHONEMES)}",
+                                                "stream": False}, timeout=5)
+        yield response.json()['response']
+
+    def pooled():
+        yield correct_phonemes_with_llm(' '.join(PHONEMES), api_url=api_url)
+
+    return {
+        'ollama, requests.post': unpooled,
+        'ollama, pooled session': pooled,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LLM client latency against a local stub")
+    parser.add_argument('--calls', type=int, default=20)
+    parser.add_argument('--connect-ms', type=float, default=50, help="Simulated handshake per connection")
+    parser.add_argument('--first-token-ms', type=float, default=150)
+    parser.add_argument('--token-ms', type=float, default=20)
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(0, args.connect_ms, args.first_token_ms, args.token_ms)
+    variants = {**groq_variants(base_url), **ollama_variants(base_url)}
+    if not variants:
+        sys.exit("Neither groq nor requests is installed.")
+
+    print(f"\nStub: {args.connect_ms:.0f} ms per connection, {args.first_token_ms:.0f} ms to first token, "
+          f"{args.token_ms:.0f} ms per token; {args.calls} calls each")
+    print(f"{'Variant':<28} {'TTFT median':>12} {'TTFT p95':>10} {'Total median':>13} {'Total p95':>10} {'Conns':>6}")
+    print("-" * 84)
+    for name, call in variants.items():
+        list(call())  # Warm-up (imports, first connection)
+        connections = server.connections
+        first, total = measure(call, args.calls)
+        print(f"{name:<28} {np.median(first):>10.1f}ms {np.percentile(first, 95):>8.1f}ms "
+              f"{np.median(total):>11.1f}ms {np.percentile(total, 95):>8.1f}ms "
+              f"{server.connections - connections:>6}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
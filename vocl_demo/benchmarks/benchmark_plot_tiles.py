@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Compare the builder's EMG grid rendering paths over many reruns.
+
+- figure: plot_phoneme_emg_grid + PNG export (what st.pyplot does) + close_figure
+- tiles:  plot_phoneme_emg_grid_image, composed from cached per-phoneme tiles
+
+Each rerun renders the same builder sequence, as a Streamlit rerun would. Reported are
+the median/p95 render time and resident memory growth from the first to the last rerun.
+
+Usage:
+    python vocl_demo/benchmarks/benchmark_plot_tiles.py
+    python vocl_demo/benchmarks/benchmark_plot_tiles.py --reruns 1000 --phonemes 12
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DEMO_DIR)
+
+from components.emg_visualizer import close_figure, plot_phoneme_emg_grid, plot_phoneme_emg_grid_image
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def render_figure(emg_windows, phonemes):
+    fig = plot_phoneme_emg_grid(emg_windows, phonemes)
+    fig.savefig(io.BytesIO(), format='png')
+    close_figure(fig)
+
+
+def render_tiles(emg_windows, phonemes):
+    plot_phoneme_emg_grid_image(emg_windows, phonemes)
+
+
+def run(render, emg_windows, phonemes, reruns):
+    """
+    Returns:
+        Tuple of (per-rerun times in ms, RSS growth in MB)
+    """
+    render(emg_windows, phonemes)  # Warm-up (fonts, first tile renders)
+    start_rss = rss_mb()
+    timings = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        render(emg_windows, phonemes)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings), rss_mb() - start_rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EMG grid rendering across reruns")
+    parser.add_argument('--reruns', type=int, default=1000)
+    parser.add_argument('--phonemes', type=int, default=8, help="Builder sequence length")
+    parser.add_argument('--paths', nargs='+', choices=['figure', 'tiles'], default=['tiles', 'figure'])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    emg_windows = [rng.random((4, 5)) for _ in range(args.phonemes)]
+    phonemes = [f'p{i}' for i in range(args.phonemes)]
+    renderers = {'figure': render_figure, 'tiles': render_tiles}
+
+    print(f"{args.phonemes} phonemes, {args.reruns} reruns")
+    print(f"{'path':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'RSS growth (MB)':>16}")
+    for path in args.paths:
+        timings, growth = run(renderers[path], emg_windows, phonemes, args.reruns)
+        print(f"{path:>8} {np.percentile(timings, 50):>9.2f} {np.percentile(timings, 95):>9.2f} {growth:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
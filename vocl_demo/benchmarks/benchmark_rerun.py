@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Measure the wall time of a Streamlit script rerun, and the files it opens.
+
+The app is run headless with streamlit.testing.v1.AppTest: one cold run, then --reruns
+timed reruns. File opens during the timed reruns are counted with an audit hook, so
+anything still doing disk I/O on every rerun shows up.
+
+To compare before/after a change, run it on both commits:
+    python vocl_demo/benchmarks/benchmark_rerun.py
+    git stash && python vocl_demo/benchmarks/benchmark_rerun.py && git stash pop
+
+Usage:
+    python vocl_demo/benchmarks/benchmark_rerun.py --app app.py --reruns 50
+"""
+
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+
+import numpy as np
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+_opened = Counter()
+_recording = False
+
+
+def _audit(event, args):
+    if _recording and event == 'open' and isinstance(args[0], str):
+        _opened[os.path.relpath(args[0], DEMO_DIR)] += 1
+
+
+def main():
+    global _recording
+
+    parser = argparse.ArgumentParser(description="Time Streamlit reruns of the demo")
+    parser.add_argument('--app', default='app.py', help="Script inside vocl_demo/")
+    parser.add_argument('--reruns', type=int, default=30)
+    parser.add_argument('--timeout', type=float, default=60)
+    args = parser.parse_args()
+
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(DEMO_DIR)
+    sys.addaudithook(_audit)
+
+    app = AppTest.from_file(args.app, default_timeout=args.timeout)
+    start = time.perf_counter()
+    app.run()
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    _recording = True
+    for _ in range(args.reruns):
+        start = time.perf_counter()
+        app.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    _recording = False
+
+    print(f"{args.app}: cold run {cold_ms:.1f} ms")
+    print(f"rerun median {np.median(timings):.1f} ms, p95 {np.percentile(timings, 95):.1f} ms "
+          f"over {args.reruns} reruns")
+
+    # Ignore the interpreter's own module/bytecode reads
+    app_files = {path: count for path, count in _opened.items()
+                 if not path.endswith(('.py', '.pyc')) and 'site-packages' not in path}
+    print(f"files opened per rerun: {sum(app_files.values()) / args.reruns:.1f}")
+    for path, count in sorted(app_files.items(), key=lambda item: -item[1]):
+        print(f"  {count / args.reruns:5.1f}  {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Rerun-latency benchmark suite for the demo apps, compared against a stored baseline.
+
+Each app is driven headless (streamlit.testing.v1.AppTest) through scripted user
+scenarios - add 1/10/40 phonemes, analyze, reset - and every rerun is measured:
+wall time, files opened (audit hook, interpreter module reads excluded) and peak RSS
+during the rerun (VmHWM, reset before each rerun; the process peak where /proc is
+unavailable). app_pregenerated.py has no builder, so it only runs the analyze
+("Process Phrase") and reset scenarios.
+
+Every app x phoneme count runs in a fresh subprocess (cold module and cache_resource
+state, its own memory peak), so numbers don't depend on which apps ran before.
+
+The LLM is stubbed (cloud_llm is patched to answer locally after --llm-latency-ms),
+so no API key or network is used. The EMG model is not loaded unless --with-model is
+given, in which case timing starts once it has warmed up.
+
+Results are compared with benchmarks/baseline_scenarios.json; the script exits with 1
+if any scenario regressed beyond the tolerances. The baseline is machine specific and
+not committed: record it once per machine with --save-baseline (it stores the host and
+commit it was taken on), and again after an intended change. Without a baseline the
+script exits with 2 before running anything.
+
+Usage:
+    python vocl_demo/benchmarks/benchmark_scenarios.py
+    python vocl_demo/benchmarks/benchmark_scenarios.py --apps app.py --repeat 5
+    python vocl_demo/benchmarks/benchmark_scenarios.py --save-baseline
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import subprocess
+from collections import Counter
+
+import numpy as np
+
+DEMO_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, DEMO_DIR)
+
+BASELINE_PATH = os.path.join(DEMO_DIR, 'benchmarks', 'baseline_scenarios.json')
+PHONEME_COUNTS = (1, 10, 40)
+RESULT_MARKER = 'SCENARIO_RESULTS '  # Prefix of the worker's result line on stdout
+
+# Per app: whether it has the phoneme builder, and its analyze and reset buttons
+APPS = {
+    'app.py': {'builder': True, 'analyze': "🔬 Analyze EMG Signals", 'reset': "🔄 New Analysis"},
+    'app_minimal.py': {'builder': True, 'analyze': "🔨 Build Word", 'reset': "🔄 Build Another Word"},
+    'app_pregenerated.py': {'builder': False, 'analyze': "🚀 Process Phrase",
+                            'reset': "🔄 Process Another Phrase"},
+}
+CLEAR_LABEL = "🗑️ Clear Sequence"
+
+_opened = Counter()
+_recording = False
+
+
+def _audit(event, args):
+    if _recording and event == 'open' and isinstance(args[0], str):
+        _opened[args[0]] += 1
+
+
+def _app_file_reads():
+    """Files opened while recording, without the interpreter's own module/bytecode reads."""
+    return sum(count for path, count in _opened.items()
+               if not path.endswith(('.py', '.pyc')) and 'site-packages' not in path)
+
+
+def reset_peak_rss():
+    """Restart this process's peak-RSS counter (Linux only; a no-op elsewhere)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def peak_rss_mb():
+    """Peak resident set size since reset_peak_rss() (process lifetime without /proc), in MB."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def stub_llm(latency_ms):
+    """Replace the Groq calls with a local answer (concatenated phonemes) after latency_ms."""
+    from utils import cloud_llm
+
+    def correct_phonemes_with_groq(phoneme_sequence, timeout=15):
+        time.sleep(latency_ms / 1000)
+        phonemes = phoneme_sequence.split() if isinstance(phoneme_sequence, str) else phoneme_sequence
+        return ''.join(phonemes).lower()
+
+    def stream_phonemes_with_groq(phoneme_sequence, timeout=15):
+        yield correct_phonemes_with_groq(phoneme_sequence, timeout)
+
+    os.environ.pop('GROQ_API_KEY', None)
+    cloud_llm.correct_phonemes_with_groq = correct_phonemes_with_groq
+    cloud_llm.stream_phonemes_with_groq = stream_phonemes_with_groq
+    cloud_llm.is_groq_available = lambda: True
+
+
+def prepare_model(with_model, timeout):
+    """Either warm the shared pipeline up front or park it unloaded for the whole run."""
+    from utils import pipeline
+
+    if with_model:
+        print("Waiting for the EMG model to warm up...")
+        pipeline.get_pipeline(wait=True, stage='warmed_up', timeout=timeout)
+        return
+    # An unloaded pipeline in the global slot: start_pipeline() never starts the loader
+    with pipeline._pipeline_lock:
+        if pipeline._pipeline is None:
+            pipeline._pipeline = pipeline.VOCLPipeline(load=False)
+
+
+class ScenarioRunner:
+    """Runs one AppTest session and records every rerun under the current scenario name."""
+
+    def __init__(self, app_file, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.app = AppTest.from_file(app_file, default_timeout=timeout)
+        self.app_file = app_file
+        self.results = {}  # scenario -> {'ms': [...], 'reads': [...], 'peak_rss_mb': max over reruns}
+
+    def _check(self):
+        if self.app.exception:
+            raise RuntimeError(f"{self.app_file} raised: {self.app.exception[0].message}")
+
+    def _button(self, label):
+        for button in self.app.button:
+            if button.label == label:
+                return button
+        raise LookupError(f"{self.app_file}: no button {label!r}")
+
+    def start(self):
+        """Cold run (imports, caches), not recorded."""
+        self.app.run()
+        self._check()
+
+    def rerun(self, scenario, element=None):
+        """Click element (or just rerun) and record the rerun under scenario."""
+        global _recording
+
+        _opened.clear()
+        reset_peak_rss()
+        _recording = True
+        start = time.perf_counter()
+        if element is not None:
+            element.click().run()
+        else:
+            self.app.run()
+        elapsed = (time.perf_counter() - start) * 1000
+        _recording = False
+        self._check()
+
+        result = self.results.setdefault(scenario, {'ms': [], 'reads': [], 'peak_rss_mb': 0.0})
+        result['ms'].append(elapsed)
+        result['reads'].append(_app_file_reads())
+        result['peak_rss_mb'] = max(result['peak_rss_mb'], peak_rss_mb())
+
+    def add_phonemes(self, count):
+        phoneme_buttons = [button.key for button in self.app.button
+                           if button.key and button.key.startswith('phoneme_')]
+        for i in range(count):
+            # Cycle through the grid; look the button up again, the tree changes per run
+            key = phoneme_buttons[i % len(phoneme_buttons)]
+            self.rerun(f"add {count}", self.app.button(key=key))
+
+    def click(self, scenario, label):
+        self.rerun(scenario, self._button(label))
+
+
+def run_scenarios(app_file, count, timeout):
+    """
+    One session of an app (worker process): add count phonemes (builder apps), analyze, reset.
+
+    Returns:
+        {scenario: {'ms': [...], 'reads': [...], 'peak_rss_mb': float}}
+    """
+    spec = APPS[app_file]
+    runner = ScenarioRunner(app_file, timeout)
+    runner.start()
+    suffix = f" {count}" if count else ""
+    if count:
+        runner.add_phonemes(count)
+    runner.click(f"analyze{suffix}", spec['analyze'])
+    runner.click(f"reset{suffix}", spec['reset'])
+    if spec['builder']:
+        runner.click(f"reset{suffix}", CLEAR_LABEL)
+    return runner.results
+
+
+def run_worker(args):
+    """Entry point of the subprocess started by run_app()."""
+    os.chdir(DEMO_DIR)
+    stub_llm(args.llm_latency_ms)
+    prepare_model(args.with_model, args.timeout * 10)
+    sys.addaudithook(_audit)
+    results = run_scenarios(args.worker, args.count, args.timeout)
+    print(RESULT_MARKER + json.dumps(results), flush=True)
+
+
+def run_app(app_file, args):
+    """All scenarios of one app, args.repeat times, each phoneme count in a fresh subprocess."""
+    spec = APPS[app_file]
+    results = {}
+    for _ in range(args.repeat):
+        for count in (PHONEME_COUNTS if spec['builder'] else (0,)):
+            command = [sys.executable, os.path.abspath(__file__), '--worker', app_file, '--count', str(count),
+                       '--timeout', str(args.timeout), '--llm-latency-ms', str(args.llm_latency_ms)]
+            if args.with_model:
+                command.append('--with-model')
+            process = subprocess.run(command, capture_output=True, text=True)
+            lines = [line for line in process.stdout.splitlines() if line.startswith(RESULT_MARKER)]
+            if process.returncode != 0 or not lines:
+                raise RuntimeError(f"{app_file} ({count} phonemes) failed:\n{process.stderr[-2000:]}")
+
+            for scenario, result in json.loads(lines[-1][len(RESULT_MARKER):]).items():
+                merged = results.setdefault(scenario, {'ms': [], 'reads': [], 'peak_rss_mb': 0.0})
+                merged['ms'] += result['ms']
+                merged['reads'] += result['reads']
+                merged['peak_rss_mb'] = max(merged['peak_rss_mb'], result['peak_rss_mb'])
+
+    return {
+        scenario: {
+            'reruns': len(result['ms']),
+            'median_ms': round(float(np.median(result['ms'])), 2),
+            'p95_ms': round(float(np.percentile(result['ms'], 95)), 2),
+            'reads_per_rerun': round(float(np.mean(result['reads'])), 2),
+            'peak_rss_mb': round(result['peak_rss_mb'], 1),
+        }
+        for scenario, result in results.items()
+    }
+
+
+def compare(results, baseline, tolerance, rss_tolerance_mb):
+    """
+    Returns:
+        List of regression messages (empty if everything is within tolerance)
+    """
+    regressions = []
+    for app_file, scenarios in results.items():
+        for scenario, metrics in scenarios.items():
+            reference = baseline.get('apps', {}).get(app_file, {}).get(scenario)
+            if reference is None:
+                continue
+            name = f"{app_file} / {scenario}"
+            if metrics['median_ms'] > reference['median_ms'] * tolerance:
+                regressions.append(f"{name}: median {metrics['median_ms']:.1f} ms "
+                                   f"(baseline {reference['median_ms']:.1f} ms)")
+            if metrics['reads_per_rerun'] > reference['reads_per_rerun'] + 0.5:
+                regressions.append(f"{name}: {metrics['reads_per_rerun']:.1f} file reads per rerun "
+                                   f"(baseline {reference['reads_per_rerun']:.1f})")
+            if metrics['peak_rss_mb'] > reference['peak_rss_mb'] + rss_tolerance_mb:
+                regressions.append(f"{name}: peak RSS {metrics['peak_rss_mb']:.0f} MB "
+                                   f"(baseline {reference['peak_rss_mb']:.0f} MB)")
+    return regressions
+
+
+def environment():
+    import streamlit
+    return {'host': platform.node(), 'python': platform.python_version(), 'platform': platform.platform(),
+            'streamlit': streamlit.__version__}
+
+
+def git_commit():
+    """Commit the tree is at (with a -dirty suffix for local changes), None outside git."""
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=DEMO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark demo reruns through scripted scenarios")
+    parser.add_argument('--apps', nargs='+', default=list(APPS), choices=list(APPS))
+    parser.add_argument('--repeat', type=int, default=3, help="Scenario repetitions per app")
+    parser.add_argument('--timeout', type=float, default=60, help="Seconds allowed per rerun")
+    parser.add_argument('--llm-latency-ms', type=float, default=0, help="Delay of the stubbed LLM")
+    parser.add_argument('--with-model', action='store_true', help="Load and warm up the EMG model first")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baseline")
+    parser.add_argument('--tolerance', type=float, default=1.25, help="Allowed median slowdown factor")
+    parser.add_argument('--rss-tolerance-mb', type=float, default=50)
+    parser.add_argument('--output', help="Also write the results as JSON")
+    parser.add_argument('--worker', choices=list(APPS), help=argparse.SUPPRESS)
+    parser.add_argument('--count', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    if not args.save_baseline and not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}. Baselines are per machine: record one with "
+              f"--save-baseline on this machine first.", file=sys.stderr)
+        sys.exit(2)
+
+    results = {}
+    for app_file in args.apps:
+        print(f"Running {app_file}...")
+        results[app_file] = run_app(app_file, args)
+
+    baseline = None
+    if not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"\n{'App / scenario':<36} {'Reruns':>6} {'Median':>9} {'p95':>9} {'Reads':>6} {'Peak RSS':>9} {'vs base':>8}")
+    print("-" * 89)
+    for app_file, scenarios in results.items():
+        for scenario, m in scenarios.items():
+            reference = (baseline or {}).get('apps', {}).get(app_file, {}).get(scenario)
+            ratio = f"{m['median_ms'] / reference['median_ms']:.2f}x" if reference else "-"
+            print(f"{app_file + ' / ' + scenario:<36} {m['reruns']:>6} {m['median_ms']:>7.1f}ms "
+                  f"{m['p95_ms']:>7.1f}ms {m['reads_per_rerun']:>6.1f} {m['peak_rss_mb']:>7.0f}MB {ratio:>8}")
+
+    report = {'environment': environment(), 'commit': git_commit(), 'with_model': args.with_model,
+              'llm_latency_ms': args.llm_latency_ms, 'apps': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    print(f"\nBaseline: commit {baseline.get('commit') or 'unknown'} "
+          f"on {baseline.get('environment', {}).get('host', 'unknown host')}")
+    if baseline.get('environment') != report['environment'] or baseline.get('with_model') != args.with_model:
+        print("\nNote: baseline was recorded with a different environment or model setting.")
+
+    regressions = compare(results, baseline, args.tolerance, args.rss_tolerance_mb)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against the baseline:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
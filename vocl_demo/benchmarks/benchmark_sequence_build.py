@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Time VOCLPipeline.build_emg_sequence against sequence length.
+
+Three ways of scoring an N-phoneme sequence are compared:
+- loop:  one model.predict per (4, 5) window (the original implementation)
+- batch: one model.predict over the stacked (N, 4, 5) windows
+- table: rows looked up in the precomputed prediction table
+
+Usage:
+    python vocl_demo/benchmarks/benchmark_sequence_build.py
+    python vocl_demo/benchmarks/benchmark_sequence_build.py --lengths 1 10 50 100 --repeats 50
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DEMO_DIR)
+
+from utils.pipeline import PHONEMES, VOCLPipeline
+
+
+def median_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EMG sequence building")
+    parser.add_argument('--lengths', type=int, nargs='+', default=[1, 5, 10, 20, 50])
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args()
+
+    pipeline = VOCLPipeline()
+    pipeline.get_prediction_table()
+    rng = np.random.default_rng(0)
+
+    def loop(rows):
+        for row in rows:
+            pipeline.model.predict(pipeline.X_test[row].reshape(1, 4, 5), verbose=0)
+
+    print(f"{'length':>6} {'loop (ms)':>10} {'batch (ms)':>11} {'table (ms)':>11}")
+    for length in args.lengths:
+        phoneme_indices = rng.integers(1, len(PHONEMES), size=length).tolist()
+        rows = np.array([pipeline._row_for_phoneme(i) for i in phoneme_indices])
+
+        # Warm-up so graph tracing for this batch shape isn't timed
+        loop(rows[:1])
+        pipeline.predict_windows(pipeline.X_test[rows])
+
+        loop_ms = median_ms(lambda: loop(rows), args.repeats)
+        batch_ms = median_ms(lambda: pipeline.predict_windows(pipeline.X_test[rows]), args.repeats)
+        table_ms = median_ms(lambda: pipeline.build_emg_sequence(phoneme_indices, return_alternatives=True),
+                             args.repeats)
+        print(f"{length:>6} {loop_ms:>10.2f} {batch_ms:>11.2f} {table_ms:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Load-test the inference sidecar with simulated concurrent Streamlit sessions.
+
+Each session is a thread with its own connection. It repeatedly sends one builder
+sequence (1-20 windows), like an "Analyze" click, and records the round-trip latency.
+p50/p95 latency and throughput are reported per concurrency level.
+
+The sidecar is started as a subprocess unless --socket points at a running one.
+
+Usage:
+    python vocl_demo/benchmarks/benchmark_sidecar.py
+    python vocl_demo/benchmarks/benchmark_sidecar.py --sessions 1 10 50 --requests 100
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import subprocess
+
+import numpy as np
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DEMO_DIR)
+
+from utils.inference_sidecar import DEFAULT_SOCKET, InferenceClient
+
+
+def start_sidecar(socket_path, timeout=120):
+    """Launch the sidecar and wait until its socket accepts a request."""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'utils.inference_sidecar', '--socket', socket_path],
+        cwd=DEMO_DIR
+    )
+    client = InferenceClient(socket_path)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Sidecar exited during startup")
+        try:
+            client.predict(np.zeros((1, 4, 5), dtype=np.float32))
+            client.close()
+            return process
+        except OSError:
+            time.sleep(0.5)
+    process.terminate()
+    raise TimeoutError("Sidecar did not come up")
+
+
+def run_sessions(socket_path, sessions, requests, max_windows, seed=0):
+    """
+    Run concurrent sessions against the sidecar.
+
+    Returns:
+        Tuple of (latencies in ms, windows sent, wall time in s)
+    """
+    client = InferenceClient(socket_path)
+    latencies = [[] for _ in range(sessions)]
+    windows_sent = [0] * sessions
+    barrier = threading.Barrier(sessions)
+
+    def session(i):
+        rng = np.random.default_rng(seed + i)
+        barrier.wait()
+        for _ in range(requests):
+            windows = rng.random((rng.integers(1, max_windows + 1), 4, 5), dtype=np.float32)
+            start = time.perf_counter()
+            client.predict(windows)
+            latencies[i].append((time.perf_counter() - start) * 1000)
+            windows_sent[i] += len(windows)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    client.close()
+
+    return np.concatenate(latencies), sum(windows_sent), wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the inference sidecar")
+    parser.add_argument('--socket', help="Use an already running sidecar")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 5, 10, 20, 50])
+    parser.add_argument('--requests', type=int, default=50, help="Requests per session")
+    parser.add_argument('--max-windows', type=int, default=20, help="Largest sequence per request")
+    args = parser.parse_args()
+
+    socket_path = args.socket or DEFAULT_SOCKET
+    process = None if args.socket else start_sidecar(socket_path)
+
+    try:
+        print(f"{'sessions':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9} {'windows/s':>10}")
+        for sessions in args.sessions:
+            latencies, windows, wall = run_sessions(socket_path, sessions, args.requests, args.max_windows)
+            print(f"{sessions:>8} {np.percentile(latencies, 50):>9.2f} {np.percentile(latencies, 95):>9.2f} "
+                  f"{latencies.max():>9.2f} {windows / wall:>10.0f}")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Pick the fastest threading profile for a given batch size on this host.
+
+Thread settings are fixed once TensorFlow starts, so each profile is measured
+in its own subprocess.
+
+Usage:
+    python vocl_demo/benchmarks/benchmark_threading.py --batch-size 1
+    python vocl_demo/benchmarks/benchmark_threading.py --batch-size 644 --repeats 20
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, DEMO_DIR)
+
+from utils.threading_policy import PROFILE_NAMES, PROFILE_ENV_VAR, detect_host, get_profile
+
+
+def run_profile(profile_name, batch_size, repeats):
+    """Measure one profile in this process (called in the child subprocess)."""
+    import time
+    import numpy as np
+    from utils.threading_policy import apply_threading_profile
+
+    apply_threading_profile(profile_name)
+
+    from utils.pipeline import _import_tensorflow, MODEL_PATH
+    tf = _import_tensorflow()
+
+    infer = tf.saved_model.load(MODEL_PATH).signatures["serving_default"]
+    batch = tf.constant(np.random.rand(batch_size, 4, 5).astype(np.float32))
+
+    infer(batch)  # Warm-up (graph tracing)
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        infer(batch)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'profile': profile_name,
+        'median_ms': float(np.median(timings)),
+        'p95_ms': float(np.percentile(timings, 95)),
+        'windows_per_s': batch_size / (float(np.median(timings)) / 1000),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TensorFlow threading profiles")
+    parser.add_argument('--batch-size', type=int, default=1)
+    parser.add_argument('--repeats', type=int, default=100)
+    parser.add_argument('--child', choices=PROFILE_NAMES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_profile(args.child, args.batch_size, args.repeats)))
+        return
+
+    host = detect_host()
+    print(f"Host: {host['system']} {host['machine']}, {host['cpu_count']} CPUs, batch size {args.batch_size}")
+
+    results = []
+    for name in PROFILE_NAMES:
+        profile = get_profile(name, host)
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--child', name,
+             '--batch-size', str(args.batch_size), '--repeats', str(args.repeats)],
+            capture_output=True, text=True
+        )
+        if output.returncode != 0:
+            print(f"  {name:<10} FAILED: {output.stderr.strip().splitlines()[-1:]}")
+            continue
+
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        results.append(result)
+        print(f"  {name:<10} intra={profile['intra_op']:<3} inter={profile['inter_op']:<2} blas={profile['blas']:<3} "
+              f"median {result['median_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, "
+              f"{result['windows_per_s']:.0f} windows/s")
+
+    if not results:
+        sys.exit("No profile completed")
+
+    best = min(results, key=lambda r: r['median_ms'])
+    print(f"\nBest profile for batch size {args.batch_size}: {best['profile']}")
+    print(f"  export {PROFILE_ENV_VAR}={best['profile']}")
+
+
+if __name__ == "__main__":
+    main()
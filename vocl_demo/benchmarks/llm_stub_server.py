@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible LLM stub, for exercising the LLM clients without an API key.
+
+Serves chat completions (any path ending in /chat/completions, so the Groq SDK's
+/openai/v1/... works) with and without stream=True, and Ollama's /api/generate.
+The answer is the prompt's phonemes joined and lower-cased ("HH EH L OW" -> "hhehlow"),
+sent a word-piece at a time. Latencies are simulated: --connect-ms once per new TCP
+connection (what a TLS handshake to the real API costs), --first-token-ms before the
+first token and --token-ms between tokens. HTTP/1.1 keep-alive is supported, and the
+number of connections opened is tracked, so connection reuse is visible.
+
+Point the app at it:
+    python vocl_demo/benchmarks/llm_stub_server.py --port 8765
+    GROQ_BASE_URL=http://127.0.0.1:8765 GROQ_API_KEY=stub streamlit run vocl_demo/app.py
+
+Usage:
+    python vocl_demo/benchmarks/llm_stub_server.py --port 8765 --first-token-ms 150 --token-ms 20
+"""
+
+import re
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TOKEN_CHARS = 3  # Characters per streamed token
+
+
+def answer_for(prompt):
+    """The stub's answer for a correction prompt."""
+    match = re.search(r'Phonemes:\s*(.+)', prompt)
+    phonemes = match.group(1).split() if match else prompt.split()
+    return ''.join(phonemes).lower() or 'hello'
+
+
+def tokenize(text):
+    return [text[i:i + TOKEN_CHARS] for i in range(0, len(text), TOKEN_CHARS)] or ['']
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        time.sleep(self.server.connect_ms / 1000)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_chunked(self, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+    def _send_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _tokens(self, prompt):
+        """Answer tokens, paced like a model: first token latency, then per-token delay."""
+        time.sleep(self.server.first_token_ms / 1000)
+        for i, token in enumerate(tokenize(answer_for(prompt))):
+            if i:
+                time.sleep(self.server.token_ms / 1000)
+            yield token
+
+    def do_POST(self):
+        request = self._read_json()
+        with self.server.lock:
+            self.server.requests += 1
+
+        if self.path.endswith('/chat/completions'):
+            prompt = request.get('messages', [{}])[-1].get('content', '')
+            if request.get('stream'):
+                self._stream_chat(request, prompt)
+            else:
+                text = ''.join(self._tokens(prompt))
+                self._send_json({
+                    'id': 'chatcmpl-stub', 'object': 'chat.completion', 'created': int(time.time()),
+                    'model': request.get('model', 'stub'),
+                    'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text},
+                                 'finish_reason': 'stop'}],
+                    'usage': {'prompt_tokens': len(prompt.split()), 'completion_tokens': len(tokenize(text)),
+                              'total_tokens': len(prompt.split()) + len(tokenize(text))},
+                })
+        elif self.path == '/api/generate':
+            prompt = request.get('prompt', '')
+            if request.get('stream', True):
+                self._start_chunked('application/x-ndjson')
+                for token in self._tokens(prompt):
+                    self._send_chunk(json.dumps({'response': token, 'done': False}).encode() + b"\n")
+                self._send_chunk(json.dumps({'response': '', 'done': True}).encode() + b"\n")
+                self._send_chunk(b"")
+            else:
+                self._send_json({'response': ''.join(self._tokens(prompt)), 'done': True})
+        else:
+            self.send_error(404)
+
+    def _stream_chat(self, request, prompt):
+        self._start_chunked('text/event-stream')
+
+        def event(delta, finish_reason=None):
+            chunk = {'id': 'chatcmpl-stub', 'object': 'chat.completion.chunk', 'created': int(time.time()),
+                     'model': request.get('model', 'stub'),
+                     'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}]}
+            self._send_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+
+        for i, token in enumerate(self._tokens(prompt)):
+            event({'role': 'assistant', 'content': token} if i == 0 else {'content': token})
+        event({}, finish_reason='stop')
+        self._send_chunk(b"data: [DONE]\n\n")
+        self._send_chunk(b"")
+
+
+def start_stub_server(port=0, connect_ms=50, first_token_ms=150, token_ms=20):
+    """
+    Run the stub on a background thread.
+
+    Returns:
+        Tuple of (server, base URL); server.connections and server.requests count
+        what it has served, server.shutdown() stops it
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = 0
+    server.connect_ms = connect_ms
+    server.first_token_ms = first_token_ms
+    server.token_ms = token_ms
+    threading.Thread(target=server.serve_forever, name='llm-stub', daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible LLM stub")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--connect-ms', type=float, default=50, help="Delay per new connection")
+    parser.add_argument('--first-token-ms', type=float, default=150)
+    parser.add_argument('--token-ms', type=float, default=20)
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.port, args.connect_ms, args.first_token_ms, args.token_ms)
+    print(f"LLM stub listening on {url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Profile the import cost of each Streamlit entry point against a time budget.
+
+For every app, the module-level import statements (what runs before the first screen
+is drawn) are executed in a fresh interpreter with `python -X importtime`. Reported per
+entry point: total import time, the most expensive top-level packages, and any heavy
+package that should only be loaded on demand (TensorFlow, matplotlib, plotly, ...).
+
+Import statements don't show what the script does when it runs (a model loader thread,
+an import inside a top-level call), so every app is also cold-started once in a fresh
+interpreter with streamlit.testing.v1.AppTest. Reported: the first run's wall time, the
+deferred packages the run put in sys.modules (whatever streamlit itself imports is
+loaded beforehand and doesn't count) and the background threads the app's modules left
+running.
+
+Exits with status 1 if an entry point is over its budget, imports a deferred package or
+loads one during its cold start (beyond BACKGROUND_PACKAGES), so it can gate a PR:
+    python vocl_demo/benchmarks/profile_imports.py
+
+Usage:
+    python vocl_demo/benchmarks/profile_imports.py --apps app.py app_minimal.py --repeats 5
+    python vocl_demo/benchmarks/profile_imports.py --budget-scale 2 --output importtime.json
+    python vocl_demo/benchmarks/profile_imports.py --no-cold-start  # import times only
+"""
+
+import os
+import re
+import ast
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+from collections import defaultdict
+
+DEMO_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Import-time budget per entry point (ms, streamlit itself included)
+BUDGETS_MS = {
+    'app.py': 1500,
+    'app_minimal.py': 1200,
+    'app_pregenerated.py': 1200,
+    'app_safe.py': 1200,
+}
+
+# Packages that must not be imported before the first screen
+DEFERRED_PACKAGES = ('tensorflow', 'keras', 'matplotlib', 'plotly', 'groq', 'sklearn')
+
+# Deferred packages an app may load on its background model loader during the cold start
+BACKGROUND_PACKAGES = {
+    'app.py': ('tensorflow', 'keras'),
+    'app_safe.py': ('tensorflow', 'keras'),
+}
+
+MARKER = '--- entry point imports ---'
+COLD_START_MARKER = 'COLD_START '
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)')
+
+
+def startup_imports(app_path):
+    """Source of the module-level import statements of a script (incl. top-level if/try bodies)."""
+    with open(app_path, 'r') as f:
+        source = f.read()
+
+    statements = []
+
+    def collect(body):
+        for node in body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                statements.append(ast.get_source_segment(source, node))
+            elif isinstance(node, ast.If):
+                collect(node.body)
+                collect(node.orelse)
+            elif isinstance(node, ast.Try):
+                collect(node.body)
+                collect(node.orelse)
+                collect(node.finalbody)
+
+    collect(ast.parse(source).body)
+    return statements
+
+
+def profile_app(app_name):
+    """
+    Run an entry point's startup imports under -X importtime.
+
+    Returns:
+        List of (module, self_us, cumulative_us, depth) in import order
+    """
+    statements = startup_imports(os.path.join(DEMO_DIR, app_name))
+    snippet = '\n'.join([
+        'import os, sys',
+        f'sys.path.insert(0, {DEMO_DIR!r})',
+        f'os.write(2, b{MARKER!r} + b"\\n")',
+        *statements,
+    ])
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', snippet],
+        cwd=DEMO_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{app_name}: imports failed\n{result.stderr.strip().splitlines()[-1]}")
+
+    log = result.stderr.split(MARKER, 1)[-1]
+    records = []
+    for line in log.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def summarize(records, top):
+    """Total ms, per top-level package ms (largest first), and deferred packages loaded."""
+    by_package = defaultdict(int)
+    for module, self_us, _, _ in records:
+        by_package[module.split('.')[0]] += self_us
+    packages = sorted(by_package.items(), key=lambda item: -item[1])[:top]
+    deferred = sorted({p for p in by_package if p in DEFERRED_PACKAGES})
+    total_ms = sum(self_us for _, self_us, _, _ in records) / 1000
+    return total_ms, [(p, us / 1000) for p, us in packages], deferred
+
+
+def _owned_by_app(thread):
+    """Whether a thread runs code from the demo's own modules."""
+    target = getattr(thread, '_target', None)
+    module = sys.modules.get(getattr(target, '__module__', None) or '')
+    path = getattr(module, '__file__', None) or ''
+    return os.path.abspath(path).startswith(DEMO_DIR + os.sep) or thread.name.startswith('vocl-')
+
+
+def run_cold_start_worker(app_name, timeout):
+    """Cold-start one app in this (fresh) process and print what its first run left behind."""
+    sys.path.insert(0, DEMO_DIR)
+    from streamlit.testing.v1 import AppTest
+
+    modules_before = set(sys.modules)
+    threads_before = set(threading.enumerate())
+
+    app = AppTest.from_file(os.path.join(DEMO_DIR, app_name), default_timeout=timeout)
+    start = time.perf_counter()
+    app.run()
+    run_ms = (time.perf_counter() - start) * 1000
+
+    loaded = {module.split('.')[0] for module in set(sys.modules) - modules_before}
+    threads = [thread.name for thread in threading.enumerate()
+               if thread not in threads_before and thread.is_alive() and _owned_by_app(thread)]
+    result = {
+        'run_ms': run_ms,
+        'deferred_loaded': sorted(loaded & set(DEFERRED_PACKAGES)),
+        'threads': sorted(threads),
+        'exceptions': [e.message for e in app.exception],
+    }
+    print(COLD_START_MARKER + json.dumps(result), flush=True)
+
+
+def cold_start(app_name, timeout):
+    """
+    Cold-start an app through AppTest in a fresh interpreter.
+
+    Returns:
+        Dict with run_ms, deferred_loaded, threads and exceptions
+    """
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--cold-start-worker', app_name, '--timeout', str(timeout)],
+        cwd=DEMO_DIR, capture_output=True, text=True
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith(COLD_START_MARKER):
+            return json.loads(line[len(COLD_START_MARKER):])
+    lines = result.stderr.strip().splitlines()
+    raise RuntimeError(f"{app_name}: cold start failed\n{lines[-1] if lines else 'no output'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile and budget per entry point")
+    parser.add_argument('--apps', nargs='+', default=list(BUDGETS_MS))
+    parser.add_argument('--repeats', type=int, default=3, help="Runs per app (the fastest is kept)")
+    parser.add_argument('--top', type=int, default=8, help="Packages listed per app")
+    parser.add_argument('--budget-scale', type=float, default=1.0, help="Multiply budgets (slow CI hosts)")
+    parser.add_argument('--output', help="Write the full breakdown as JSON")
+    parser.add_argument('--no-cold-start', action='store_true', help="Skip the AppTest cold start")
+    parser.add_argument('--timeout', type=float, default=60, help="Seconds allowed for a cold start")
+    parser.add_argument('--cold-start-worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_start_worker:
+        run_cold_start_worker(args.cold_start_worker, args.timeout)
+        return
+
+    failures = []
+    report = {}
+    for app_name in args.apps:
+        runs = [summarize(profile_app(app_name), args.top) for _ in range(args.repeats)]
+        total_ms, packages, deferred = min(runs, key=lambda run: run[0])
+        budget_ms = BUDGETS_MS.get(app_name, max(BUDGETS_MS.values())) * args.budget_scale
+
+        status = 'ok' if total_ms <= budget_ms and not deferred else 'FAIL'
+        print(f"{app_name}: {total_ms:.0f} ms (budget {budget_ms:.0f} ms) {status}")
+        for package, ms in packages:
+            print(f"  {ms:8.1f} ms  {package}")
+        if deferred:
+            print(f"  deferred packages loaded at startup: {', '.join(deferred)}")
+
+        if total_ms > budget_ms:
+            failures.append(f"{app_name} over budget ({total_ms:.0f} > {budget_ms:.0f} ms)")
+        if deferred:
+            failures.append(f"{app_name} imports {', '.join(deferred)} at startup")
+        report[app_name] = {
+            'total_ms': total_ms,
+            'budget_ms': budget_ms,
+            'packages_ms': dict(packages),
+            'deferred_loaded': deferred,
+        }
+
+        if args.no_cold_start:
+            continue
+        started = cold_start(app_name, args.timeout)
+        unexpected = sorted(set(started['deferred_loaded']) - set(BACKGROUND_PACKAGES.get(app_name, ())))
+        print(f"  cold start: {started['run_ms']:.0f} ms, "
+              f"threads left running: {', '.join(started['threads']) or 'none'}")
+        if started['deferred_loaded']:
+            print(f"  deferred packages loaded by the first run: {', '.join(started['deferred_loaded'])}")
+        if unexpected:
+            failures.append(f"{app_name} loads {', '.join(unexpected)} during its first run")
+        if started['exceptions']:
+            failures.append(f"{app_name} raised during its first run: {started['exceptions'][0]}")
+        report[app_name]['cold_start'] = started
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if failures:
+        print('\n'.join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
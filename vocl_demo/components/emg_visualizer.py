@@ -4,16 +4,55 @@ EMG Signal Visualizer Component
 Component for visualizing EMG signals in the Streamlit demo.
 """
 
-import streamlit as st
-import matplotlib.pyplot as plt
+import hashlib
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
-try:
-    import plotly.graph_objects as go
-    from plotly.subplots import make_subplots
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
+from utils.perf import span, timed
+
+# Lazy import matplotlib/plotly - only import when a plot is drawn, so importing this
+# module doesn't slow down the app's first screen
+plt = None
+go = None
+make_subplots = None
+_plotly_available = None
+
+
+def _import_pyplot():
+    """Lazy import matplotlib.pyplot."""
+    global plt
+    if plt is None:
+        import matplotlib.pyplot as plt
+    return plt
+
+
+def _import_plotly():
+    """Lazy import plotly; returns False if it isn't installed."""
+    global go, make_subplots, _plotly_available
+    if _plotly_available is None:
+        try:
+            import plotly.graph_objects as go
+            from plotly.subplots import make_subplots
+            _plotly_available = True
+        except ImportError:
+            _plotly_available = False
+    return _plotly_available
+
+
+# Pixel tiles for plot_phoneme_emg_grid_image (one per phoneme, plus title/legend strips)
+TILE_SIZE = (4, 3)  # Inches, same as one subplot of plot_phoneme_emg_grid
+TILE_DPI = 100
+TILE_CACHE_SIZE = 256
+GRID_COLUMNS = 4
+
+GRID_CHANNELS = ['DLI', 'OOS', 'OOI', 'Platysma']
+GRID_COLORS = ['#1565c0', '#f57c00', '#00897b', '#c62828']  # Scientific color palette
+
+_tile_cache = OrderedDict()  # (kind, key) -> uint8 RGB array, shared by all sessions
+_tile_lock = threading.Lock()
+_plot_lock = threading.Lock()  # pyplot's figure registry isn't thread-safe
 
 
 def plot_emg_signals(emg_data):
@@ -29,6 +68,7 @@ def plot_emg_signals(emg_data):
     channels = ['DLI', 'OOS', 'OOI', 'Platysma']
     colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
     
+    _import_pyplot()
     fig, axes = plt.subplots(4, 1, figsize=(10, 8), sharex=True)
     fig.suptitle('EMG Signal Channels', fontsize=14, fontweight='bold')
     
@@ -46,18 +86,26 @@ def plot_emg_signals(emg_data):
     return fig
 
 
+def close_figure(fig):
+    """Release a pyplot figure once it has been rendered (st.pyplot doesn't close it)."""
+    if fig is not None and plt is not None:
+        with _plot_lock:
+            plt.close(fig)
+
+
+@timed()
 def plot_phoneme_emg_grid(emg_windows, phonemes):
     """
     Plot mini EMG graphs for each phoneme in a grid layout.
     
     Args:
-        emg_windows: List of EMG data arrays, each of shape (4, 5)
+        emg_windows: List (or stacked array) of EMG data arrays, each of shape (4, 5)
         phonemes: List of phoneme strings corresponding to each EMG window
         
     Returns:
-        matplotlib figure
+        matplotlib figure, registered with pyplot - pass it to close_figure() once rendered
     """
-    if not emg_windows or not phonemes:
+    if emg_windows is None or len(emg_windows) == 0 or not phonemes:
         return None
     
     n_phonemes = len(phonemes)
@@ -77,6 +125,7 @@ def plot_phoneme_emg_grid(emg_windows, phonemes):
         nrows = (n_phonemes + 3) // 4  # Round up
     
     # Create figure with subplots for each phoneme
+    _import_pyplot()
     fig, axes = plt.subplots(nrows, ncols, figsize=(4 * ncols, 3 * nrows))
     fig.suptitle('Electromyographic Signal Analysis - Multi-Channel EMG Patterns', 
                  fontsize=16, fontweight='bold', color='#000000', y=0.995)
@@ -125,24 +174,29 @@ def plot_phoneme_emg_grid(emg_windows, phonemes):
     return fig
 
 
-def plot_phoneme_emg_grid_interactive(emg_windows, phonemes):
+def plot_phoneme_emg_grid_interactive(emg_windows, phonemes, webgl=False):
     """
     Plot interactive EMG graphs for each phoneme using Plotly (with zoom functionality).
     
     Args:
-        emg_windows: List of EMG data arrays, each of shape (4, 5)
+        emg_windows: List (or stacked array) of EMG data arrays, each of shape (4, 5)
         phonemes: List of phoneme strings corresponding to each EMG window
+        webgl: Use the trace-minimal WebGL strip (plot_phoneme_emg_strip_webgl) instead
+               of one subplot per phoneme - much faster for long sequences
         
     Returns:
         plotly figure object
     """
-    if not PLOTLY_AVAILABLE:
+    if not _import_plotly():
         # Fallback to matplotlib if plotly not available
         return plot_phoneme_emg_grid(emg_windows, phonemes)
     
-    if not emg_windows or not phonemes:
+    if emg_windows is None or len(emg_windows) == 0 or not phonemes:
         return None
     
+    if webgl:
+        return plot_phoneme_emg_strip_webgl(emg_windows, phonemes)
+    
     n_phonemes = len(phonemes)
     channels = ['DLI', 'OOS', 'OOI', 'Platysma']
     colors = ['#1565c0', '#f57c00', '#00897b', '#c62828']  # Scientific color palette
@@ -254,3 +308,340 @@ def plot_phoneme_emg_grid_interactive(emg_windows, phonemes):
         fig.update_yaxes(visible=False, row=row, col=col)
     
     return fig
+
+
+def plot_phoneme_emg_strip_webgl(emg_windows, phonemes, gap_ms=8):
+    """
+    Interactive EMG plot with one WebGL trace per channel, whatever the sequence length.
+    
+    Phoneme windows are laid end to end on a single time axis (gap_ms apart); the
+    windows of a channel are joined into one Scattergl trace with NaN separators, and
+    the phoneme labels are axis ticks. Trace count and layout stay constant, so figure
+    size and build time grow only with the raw samples.
+    
+    Args:
+        emg_windows: List of EMG data arrays, each of shape (4, window_size)
+        phonemes: List of phoneme strings corresponding to each EMG window
+        gap_ms: Space between consecutive windows
+        
+    Returns:
+        plotly figure object, or None
+    """
+    if not _import_plotly() or emg_windows is None or len(emg_windows) == 0 or not phonemes:
+        return None
+    
+    windows = np.asarray(emg_windows, dtype=np.float32)
+    n_windows, _, window_size = windows.shape
+    time_points = np.arange(window_size) * 4  # 4ms per sample
+    spacing = time_points[-1] + gap_ms
+    offsets = np.arange(n_windows) * spacing
+    
+    # (N, window_size + 1) with a trailing NaN column, so flattening breaks the line
+    # between windows
+    x = np.full((n_windows, window_size + 1), np.nan, dtype=np.float32)
+    x[:, :-1] = offsets[:, None] + time_points
+    local_time = np.full_like(x, np.nan)
+    local_time[:, :-1] = time_points
+    labels = np.repeat(np.asarray(phonemes, dtype=object), window_size + 1)
+    y = np.full((n_windows, windows.shape[1], window_size + 1), np.nan, dtype=np.float32)
+    y[..., :-1] = windows
+    
+    fig = go.Figure()
+    for channel_idx, (channel, color) in enumerate(zip(GRID_CHANNELS, GRID_COLORS)):
+        fig.add_trace(go.Scattergl(
+            x=x.ravel(),
+            y=y[:, channel_idx].ravel(),
+            mode='lines+markers',
+            name=channel,
+            line=dict(color=color, width=2),
+            marker=dict(size=6, color=color),
+            text=labels,
+            customdata=local_time.ravel(),
+            hovertemplate=f'<b>%{{text}} - {channel}</b><br>' +
+                          'Time: %{customdata:.1f} ms<br>' +
+                          'Amplitude: %{y:.3f}<br>' +
+                          '<extra></extra>',
+            connectgaps=False
+        ))
+    
+    fig.update_layout(
+        title={
+            'text': 'Electromyographic Signal Analysis - Multi-Channel EMG Patterns',
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 18, 'color': '#0d47a1', 'family': 'Arial, sans-serif'}
+        },
+        height=380,
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            font=dict(size=11),
+            bgcolor='rgba(255, 255, 255, 0.8)'
+        ),
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(family='Arial, sans-serif', size=11, color='#212121'),
+        hovermode='closest',
+        xaxis=dict(
+            tickmode='array',
+            tickvals=offsets + time_points[-1] / 2,
+            ticktext=[f'<b>{phoneme}</b>' for phoneme in phonemes],
+            range=[-gap_ms / 2, offsets[-1] + time_points[-1] + gap_ms / 2],
+            gridcolor='#e0e0e0',
+            zeroline=False
+        ),
+        yaxis=dict(
+            title_text='Amplitude',
+            range=[0, 1],
+            gridcolor='#e0e0e0',
+            zeroline=False
+        )
+    )
+    
+    return fig
+
+
+def plot_recording_view(pyramid, start=0, end=None, sample_rate=250, channel_names=None, max_points=2000):
+    """
+    Plot a range of a long recording from its min/max pyramid (utils.signal_pyramid).
+    
+    The pyramid level is picked for the range, so a full session and a zoomed-in
+    second take the same time to build and send to the browser.
+    
+    Args:
+        pyramid: MinMaxPyramid of the recording
+        start, end: Sample range to show (end=None for the whole recording)
+        sample_rate: Samples per second, for the time axis
+        channel_names: Names for the channels (defaults to the EMG channel names)
+        max_points: Points per channel (about the plot width in pixels)
+        
+    Returns:
+        Tuple of (figure, pyramid level used); a matplotlib figure if plotly isn't installed
+    """
+    positions, values, level = pyramid.view(start, end, max_points)
+    names = channel_names or GRID_CHANNELS[:pyramid.channels]
+    
+    if not _import_plotly():
+        from utils.signal_pyramid import plot_all_channels
+        return plot_all_channels(pyramid, 'Recording', start, end, names, max_points), level
+    
+    times = positions / sample_rate
+    fig = make_subplots(rows=pyramid.channels, cols=1, shared_xaxes=True, vertical_spacing=0.03)
+    for i, (channel, name) in enumerate(zip(values, names)):
+        fig.add_trace(
+            go.Scattergl(
+                x=times,
+                y=channel,
+                mode='lines',
+                name=name,
+                line=dict(color=GRID_COLORS[i % len(GRID_COLORS)], width=1),
+                hovertemplate=f'<b>{name}</b><br>Time: %{{x:.2f}} s<br>Amplitude: %{{y:.3f}}<extra></extra>'
+            ),
+            row=i + 1,
+            col=1
+        )
+        fig.update_yaxes(title_text=name, row=i + 1, col=1, gridcolor='#e0e0e0', zeroline=False)
+    
+    fig.update_xaxes(title_text='Time (s)', row=pyramid.channels, col=1)
+    fig.update_xaxes(gridcolor='#e0e0e0', zeroline=False)
+    fig.update_layout(
+        height=120 * pyramid.channels + 80,
+        showlegend=False,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(family='Arial, sans-serif', size=11, color='#212121'),
+        margin=dict(t=20, b=40)
+    )
+    return fig, level
+
+
+def plot_probability_timeline(timeline, phonemes, samples_per_phoneme=5):
+    """
+    Plot per-sample class probabilities from continuous (sliding-window) decoding.
+    
+    Args:
+        timeline: Array of shape (T, classes) from VOCLPipeline.predict_timeline
+        phonemes: Phoneme strings in the sequence (one line is drawn per distinct phoneme)
+        samples_per_phoneme: Samples contributed by each phoneme, for boundary markers
+        
+    Returns:
+        plotly figure object, or None if plotly is unavailable
+    """
+    if not _import_plotly() or timeline is None or not phonemes:
+        return None
+    
+    from utils.pipeline import PHONEMES
+    
+    time_points = np.arange(len(timeline)) * 4  # 4ms per sample
+    
+    fig = go.Figure()
+    for phoneme in dict.fromkeys(phonemes):  # Distinct, in sequence order
+        if phoneme not in PHONEMES:
+            continue
+        fig.add_trace(go.Scatter(
+            x=time_points,
+            y=timeline[:, PHONEMES.index(phoneme)],
+            mode='lines',
+            name=phoneme,
+            line=dict(width=2),
+            hovertemplate=f'<b>{phoneme}</b><br>Time: %{{x:.0f}} ms<br>P: %{{y:.2f}}<extra></extra>'
+        ))
+    
+    # Phoneme boundaries of the concatenated sequence
+    for boundary in range(samples_per_phoneme, len(timeline), samples_per_phoneme):
+        fig.add_vline(x=boundary * 4 - 2, line=dict(color='#9e9e9e', width=1, dash='dot'))
+    
+    fig.update_layout(
+        height=320,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(family='Arial, sans-serif', size=11, color='#212121'),
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        margin=dict(t=40, b=40)
+    )
+    fig.update_xaxes(title_text='Time (ms)', gridcolor='#e0e0e0', zeroline=False)
+    fig.update_yaxes(title_text='Probability', range=[0, 1], gridcolor='#e0e0e0', zeroline=False)
+    
+    return fig
+
+
+def _figure_to_array(fig):
+    """Rasterize a figure to an (H, W, 3) uint8 array and close it."""
+    try:
+        fig.canvas.draw()
+        return np.asarray(fig.canvas.buffer_rgba())[..., :3].copy()
+    finally:
+        plt.close(fig)
+
+
+def _cached_tile(kind, key, render):
+    """Look up a tile, rendering (under the plot lock) and storing it on a miss."""
+    with _tile_lock:
+        tile = _tile_cache.get((kind, key))
+        if tile is not None:
+            _tile_cache.move_to_end((kind, key))
+            return tile
+    
+    with _plot_lock, span(f'render {kind} tile'):
+        _import_pyplot()
+        tile = render()
+    tile.setflags(write=False)  # Shared across sessions
+    
+    with _tile_lock:
+        _tile_cache[(kind, key)] = tile
+        while len(_tile_cache) > TILE_CACHE_SIZE:
+            _tile_cache.popitem(last=False)
+    return tile
+
+
+def _render_phoneme_tile(phoneme, emg_data):
+    fig, ax = plt.subplots(figsize=TILE_SIZE, dpi=TILE_DPI)
+    fig.patch.set_facecolor('white')
+    ax.set_facecolor('white')
+    time_points = np.arange(emg_data.shape[1]) * 4  # 4ms per sample
+    
+    # Plot all 4 channels in the same subplot
+    for i, (channel, color) in enumerate(zip(GRID_CHANNELS, GRID_COLORS)):
+        ax.plot(time_points, emg_data[i], marker='o', color=color,
+               linewidth=2.5, markersize=6, label=channel, alpha=0.9,
+               markerfacecolor=color, markeredgecolor='white', markeredgewidth=1)
+    
+    ax.set_title(f'{phoneme}', fontweight='bold', fontsize=12, color='#000000', pad=10)
+    ax.set_ylim([0, 1])
+    ax.set_xlim([0, 16])
+    ax.grid(True, alpha=0.3, linestyle='--', linewidth=0.5, color='#e0e0e0')
+    ax.set_xlabel('Time (ms)', fontsize=10, fontweight='bold', color='#424242')
+    ax.set_ylabel('Amplitude', fontsize=10, fontweight='bold', color='#424242')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_color('#bdbdbd')
+    ax.spines['bottom'].set_color('#bdbdbd')
+    ax.tick_params(labelsize=9, colors='#424242')
+    fig.tight_layout()
+    return _figure_to_array(fig)
+
+
+def _render_title_strip(ncols):
+    fig = plt.figure(figsize=(TILE_SIZE[0] * ncols, 0.5), dpi=TILE_DPI)
+    fig.patch.set_facecolor('white')
+    fig.text(0.5, 0.5, 'Electromyographic Signal Analysis - Multi-Channel EMG Patterns',
+             ha='center', va='center', fontsize=16, fontweight='bold', color='#000000')
+    return _figure_to_array(fig)
+
+
+def _render_legend_strip(ncols):
+    fig = plt.figure(figsize=(TILE_SIZE[0] * ncols, 0.5), dpi=TILE_DPI)
+    fig.patch.set_facecolor('white')
+    handles = [
+        plt.Line2D([], [], color=color, marker='o', linewidth=2.5, markersize=6,
+                   markerfacecolor=color, markeredgecolor='white', markeredgewidth=1, label=channel)
+        for channel, color in zip(GRID_CHANNELS, GRID_COLORS)
+    ]
+    fig.legend(handles=handles, loc='center', ncol=4, fontsize=10, framealpha=0.9,
+               edgecolor='#e0e0e0', facecolor='white')
+    return _figure_to_array(fig)
+
+
+def get_phoneme_tile(phoneme, emg_data):
+    """
+    Image tile for one phoneme's mini-plot, cached by phoneme and data hash.
+    
+    Returns:
+        Read-only (H, W, 3) uint8 array
+    """
+    emg_data = np.ascontiguousarray(emg_data, dtype=np.float64)
+    digest = hashlib.sha1(emg_data.tobytes() + str(emg_data.shape).encode()).hexdigest()
+    return _cached_tile('phoneme', (phoneme, digest), lambda: _render_phoneme_tile(phoneme, emg_data))
+
+
+def compose_tile_grid(tiles, ncols):
+    """
+    Arrange equally sized tiles into a row-major grid with array operations.
+    
+    Args:
+        tiles: List of (H, W, 3) uint8 arrays
+        ncols: Tiles per row (missing cells in the last row are white)
+        
+    Returns:
+        (rows * H, ncols * W, 3) uint8 array
+    """
+    nrows = -(-len(tiles) // ncols)
+    height, width, depth = tiles[0].shape
+    grid = np.full((nrows * ncols, height, width, depth), 255, dtype=np.uint8)
+    grid[:len(tiles)] = np.stack(tiles)
+    # (rows, cols, H, W, 3) -> (rows, H, cols, W, 3) -> image
+    return grid.reshape(nrows, ncols, height, width, depth).transpose(0, 2, 1, 3, 4).reshape(
+        nrows * height, ncols * width, depth)
+
+
+@timed()
+def plot_phoneme_emg_grid_image(emg_windows, phonemes):
+    """
+    Same grid as plot_phoneme_emg_grid, composed from cached per-phoneme image tiles.
+    
+    Only phonemes whose data hasn't been seen before are drawn with matplotlib; every
+    figure used is closed right after rasterizing, so nothing accumulates across reruns.
+    
+    Args:
+        emg_windows: List (or stacked array) of EMG data arrays, each of shape (4, 5)
+        phonemes: List of phoneme strings corresponding to each EMG window
+        
+    Returns:
+        (H, W, 3) uint8 image for st.image, or None
+    """
+    if emg_windows is None or len(emg_windows) == 0 or not phonemes:
+        return None
+    
+    ncols = min(len(phonemes), GRID_COLUMNS)
+    tiles = [get_phoneme_tile(phoneme, emg_data) for emg_data, phoneme in zip(emg_windows, phonemes)]
+    
+    return np.concatenate([
+        _cached_tile('title', ncols, lambda: _render_title_strip(ncols)),
+        compose_tile_grid(tiles, ncols),
+        _cached_tile('legend', ncols, lambda: _render_legend_strip(ncols)),
+    ])
@@ -0,0 +1,153 @@
+"""
+Live Playback Component
+
+Streams a real recording through the model and shows it like a live headset feed:
+a rolling 4-channel chart and the decoded phoneme strip, redrawn at a fixed UI frame
+rate while a background thread (utils.playback) does the batched inference.
+"""
+
+import os
+
+import streamlit as st
+
+from utils.playback import CHUNK, DEFAULT_RECORDING, SAMPLE_RATE, WINDOW, PlaybackSession, load_recording
+
+UI_FPS = 4  # Frames per second, independent of the 250 Hz sample rate
+DISPLAY_POINTS = 300  # Chart points per channel after decimation
+CHANNEL_NAMES = ['DLI', 'OOS', 'OOI', 'Platysma']
+SESSION_KEY = 'playback_session'
+
+
+@st.cache_resource
+def get_recording(csv_file=DEFAULT_RECORDING):
+    """Normalized (4, T) recording, parsed once per process."""
+    return load_recording(csv_file)
+
+
+@st.cache_resource
+def get_recording_pyramid(csv_file=DEFAULT_RECORDING):
+    """Min/max pyramid of the recording (stored next to it, rebuilt if the CSV changes)."""
+    from utils.signal_pyramid import load_or_build
+    return load_or_build(csv_file, lambda: get_recording(csv_file))
+
+
+def _pipeline_predict(pipeline):
+    """Adapt VOCLPipeline.predict_windows to PlaybackSession's (labels, confidences)."""
+    def predict(windows):
+        table = pipeline.predict_windows(windows)
+        return table.argmax, table.confidence
+    return predict
+
+
+def _render_frame(session):
+    """Draw one frame of the session into in-place placeholders."""
+    status_slot = st.empty()
+    chart_slot = st.empty()
+    strip_slot = st.empty()
+
+    frame = session.snapshot(display_points=DISPLAY_POINTS)
+    if frame['error']:
+        status_slot.warning(f"Playback stopped: {frame['error'][:100]}")
+    else:
+        status_slot.progress(
+            min(frame['progress'], 1.0),
+            text=f"{frame['time']:.1f} s / {session.duration:.1f} s · "
+                 f"{frame['inference_ms']:.0f} ms per {CHUNK // WINDOW}-window batch"
+        )
+
+    if frame['signal'].shape[1]:
+        chart_slot.line_chart(
+            {name: frame['signal'][i] for i, name in enumerate(CHANNEL_NAMES)},
+            height=260,
+            use_container_width=True
+        )
+
+    spans = ''.join(
+        f'<span style="display:inline-block; margin:2px 4px; padding:2px 8px; border-radius:4px; '
+        f'background:#e3f2fd; color:#0d47a1; opacity:{0.4 + 0.6 * confidence:.2f}; font-weight:600;" '
+        f'title="{time_s:.2f} s, {confidence:.0%}">{phoneme}</span>'
+        for time_s, phoneme, confidence in frame['strip']
+    )
+    strip_slot.markdown(
+        f'<div style="min-height:2.5em; line-height:2em;">{spans or "<em>Waiting for phonemes...</em>"}</div>',
+        unsafe_allow_html=True
+    )
+
+
+@st.fragment(run_every=1 / UI_FPS)
+def _render_live_frame():
+    """Redraw at UI_FPS while the stream runs; a full rerun ends the timer when it stops."""
+    session = st.session_state.get(SESSION_KEY)
+    if session is None:
+        return
+    _render_frame(session)
+    if not session.is_running():
+        st.rerun()
+
+
+def render_live_playback(pipeline):
+    """
+    Playback tab: start/stop controls, then the live (or final) frame.
+
+    Args:
+        pipeline: Warmed-up VOCLPipeline, or None while the model is loading
+    """
+    st.markdown("### Live Playback")
+    st.caption("A recorded silent-speech session (silent ABCs) is streamed through the model in real time, "
+               "as it would arrive from the headset.")
+
+    if pipeline is None:
+        st.info("Live playback needs the EMG model - it becomes available once the model has loaded (see sidebar).")
+        return
+    if not os.path.exists(DEFAULT_RECORDING):
+        st.warning(f"Recording not found: {DEFAULT_RECORDING}")
+        return
+
+    from utils.pipeline import PHONEMES
+
+    session = st.session_state.get(SESSION_KEY)
+    running = session is not None and session.is_running()
+
+    col_start, col_stop, col_speed = st.columns([1, 1, 2])
+    with col_speed:
+        speed = st.select_slider("Speed", options=[0.5, 1, 2, 4], value=1, key="playback_speed",
+                                 format_func=lambda s: f"{s}x", disabled=running)
+    with col_start:
+        if st.button("▶ Start playback", disabled=running, use_container_width=True):
+            session = PlaybackSession(get_recording(), _pipeline_predict(pipeline), PHONEMES, speed=speed)
+            session.start()
+            st.session_state[SESSION_KEY] = session
+    with col_stop:
+        if st.button("■ Stop", disabled=not running, use_container_width=True):
+            session.stop()
+
+    if session is None:
+        st.info("Press Start to stream the recording.")
+    elif session.is_running():
+        _render_live_frame()
+    else:
+        _render_frame(session)
+
+
+@st.fragment
+def render_recording_browser():
+    """Zoom/pan over the whole recording; only this fragment reruns when the range changes."""
+    if not os.path.exists(DEFAULT_RECORDING):
+        return
+
+    from components.emg_visualizer import plot_recording_view
+
+    st.markdown("### Recording Browser")
+    pyramid = get_recording_pyramid()
+    duration = pyramid.length / SAMPLE_RATE
+    start_s, end_s = st.slider("Time range (s)", 0.0, duration, (0.0, duration), step=0.1,
+                               key="recording_range")
+    start, end = int(start_s * SAMPLE_RATE), max(int(end_s * SAMPLE_RATE), int(start_s * SAMPLE_RATE) + 2)
+
+    fig, level = plot_recording_view(pyramid, start, end, sample_rate=SAMPLE_RATE)
+    if hasattr(fig, 'to_plotly_json'):
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.pyplot(fig)
+    st.caption(f"{end - start:,} samples shown from pyramid level {level} "
+               f"({pyramid.factor ** level} samples per bin)")
@@ -0,0 +1,69 @@
+"""
+Model Status Component
+
+Sidebar panel showing the background loading progress of the EMG model pipeline.
+The progress polls itself while loading, so the page updates without user input.
+"""
+
+import os
+import importlib.util
+
+import streamlit as st
+
+STAGE_LABELS = {
+    None: "Loading test data...",
+    'data_ready': "Loading EMG model...",
+    'model_loaded': "Warming up model...",
+    'warmed_up': "Model ready",
+}
+POLL_SECONDS = 1.0  # Progress refresh interval while the model loads
+
+
+def model_backend_available():
+    """
+    Whether this process can run the model: TensorFlow is installed, or an inference
+    sidecar socket is configured. Apps that don't need the model skip the loader otherwise.
+    """
+    from utils.pipeline import SIDECAR_ENV_VAR
+
+    return bool(os.environ.get(SIDECAR_ENV_VAR)) or importlib.util.find_spec('tensorflow') is not None
+
+
+def render_model_status():
+    """
+    Start the pipeline loader (once per server process) and show its progress in the sidebar.
+
+    Returns:
+        The VOCLPipeline if it is warmed up, else None (library features keep working)
+    """
+    from utils.pipeline import get_pipeline, pipeline_status
+
+    status = pipeline_status()
+
+    with st.sidebar:
+        st.markdown("### Model Status")
+        if status['error']:
+            st.warning("Model unavailable - using the pre-generated phoneme library only.")
+            with st.expander("Details"):
+                st.code(status['error'])
+            return None
+
+        if status['stage'] == 'warmed_up':
+            st.progress(1.0, text=STAGE_LABELS['warmed_up'])
+        else:
+            _render_loading_progress()
+
+    return get_pipeline(wait=False)
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _render_loading_progress():
+    """Poll the loader while it runs; once it finishes, a full rerun brings in the model features."""
+    from utils.pipeline import pipeline_status
+
+    status = pipeline_status()
+    if status['error'] or status['stage'] == 'warmed_up':
+        st.rerun()
+
+    st.progress(status['progress'], text=STAGE_LABELS[status['stage']])
+    st.caption("The phoneme builder works while the model loads.")
@@ -0,0 +1,52 @@
+"""
+Performance Panel Component
+
+Sidebar breakdown of where the last rerun's time went (spans from utils.perf), with a
+JSON export of the session's rerun history.
+"""
+
+import json
+
+import streamlit as st
+
+from utils.perf import rerun_history
+
+RECENT_RERUNS = 10  # Script runs summarized under the table
+
+
+def render_perf_panel():
+    """Toggleable sidebar panel; call after utils.perf.end_rerun() at the end of the script."""
+    with st.sidebar:
+        st.markdown("### Performance")
+        if not st.toggle("Show rerun timings", key="perf_panel_enabled"):
+            return
+
+        history = rerun_history()
+        if not history:
+            st.caption("No reruns recorded yet.")
+            return
+
+        latest = history[-1].to_dict()
+        st.caption(f"Rerun #{latest['rerun']} ({latest['kind']}): {latest['total_ms']:.0f} ms")
+
+        rows = [
+            {'span': name, 'calls': calls, 'ms': round(total, 1)}
+            for name, calls, total in history[-1].breakdown()
+        ]
+        covered = sum(span['ms'] for span in latest['spans'] if span['depth'] == 0)
+        if latest['kind'] == 'script':
+            rows.append({'span': '(rest of script)', 'calls': 1, 'ms': round(latest['total_ms'] - covered, 1)})
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
+        recent = [record.to_dict()['total_ms'] for record in history if record.kind == 'script'][-RECENT_RERUNS:]
+        if len(recent) > 1:
+            st.caption(f"Last {len(recent)} script runs: median {sorted(recent)[len(recent) // 2]:.0f} ms, "
+                       f"max {max(recent):.0f} ms")
+
+        st.download_button(
+            "Export timings (JSON)",
+            data=json.dumps({'reruns': [record.to_dict() for record in history]}, indent=2),
+            file_name="vocl_rerun_timings.json",
+            mime="application/json",
+            use_container_width=True
+        )
@@ -6,59 +6,53 @@ Uses pre-generated EMG library (no TensorFlow inference required).
 """
 
 import streamlit as st
-import json
 import os
 import numpy as np
 
+from utils.assets import get_phoneme_metadata
+from utils.emg_library import LIBRARY_PATH, load_library
+from utils.perf import timed
+
 
 def load_phoneme_library():
-    """Load phoneme library from JSON file."""
-    lib_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'phoneme_library.json')
-    with open(lib_path, 'r') as f:
-        return json.load(f)
+    """Load phoneme library (parsed once per process, see utils.assets)."""
+    return get_phoneme_metadata().library
 
 
+@timed()
 @st.cache_resource
 def load_emg_library():
     """
-    Load pre-generated EMG library (cached).
+    Load pre-generated EMG library (cached, memory-mapped).
     
     Returns:
-        Dictionary mapping phoneme names to their EMG data and metadata
+        PackedEMGLibrary (see utils.emg_library), or None if it can't be loaded
     """
-    lib_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'phoneme_emg_library.npz')
-    
-    if not os.path.exists(lib_path):
-        st.error(f"EMG library not found at {lib_path}. Please run generate_phoneme_library.py first.")
+    if not os.path.exists(LIBRARY_PATH):
+        st.error(f"EMG library not found at {LIBRARY_PATH}. Please run precompute_demo_artifacts.py (or generate_phoneme_library.py) first.")
         return None
     
     try:
-        data = np.load(lib_path, allow_pickle=True)
-        
-        # Extract metadata
-        phonemes = data.get('metadata_phonemes', [])
-        if len(phonemes) == 0:
-            # Fallback: extract from keys
-            phonemes = [k.replace('_emg', '') for k in data.keys() if k.endswith('_emg')]
-        
-        # Build library dictionary
-        library = {}
-        for phoneme in phonemes:
-            emg_key = f"{phoneme}_emg"
-            if emg_key in data:
-                library[phoneme] = {
-                    'emg_data': data[emg_key],
-                    'phoneme_index': int(data.get(f"{phoneme}_index", 0)),
-                    'confidence': float(data.get(f"{phoneme}_confidence", 0.8)),
-                    'sample_index': int(data.get(f"{phoneme}_sample_idx", 0))
-                }
-        
-        return library
+        return load_library(LIBRARY_PATH)
     except Exception as e:
         st.error(f"Error loading EMG library: {e}")
         return None
 
 
+def add_phoneme(phoneme):
+    """Button callback: append a phoneme (runs before the rerun, so no st.rerun needed)."""
+    st.session_state.setdefault('selected_phonemes', []).append(phoneme)
+
+
+def _clear_phonemes():
+    st.session_state['selected_phonemes'] = []
+
+
+def _pop_phoneme():
+    if st.session_state.get('selected_phonemes'):
+        st.session_state['selected_phonemes'].pop()
+
+
 def render_phoneme_selector(phoneme_type="vowels"):
     """
     Render a grid of clickable phoneme buttons.
@@ -69,8 +63,7 @@ def render_phoneme_selector(phoneme_type="vowels"):
     Returns:
         Selected phoneme or None
     """
-    library = load_phoneme_library()
-    phonemes = library.get(phoneme_type, {})
+    phonemes = get_phoneme_metadata().by_category.get(phoneme_type, [])
     
     if not phonemes:
         return None
@@ -85,19 +78,19 @@ def render_phoneme_selector(phoneme_type="vowels"):
     cols = st.columns(4)
     col_idx = 0
     
-    for phoneme, info in sorted(phonemes.items()):
+    for phoneme, example in phonemes:
         with cols[col_idx % 4]:
             # Create button with phoneme info
-            button_label = f"{phoneme}\n({info['example']})"
+            button_label = f"{phoneme}\n({example})"
             
-            if st.button(
+            # Add to selected phonemes on click
+            st.button(
                 button_label,
                 key=f"phoneme_{phoneme_type}_{phoneme}",
-                use_container_width=True
-            ):
-                # Add to selected phonemes
-                st.session_state['selected_phonemes'].append(phoneme)
-                st.rerun()
+                use_container_width=True,
+                on_click=add_phoneme,
+                args=(phoneme,)
+            )
         
         col_idx += 1
     
@@ -122,18 +115,8 @@ def display_current_sequence():
         st.caption(f"{len(selected)} phoneme(s) selected")
         
         # Show examples
-        library = load_phoneme_library()
-        examples = []
-        for phoneme in selected:
-            # Find phoneme in library
-            found = False
-            for category in ['vowels', 'consonants']:
-                if phoneme in library[category]:
-                    examples.append(library[category][phoneme]['example'])
-                    found = True
-                    break
-            if not found:
-                examples.append("?")
+        example_map = get_phoneme_metadata().examples
+        examples = [example_map.get(phoneme, "?") for phoneme in selected]
         
         st.caption(f"Examples: {' - '.join(examples)}")
     else:
@@ -145,17 +128,12 @@ def display_current_sequence():
 
 def clear_sequence():
     """Clear the selected phoneme sequence."""
-    if st.button("🗑️ Clear Sequence", use_container_width=True):
-        st.session_state['selected_phonemes'] = []
-        st.rerun()
+    st.button("🗑️ Clear Sequence", use_container_width=True, on_click=_clear_phonemes)
 
 
 def remove_last_phoneme():
     """Remove the last phoneme from the sequence."""
-    if st.button("↩️ Remove Last", use_container_width=True):
-        if st.session_state.get('selected_phonemes'):
-            st.session_state['selected_phonemes'].pop()
-            st.rerun()
+    st.button("↩️ Remove Last", use_container_width=True, on_click=_pop_phoneme)
 
 
 def get_phoneme_indices(phoneme_sequence):
@@ -168,87 +146,49 @@ def get_phoneme_indices(phoneme_sequence):
     Returns:
         List of phoneme indices
     """
-    library = load_phoneme_library()
-    indices = []
+    phoneme_to_index = get_phoneme_metadata().phoneme_to_index
     
-    for phoneme in phoneme_sequence:
-        found = False
-        for category in ['vowels', 'consonants']:
-            if phoneme in library[category]:
-                indices.append(library[category][phoneme]['index'])
-                found = True
-                break
-        if not found:
-            # Default to 0 (silence) if not found
-            indices.append(0)
-    
-    return indices
+    # Default to 0 (silence) if not found
+    return [phoneme_to_index.get(phoneme, 0) for phoneme in phoneme_sequence]
 
 
-def build_emg_sequence_from_library(phoneme_sequence):
+@timed()
+def build_emg_sequence_from_library(phoneme_sequence, exemplar=0):
     """
     Build EMG sequence from pre-generated library (no TensorFlow required).
     
     Args:
         phoneme_sequence: List of phoneme strings
+        exemplar: Library exemplar to use - an int for all positions, or one per phoneme
     
     Returns:
         Tuple of (all_emg_windows, phoneme_string, confidences)
-        - all_emg_windows: List of EMG data arrays, one for each phoneme
+        - all_emg_windows: (N, 4, 5) float32 array, one window for each phoneme
         - phoneme_string: Space-separated phoneme string
         - confidences: List of confidence values
     """
-    print(f"STEP 1: Starting build_emg_sequence_from_library with {len(phoneme_sequence)} phonemes")
-    
     try:
-        print("STEP 2: Loading EMG library...")
         emg_library = load_emg_library()
         
-        if emg_library is None:
-            print("STEP 2 ERROR: EMG library is None")
+        if emg_library is None or not phoneme_sequence:
             return None, "", []
         
-        print(f"STEP 2 SUCCESS: Loaded {len(emg_library)} phonemes from library")
+        phonemes = [phoneme for phoneme in phoneme_sequence if phoneme in emg_library]
+        for phoneme in dict.fromkeys(p for p in phoneme_sequence if p not in emg_library):
+            st.warning(f"Phoneme '{phoneme}' not found in library")
         
-        if not phoneme_sequence:
-            print("STEP 3: Empty phoneme sequence")
+        if not phonemes:
             return None, "", []
         
-        print("STEP 3: Processing phonemes...")
-        # Get EMG data for each phoneme
-        emg_windows = []
-        phonemes = []
-        confidences = []
+        if np.ndim(exemplar) and len(phonemes) != len(phoneme_sequence):
+            # Keep per-position exemplars aligned with the phonemes that were found
+            exemplar = np.asarray(exemplar)[[p in emg_library for p in phoneme_sequence]]
         
-        for i, phoneme in enumerate(phoneme_sequence):
-            print(f"  STEP 3.{i+1}: Processing phoneme '{phoneme}'...")
-            if phoneme in emg_library:
-                emg_window = emg_library[phoneme]['emg_data']
-                confidence = emg_library[phoneme]['confidence']
-                
-                emg_windows.append(emg_window)
-                phonemes.append(phoneme)
-                confidences.append(confidence)
-                print(f"  STEP 3.{i+1} SUCCESS: Found '{phoneme}' in library")
-            else:
-                print(f"  STEP 3.{i+1} WARNING: Phoneme '{phoneme}' not found in library")
-                st.warning(f"Phoneme '{phoneme}' not found in library")
-        
-        if not emg_windows:
-            print("STEP 4 ERROR: No EMG windows collected")
-            return None, "", []
-        
-        print("STEP 5: Creating phoneme string...")
-        # Create phoneme string
+        # One gather from the packed (P, K, 4, W) array
+        emg_windows, confidences = emg_library.gather(phonemes, exemplar)
         phoneme_string = ' '.join(phonemes)
-        
-        print(f"STEP 6 SUCCESS: Returning {len(emg_windows)} EMG windows for '{phoneme_string}'")
-        # Return ALL EMG windows, not just the first one
-        return emg_windows, phoneme_string, confidences
+        return emg_windows, phoneme_string, confidences.tolist()
         
     except Exception as e:
-        print(f"CRASH in build_emg_sequence_from_library: {e}")
-        import traceback
-        print(traceback.format_exc())
         st.error(f"Error building EMG sequence: {e}")
         return None, "", []
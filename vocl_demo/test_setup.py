@@ -30,15 +30,11 @@ print()
 
 # Test 3: Import other dependencies
 print("3. Testing other dependencies...")
-deps = ['numpy', 'pandas', 'sklearn', 'matplotlib', 'requests']
+deps = ['numpy', 'pandas', 'matplotlib', 'requests']
 for dep in deps:
     try:
-        if dep == 'sklearn':
-            import sklearn
-            print(f"   ✓ scikit-learn imported")
-        else:
-            __import__(dep)
-            print(f"   ✓ {dep} imported")
+        __import__(dep)
+        print(f"   ✓ {dep} imported")
     except Exception as e:
         print(f"   ✗ {dep} import failed: {e}")
         sys.exit(1)
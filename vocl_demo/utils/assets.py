@@ -0,0 +1,116 @@
+"""
+Static assets and phoneme metadata for the Streamlit demo.
+
+Everything here is read from disk once per server process (st.cache_resource) and
+shared by all sessions, so script reruns do no file I/O.
+"""
+
+import os
+import json
+import base64
+
+import streamlit as st
+
+DEMO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+LOGO_PATH = os.path.join(DEMO_DIR, 'logo.png')
+LOGO_BASE64_PATH = os.path.join(DEMO_DIR, 'logo_base64.txt')
+CSS_PATH = os.path.join(DEMO_DIR, 'assets', 'app.css')
+PHONEME_LIBRARY_PATH = os.path.join(DEMO_DIR, 'data', 'phoneme_library.json')
+CATEGORIES = ('vowels', 'consonants')
+
+
+class PhonemeMetadata:
+    """
+    Parsed phoneme_library.json with precomputed lookups.
+
+    Attributes:
+        library: The raw {category: {phoneme: {example, index}}} dict
+        phoneme_to_index: {phoneme: class index}
+        index_to_phoneme: {class index: phoneme}
+        examples: {phoneme: example word}
+        categories: {phoneme: 'vowels' or 'consonants'}
+        by_category: {category: [(phoneme, example), ...]} sorted by phoneme, for the selector grid
+    """
+
+    def __init__(self, library):
+        self.library = library
+        self.phoneme_to_index = {}
+        self.examples = {}
+        self.categories = {}
+        self.by_category = {}
+
+        for category in CATEGORIES:
+            entries = library.get(category, {})
+            self.by_category[category] = [(p, entries[p]['example']) for p in sorted(entries)]
+            for phoneme, info in entries.items():
+                # First category wins, matching the old vowels-then-consonants search
+                self.phoneme_to_index.setdefault(phoneme, info['index'])
+                self.examples.setdefault(phoneme, info['example'])
+                self.categories.setdefault(phoneme, category)
+
+        self.index_to_phoneme = {index: phoneme for phoneme, index in self.phoneme_to_index.items()}
+
+
+@st.cache_resource
+def get_phoneme_metadata():
+    """Parsed phoneme library and lookup maps (read once per process)."""
+    with open(PHONEME_LIBRARY_PATH, 'r') as f:
+        return PhonemeMetadata(json.load(f))
+
+
+@st.cache_resource
+def get_logo_bytes():
+    """Raw logo.png bytes for st.image, or None if the file is missing."""
+    if not os.path.exists(LOGO_PATH):
+        return None
+    with open(LOGO_PATH, 'rb') as f:
+        return f.read()
+
+
+@st.cache_resource
+def get_logo_base64():
+    """Base64 logo, from the pre-encoded logo_base64.txt when present."""
+    if os.path.exists(LOGO_BASE64_PATH):
+        with open(LOGO_BASE64_PATH, 'r') as f:
+            return f.read().strip()
+    logo = get_logo_bytes()
+    return base64.b64encode(logo).decode() if logo else None
+
+
+@st.cache_resource
+def get_favicon_html():
+    """Script tag that swaps the page favicon for the logo (empty if there is no logo)."""
+    logo_data = get_logo_base64()
+    if not logo_data:
+        return ""
+    return f"""
+    <script>
+        (function() {{
+            const link = document.createElement('link');
+            link.rel = 'icon';
+            link.type = 'image/png';
+            link.href = 'data:image/png;base64,{logo_data}';
+            // Remove existing favicon if any
+            const existing = document.querySelector('link[rel="icon"]');
+            if (existing) existing.remove();
+            document.head.appendChild(link);
+        }})();
+    </script>
+    """
+
+
+@st.cache_resource
+def get_app_css_html():
+    """The demo's stylesheet wrapped in a <style> tag."""
+    with open(CSS_PATH, 'r') as f:
+        return f"<style>\n{f.read()}</style>"
+
+
+@st.cache_resource
+def get_image_bytes(filename):
+    """Bytes of an image in the demo directory, or None if it doesn't exist."""
+    path = os.path.join(DEMO_DIR, filename)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
@@ -1,14 +1,127 @@
 """
 Cloud-Compatible LLM using Groq API
 
-Fast, free LLM correction that works on Streamlit Cloud.
+Fast, free LLM correction that works on Streamlit Cloud. One pooled client is shared
+by the whole process; stream_phonemes_with_groq() yields the answer as it is generated.
 """
 
 import os
+import threading
 import streamlit as st
-from typing import Optional, List, Union
+from typing import Iterator, Optional, List, Union
 
+from .perf import timed
 
+
+MODEL = "llama-3.3-70b-versatile"  # Fast, accurate model
+MAX_KEEPALIVE = 4  # Idle connections kept open to the API
+KEEPALIVE_EXPIRY = 120  # Seconds an idle connection is reused
+
+# One client per process: its connection pool (keep-alive, TLS session) is shared by
+# every session and rerun, and the API key is resolved only once
+_client = None
+_api_key = None
+_client_lock = threading.Lock()
+
+
+def _resolve_api_key() -> Optional[str]:
+    """GROQ_API_KEY from Streamlit secrets (cloud) or the environment (local), kept once found."""
+    global _api_key
+    if _api_key is None:
+        api_key = None
+        try:
+            api_key = st.secrets.get("GROQ_API_KEY", None)
+        except (AttributeError, FileNotFoundError, KeyError):
+            pass
+        api_key = (api_key or os.getenv("GROQ_API_KEY") or '').strip()
+        if api_key:
+            _api_key = api_key
+    return _api_key
+
+
+def get_groq_client():
+    """
+    The process-wide Groq client, created on first use.
+
+    The base URL can be pointed at an OpenAI-compatible server (e.g. the local stub in
+    benchmarks/llm_stub_server.py) with the GROQ_BASE_URL environment variable.
+
+    Returns:
+        groq.Groq instance, or None if no API key is configured
+
+    Raises:
+        ImportError: If the groq library is not installed
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            api_key = _resolve_api_key()
+            if not api_key:
+                return None
+            
+            # Import Groq (lazy import to avoid errors if not installed)
+            import httpx
+            from groq import Groq
+            
+            http_client = httpx.Client(limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE,
+                                                           keepalive_expiry=KEEPALIVE_EXPIRY))
+            _client = Groq(api_key=api_key, http_client=http_client)
+        return _client
+
+
+def _phonemes_to_prompt(phoneme_sequence: Union[str, List[str]]) -> Optional[str]:
+    """Prompt for a phoneme sequence, or None (with a warning) if it is empty."""
+    # Convert list to string if needed
+    if isinstance(phoneme_sequence, list):
+        phonemes_str = " ".join(phoneme_sequence)
+    else:
+        phonemes_str = phoneme_sequence.strip()
+    
+    if not phonemes_str:
+        st.warning("⚠️ Empty phoneme sequence")
+        return None
+    
+    # Create prompt - improved for better results
+    return f"""Convert these phonemes to natural English text. Output ONLY the text, nothing else.
+
+Phonemes: {phonemes_str}
+
+Text:"""
+
+
+def _client_or_warn():
+    """The shared client, or None after showing why it is unavailable."""
+    try:
+        client = get_groq_client()
+    except ImportError:
+        st.error("❌ Groq library not installed. Run: pip install groq")
+        return None
+    if client is None:
+        st.warning("⚠️ API key not found. Add GROQ_API_KEY to .streamlit/secrets.toml")
+    return client
+
+
+def _show_error(e: Exception):
+    # Show detailed error for debugging
+    st.error(f"❌ LLM Error: {str(e)}")
+    
+    # Show traceback in expander for debugging
+    with st.expander("🔍 Error Details", expanded=False):
+        import traceback
+        st.code(traceback.format_exc())
+
+
+def clean_corrected_text(text: str) -> Optional[str]:
+    """Final cleanup of a (complete) LLM answer; None if nothing is left."""
+    # Clean up any remaining formatting
+    text = text.strip().replace('"', '').replace("'", "").strip()
+    
+    # Remove common LLM artifacts
+    text = _clean_response(text)
+    return text or None
+
+
+@timed()
 def correct_phonemes_with_groq(phoneme_sequence: Union[str, List[str]], timeout: int = 15) -> Optional[str]:
     """
     Correct phoneme sequence using Groq API (cloud-compatible).
@@ -22,84 +135,75 @@ def correct_phonemes_with_groq(phoneme_sequence: Union[str, List[str]], timeout:
         Corrected text string (e.g., "hello") or None if unavailable
     """
     try:
-        # Convert list to string if needed
-        if isinstance(phoneme_sequence, list):
-            phonemes_str = " ".join(phoneme_sequence)
-        else:
-            phonemes_str = phoneme_sequence.strip()
-        
-        if not phonemes_str:
-            st.warning("⚠️ Empty phoneme sequence")
+        prompt = _phonemes_to_prompt(phoneme_sequence)
+        if prompt is None:
             return None
         
-        # Get API key from Streamlit secrets (cloud) or environment (local)
-        api_key = None
-        try:
-            # Try Streamlit secrets first (for cloud deployment)
-            api_key = st.secrets.get("GROQ_API_KEY", None)
-        except (AttributeError, FileNotFoundError, KeyError):
-            # Fallback to environment variable (for local development)
-            api_key = os.getenv("GROQ_API_KEY")
-        
-        if not api_key:
-            st.warning("⚠️ API key not found. Add GROQ_API_KEY to .streamlit/secrets.toml")
+        client = _client_or_warn()
+        if client is None:
             return None
         
-        # Import Groq (lazy import to avoid errors if not installed)
-        try:
-            from groq import Groq
-        except ImportError:
-            st.error("❌ Groq library not installed. Run: pip install groq")
-            return None
-        
-        # Initialize Groq client
-        client = Groq(api_key=api_key)
-        
-        # Create prompt - improved for better results
-        prompt = f"""Convert these phonemes to natural English text. Output ONLY the text, nothing else.
-
-Phonemes: {phonemes_str}
-
-Text:"""
-        
         # Call Groq API
         response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",  # Fast, accurate model
+            model=MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
             max_tokens=50,
             timeout=timeout
         )
         
-        # Extract text
-        text = response.choices[0].message.content.strip()
-        
-        # Clean up any remaining formatting
-        text = text.replace('"', '').replace("'", "").strip()
-        
-        # Remove common LLM artifacts
-        text = _clean_response(text)
-        
+        text = clean_corrected_text(response.choices[0].message.content or "")
         if not text:
             st.warning("⚠️ LLM returned empty response")
-            return None
-        
         return text
         
     except Exception as e:
-        # Show detailed error for debugging
-        error_msg = str(e)
-        st.error(f"❌ LLM Error: {error_msg}")
-        
-        # Show traceback in expander for debugging
-        with st.expander("🔍 Error Details", expanded=False):
-            import traceback
-            st.code(traceback.format_exc())
+        _show_error(e)
         
         # Return None to trigger fallback
         return None
 
 
+def stream_phonemes_with_groq(phoneme_sequence: Union[str, List[str]], timeout: int = 15) -> Iterator[str]:
+    """
+    Stream the correction of a phoneme sequence token by token.
+    
+    Yields the raw text deltas as they arrive (join them and pass the result to
+    clean_corrected_text() for the final answer). Errors are shown in the app and end
+    the stream, so an empty result means "fall back to the raw phonemes". Consume it
+    inside contextlib.closing() so an interrupted rerun releases the connection.
+    
+    Args:
+        phoneme_sequence: Space-separated phoneme string or list of phonemes
+        timeout: Request timeout in seconds
+    """
+    try:
+        prompt = _phonemes_to_prompt(phoneme_sequence)
+        if prompt is None:
+            return
+        
+        client = _client_or_warn()
+        if client is None:
+            return
+        
+        # Closing the stream (also when the caller abandons or closes this generator)
+        # hands its connection back to the pool
+        with client.chat.completions.create(
+            model=MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.3,
+            max_tokens=50,
+            timeout=timeout,
+            stream=True
+        ) as stream:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        
+    except Exception as e:
+        _show_error(e)
+
+
 def _clean_response(text: str) -> str:
     """Clean LLM response text."""
     import re
@@ -125,14 +229,4 @@ def is_groq_available() -> bool:
     Returns:
         True if API key is configured, False otherwise
     """
-    try:
-        api_key = st.secrets.get("GROQ_API_KEY")
-        if api_key:
-            return True
-    except (AttributeError, FileNotFoundError, KeyError):
-        pass
-    
-    # Check environment variable
-    api_key = os.getenv("GROQ_API_KEY")
-    return api_key is not None and len(api_key.strip()) > 0
-
+    return _resolve_api_key() is not None
@@ -0,0 +1,136 @@
+"""
+Packed phoneme EMG library
+
+The builder's pre-generated exemplars are stored as two files that load without pickle:
+- phoneme_emg_library.npy: float32 array (P, K, 4, W) - up to K exemplar windows per
+  phoneme, opened with mmap so only the rows a sequence touches are read
+- phoneme_emg_library_index.npz: parallel metadata
+    names (P,) phoneme strings, phoneme_index (P,) class indices,
+    counts (P,) valid exemplars per phoneme (rows are padded to K with zeros),
+    confidence (P, K) float32, sample_index (P, K) int64 rows in the source data
+
+Written by generate_phoneme_library.py, read by components.phoneme_builder.
+"""
+
+import os
+
+import numpy as np
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data'))
+LIBRARY_PATH = os.path.join(DATA_DIR, 'phoneme_emg_library.npy')
+DEFAULT_CONFIDENCE = 0.8
+CHANNELS = 4
+
+
+def index_path(library_path):
+    """Metadata file stored next to the packed array."""
+    return os.path.splitext(library_path)[0] + '_index.npz'
+
+
+class PackedEMGLibrary:
+    """
+    Packed exemplar array plus metadata, with a phoneme name -> row index.
+
+    Attributes:
+        emg: (P, K, 4, W) float32 array (read-only memmap when loaded from disk)
+        names: (P,) phoneme strings
+        phoneme_index: (P,) class index of each phoneme
+        counts: (P,) number of valid exemplars per phoneme
+        confidence: (P, K) float32
+        sample_index: (P, K) int64
+        rows: {phoneme: row in the arrays above}
+    """
+
+    def __init__(self, emg, names, phoneme_index, counts, confidence, sample_index):
+        self.emg = emg
+        self.names = np.asarray(names, dtype=str)
+        self.phoneme_index = np.asarray(phoneme_index, dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.confidence = np.asarray(confidence, dtype=np.float32)
+        self.sample_index = np.asarray(sample_index, dtype=np.int64)
+        self.rows = {str(name): row for row, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, phoneme):
+        return phoneme in self.rows
+
+    @property
+    def exemplars(self):
+        """Exemplar slots per phoneme (K)."""
+        return self.emg.shape[1]
+
+    def gather(self, phonemes, exemplar=0):
+        """
+        EMG windows for a phoneme sequence in one fancy-index gather.
+
+        Args:
+            phonemes: Phoneme strings (all must be in the library)
+            exemplar: Exemplar slot per position - an int, or an array with one entry per
+                      phoneme; wrapped modulo each phoneme's exemplar count
+
+        Returns:
+            Tuple of (windows (N, 4, W) float32, confidences (N,) float32)
+        """
+        rows = np.fromiter((self.rows[p] for p in phonemes), dtype=np.int64, count=len(phonemes))
+        slots = np.broadcast_to(np.asarray(exemplar, dtype=np.int64), rows.shape) % self.counts[rows]
+        return np.asarray(self.emg[rows, slots]), self.confidence[rows, slots]
+
+
+def pack_exemplars(exemplars, phoneme_index, max_exemplars=None):
+    """
+    Pack per-phoneme exemplar lists into a PackedEMGLibrary.
+
+    Args:
+        exemplars: {phoneme: [(emg (4, W), confidence, sample_index), ...]} in library order
+        phoneme_index: {phoneme: class index}
+        max_exemplars: K (default: the largest exemplar count)
+    """
+    names = [p for p, items in exemplars.items() if items]
+    if not names:
+        raise ValueError("No exemplars to pack")
+    k = max_exemplars or max(len(exemplars[p]) for p in names)
+    window = np.asarray(exemplars[names[0]][0][0]).shape[-1]
+
+    emg = np.zeros((len(names), k, CHANNELS, window), dtype=np.float32)
+    counts = np.zeros(len(names), dtype=np.int64)
+    confidence = np.zeros((len(names), k), dtype=np.float32)
+    sample_index = np.full((len(names), k), -1, dtype=np.int64)
+    for row, phoneme in enumerate(names):
+        items = exemplars[phoneme][:k]
+        counts[row] = len(items)
+        for slot, (window_data, conf, sample) in enumerate(items):
+            emg[row, slot] = window_data
+            confidence[row, slot] = conf
+            sample_index[row, slot] = sample
+
+    return PackedEMGLibrary(emg, names, [phoneme_index[p] for p in names], counts, confidence, sample_index)
+
+
+def save_library(library, path=LIBRARY_PATH):
+    """Write the packed array and its metadata (no pickled objects)."""
+    np.save(path, np.ascontiguousarray(library.emg, dtype=np.float32))
+    np.savez(
+        index_path(path),
+        names=library.names,
+        phoneme_index=library.phoneme_index,
+        counts=library.counts,
+        confidence=library.confidence,
+        sample_index=library.sample_index,
+    )
+
+
+def load_library(path=LIBRARY_PATH, mmap=True):
+    """
+    Open a packed library.
+
+    Raises:
+        FileNotFoundError: If the array or its index is missing
+    """
+    emg = np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+    with np.load(index_path(path), allow_pickle=False) as meta:
+        return PackedEMGLibrary(
+            emg, meta['names'], meta['phoneme_index'], meta['counts'],
+            meta['confidence'], meta['sample_index']
+        )
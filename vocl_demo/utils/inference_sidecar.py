@@ -0,0 +1,312 @@
+"""
+Shared inference sidecar
+
+One process loads the EMG model and serves every Streamlit session over a Unix socket,
+instead of each server process holding its own TensorFlow runtime and model copy.
+Requests that arrive together are batched into a single model call.
+
+Protocol (little-endian):
+- request:  b'VOCQ', uint32 n_windows, uint32 window_size, then n * 4 * window_size float32
+- response: b'VOCR', uint8 status, uint32 rows, uint32 cols, then rows * cols float32
+            (status != 0: cols == 0 and the payload is a UTF-8 error message of `rows` bytes)
+
+Usage:
+    python -m utils.inference_sidecar --socket /tmp/vocl_inference.sock
+    VOCL_INFERENCE_SOCKET=/tmp/vocl_inference.sock streamlit run vocl_demo/app.py
+"""
+
+import os
+import time
+import queue
+import socket
+import struct
+import argparse
+import threading
+import socketserver
+
+import numpy as np
+
+CHANNELS = 4
+REQUEST_HEADER = struct.Struct('<4sII')
+RESPONSE_HEADER = struct.Struct('<4sBII')
+REQUEST_MAGIC = b'VOCQ'
+RESPONSE_MAGIC = b'VOCR'
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+DEFAULT_SOCKET = '/tmp/vocl_inference.sock'
+MAX_BATCH = 256  # Windows per model call
+MAX_WAIT_MS = 2.0  # How long the first request in a batch waits for company
+MAX_IDLE_CONNECTIONS = 16  # Idle connections a client keeps open for reuse
+
+
+def _recv_exact(sock, size):
+    """Read exactly size bytes (raises ConnectionError if the peer closes early)."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError("Connection closed")
+        received += count
+    return buffer
+
+
+def encode_request(windows):
+    windows = np.ascontiguousarray(windows, dtype='<f4')
+    n, channels, window_size = windows.shape
+    return REQUEST_HEADER.pack(REQUEST_MAGIC, n, window_size) + windows.tobytes()
+
+
+def encode_response(probabilities):
+    probabilities = np.ascontiguousarray(probabilities, dtype='<f4')
+    rows, cols = probabilities.shape
+    return RESPONSE_HEADER.pack(RESPONSE_MAGIC, STATUS_OK, rows, cols) + probabilities.tobytes()
+
+
+def encode_error(message):
+    payload = str(message).encode('utf-8')
+    return RESPONSE_HEADER.pack(RESPONSE_MAGIC, STATUS_ERROR, len(payload), 0) + payload
+
+
+class _Request:
+    """One client request waiting in the batcher queue."""
+
+    def __init__(self, windows):
+        self.windows = windows
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class Batcher:
+    """
+    Collects concurrent requests and runs them through the model as one batch.
+
+    The first request waits at most max_wait_ms for others to join, then everything
+    queued (up to max_batch windows) is predicted in one call and split back.
+    """
+
+    def __init__(self, model, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.windows = 0
+        threading.Thread(target=self._run, name='vocl-batcher', daemon=True).start()
+
+    def predict(self, windows):
+        request = _Request(windows)
+        self.queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _collect(self):
+        batch = [self.queue.get()]
+        size = len(batch[0].windows)
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.windows)
+        return batch
+
+    def _run(self):
+        while True:
+            # Requests with different window sizes can't share one model call
+            groups = {}
+            for request in self._collect():
+                groups.setdefault(request.windows.shape[1:], []).append(request)
+            for group in groups.values():
+                self._predict(group)
+
+    def _predict(self, batch):
+        try:
+            windows = np.concatenate([request.windows for request in batch])
+            probabilities = np.asarray(self.model.predict(windows, verbose=0))
+            self.batches += 1
+            self.windows += len(windows)
+
+            offset = 0
+            for request in batch:
+                request.result = probabilities[offset:offset + len(request.windows)]
+                offset += len(request.windows)
+        except Exception as e:
+            for request in batch:
+                request.error = e
+        finally:
+            for request in batch:
+                request.done.set()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        # One connection per client thread; serve requests until it closes
+        while True:
+            try:
+                magic, n, window_size = REQUEST_HEADER.unpack(_recv_exact(self.request, REQUEST_HEADER.size))
+            except ConnectionError:
+                return
+            if magic != REQUEST_MAGIC:
+                self.request.sendall(encode_error("Bad request header"))
+                return
+
+            try:
+                payload = _recv_exact(self.request, n * CHANNELS * window_size * 4)
+            except ConnectionError:
+                return
+            windows = np.frombuffer(payload, dtype='<f4').reshape(n, CHANNELS, window_size)
+            try:
+                response = encode_response(self.server.batcher.predict(windows))
+            except Exception as e:
+                response = encode_error(e)
+            try:
+                self.request.sendall(response)
+            except ConnectionError:
+                return  # Client gave up (timeout) and closed its connection
+
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128  # Listen backlog: every session connects at once after a restart
+
+    def __init__(self, socket_path, model, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # Stale socket from a previous run
+        self.batcher = Batcher(model, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        super().__init__(socket_path, _Handler)
+
+
+class InferenceClient:
+    """
+    Client for the sidecar. Connections are pooled on the client: a call takes an idle
+    connection (or opens one) and hands it back when done. Concurrent Streamlit sessions
+    reach the batcher together, and a rerun on a new script thread reuses a connection
+    instead of opening its own.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET, timeout=30.0, max_idle=MAX_IDLE_CONNECTIONS):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    def _acquire(self, fresh=False):
+        if not fresh:
+            with self._lock:
+                if self._idle:
+                    return self._idle.pop()
+        return self._connect()
+
+    def _release(self, sock):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(sock)
+                return
+        sock.close()
+
+    def close(self):
+        """Close the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sock in idle:
+            sock.close()
+
+    def predict(self, windows):
+        """
+        Args:
+            windows: Array of shape (N, 4, window_size)
+
+        Returns:
+            Softmax probabilities (N, classes)
+        """
+        request = encode_request(windows)
+        for attempt in range(2):
+            sock = self._acquire(fresh=attempt > 0)
+            try:
+                sock.sendall(request)
+                magic, status, rows, cols = RESPONSE_HEADER.unpack(_recv_exact(sock, RESPONSE_HEADER.size))
+                break
+            except ConnectionError:
+                # Pooled connection from before a sidecar restart - retry once on a new one
+                sock.close()
+                if attempt:
+                    raise
+            except BaseException:
+                # Timeout etc.: the reply may still arrive, so this connection is out of sync
+                sock.close()
+                raise
+
+        try:
+            if magic != RESPONSE_MAGIC:
+                raise ConnectionError("Bad response header from inference sidecar")
+            if status != STATUS_OK:
+                message = _recv_exact(sock, rows).decode('utf-8')
+            else:
+                result = np.frombuffer(_recv_exact(sock, rows * cols * 4), dtype='<f4').reshape(rows, cols)
+        except BaseException:
+            sock.close()
+            raise
+
+        # The whole reply was read, so the connection can serve the next call
+        self._release(sock)
+        if status != STATUS_OK:
+            raise RuntimeError(f"Inference sidecar error: {message}")
+        return result
+
+
+class SidecarModel:
+    """Keras-style predict() backed by the sidecar (VOCLPipeline's client backend)."""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET):
+        self.client = InferenceClient(socket_path)
+
+    def predict(self, x, verbose=0):
+        return self.client.predict(np.asarray(x, dtype=np.float32).reshape(len(x), CHANNELS, -1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the EMG model over a Unix socket")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET)
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH)
+    parser.add_argument('--max-wait-ms', type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    from .pipeline import load_emg_model
+
+    model = load_emg_model()
+    model.predict(np.zeros((1, CHANNELS, 5), dtype=np.float32), verbose=0)  # Warm-up
+
+    server = InferenceServer(args.socket, model, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    print(f"VOCL inference sidecar listening on {args.socket}", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,43 @@
 LLM Phoneme Corrector - Cloud-Compatible Version
 
 Graceful fallback if Ollama is unavailable (for Streamlit Cloud deployment).
+Requests go through one keep-alive session per process.
 """
 
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
 
+POOL_SIZE = 4  # Connections kept open per host
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """The process-wide HTTP session (connection pool with keep-alive), created on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
 
-def correct_phonemes_with_llm(phoneme_sequence: str, timeout: int = 5) -> Optional[str]:
+def correct_phonemes_with_llm(phoneme_sequence: str, timeout: int = 5,
+                              api_url: str = "http://localhost:11434/api/generate") -> Optional[str]:
     """
     Correct phoneme sequence using Ollama LLM (optional - graceful fallback).
     
     Args:
         phoneme_sequence: Space-separated phoneme string
         timeout: Request timeout in seconds (short for cloud)
+        api_url: Ollama generate endpoint
     
     Returns:
         Corrected text string, or None if LLM unavailable
@@ -23,7 +47,6 @@ def correct_phonemes_with_llm(phoneme_sequence: str, timeout: int = 5) -> Option
         return None
     
     # Try Ollama API (localhost won't work on cloud, but try anyway)
-    api_url = "http://localhost:11434/api/generate"
     model = "llama3.2:3b"
     
     prompt = f"""Convert these phonemes to English text. Output ONLY the text, nothing else.
@@ -33,7 +56,7 @@ Phonemes: {phoneme_sequence}
 Text:"""
     
     try:
-        response = requests.post(
+        response = get_session().post(
             api_url,
             json={
                 "model": model,
@@ -0,0 +1,182 @@
+"""
+Per-rerun timing spans
+
+Hot-path functions are wrapped with @timed (or a `with span(...)` block); every call
+made from the Streamlit script thread is recorded as a span in the session's current
+rerun record. app.py brackets each script run with begin_rerun()/end_rerun(), and the
+sidebar panel (components.perf_panel) shows the breakdown and exports it as JSON.
+
+Calls from background threads (model loader, playback) and outside Streamlit are
+not recorded and cost one context lookup.
+
+Set VOCL_PERF_LOG=/path/to/file.jsonl to also append every finished rerun there, for
+aggregation across sessions.
+"""
+
+import os
+import json
+import time
+import functools
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+PERF_LOG_ENV_VAR = 'VOCL_PERF_LOG'
+HISTORY_KEY = '_perf_history'
+CURRENT_KEY = '_perf_current'
+MAX_HISTORY = 50  # Rerun records kept per session
+
+
+class RerunRecord:
+    """Spans of one script run (kind 'script') or of fragment reruns between them ('fragment')."""
+
+    def __init__(self, index, kind='script'):
+        self.index = index
+        self.kind = kind
+        self.started = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+        self.spans = []  # [(name, start ms, duration ms, depth)]
+        self.total_ms = None
+        self.closed = False
+        self._t0 = time.perf_counter()
+        self._depth = 0
+
+    def add(self, name, start, duration_ms, depth):
+        self.spans.append((name, (start - self._t0) * 1000, duration_ms, depth))
+
+    def close(self):
+        self.total_ms = (time.perf_counter() - self._t0) * 1000
+        self.closed = True
+
+    def breakdown(self):
+        """
+        Returns:
+            List of (name, calls, total ms) per span name, slowest first
+        """
+        totals = {}
+        for name, _, duration_ms, _ in self.spans:
+            calls, total = totals.get(name, (0, 0.0))
+            totals[name] = (calls + 1, total + duration_ms)
+        return sorted(((name, calls, total) for name, (calls, total) in totals.items()),
+                      key=lambda item: -item[2])
+
+    def to_dict(self):
+        total_ms = self.total_ms
+        if total_ms is None:  # Fragment records: time covered by top-level spans
+            total_ms = sum(duration for _, _, duration, depth in self.spans if depth == 0)
+        return {
+            'rerun': self.index,
+            'kind': self.kind,
+            'started': self.started,
+            'total_ms': round(total_ms, 3),
+            'spans': [
+                {'name': name, 'start_ms': round(start, 3), 'ms': round(duration, 3), 'depth': depth}
+                for name, start, duration, depth in self.spans
+            ],
+        }
+
+
+def _session_state():
+    """The session state if called from a Streamlit script thread, else None."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    import streamlit as st
+    return st.session_state
+
+
+def _history(state):
+    if HISTORY_KEY not in state:
+        state[HISTORY_KEY] = []
+    return state[HISTORY_KEY]
+
+
+def _next_index(state):
+    history = _history(state)
+    return history[-1].index + 1 if history else 0
+
+
+def _push(state, record):
+    history = _history(state)
+    history.append(record)
+    del history[:-MAX_HISTORY]
+    state[CURRENT_KEY] = record
+
+
+def _current_record():
+    state = _session_state()
+    if state is None:
+        return None
+    record = state.get(CURRENT_KEY)
+    if record is None or record.closed:
+        # A fragment rerun (no begin_rerun): collect its spans in their own record
+        record = RerunRecord(_next_index(state), kind='fragment')
+        _push(state, record)
+    return record
+
+
+def begin_rerun():
+    """Start recording a script run (call at the top of the app script)."""
+    state = _session_state()
+    if state is not None:
+        _push(state, RerunRecord(_next_index(state)))
+
+
+def end_rerun():
+    """
+    Close the current script run's record and append it to VOCL_PERF_LOG if set.
+
+    Returns:
+        The closed RerunRecord, or None outside Streamlit
+    """
+    state = _session_state()
+    record = state.get(CURRENT_KEY) if state is not None else None
+    if record is None or record.closed:
+        return None
+    record.close()
+
+    log_path = os.environ.get(PERF_LOG_ENV_VAR)
+    if log_path:
+        try:
+            with open(log_path, 'a') as f:
+                f.write(json.dumps(record.to_dict()) + '\n')
+        except OSError as e:
+            print(f"Could not append to {log_path}: {e}")
+    return record
+
+
+def rerun_history():
+    """This session's rerun records, oldest first."""
+    state = _session_state()
+    return list(state.get(HISTORY_KEY, [])) if state is not None else []
+
+
+@contextmanager
+def span(name):
+    """Time a block as a span of the current rerun."""
+    record = _current_record()
+    if record is None:
+        yield
+        return
+    depth = record._depth
+    record._depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record._depth = depth
+        record.add(name, start, (time.perf_counter() - start) * 1000, depth)
+
+
+def timed(name=None):
+    """Decorator: record every call of the function as a span (named after it by default)."""
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -3,23 +3,24 @@ VOCL Pipeline Utilities
 
 Utility functions for the full VOCL pipeline:
 - Model loading
-- Phoneme prediction
+- Phoneme prediction (precomputed over the test split)
 - LLM correction
 """
 
 import numpy as np
 import os
 import sys
+import time
+import hashlib
+import threading
 
 # Configure environment BEFORE any TensorFlow import to prevent crashes
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # Suppress TensorFlow warnings
 os.environ['TF_FORCE_GPU_ALLOW_GROWTH'] = 'true'
 
-# Disable multiprocessing/threading to avoid crashes on macOS
-os.environ['OMP_NUM_THREADS'] = '1'
-os.environ['TF_NUM_INTEROP_THREADS'] = '1'
-os.environ['TF_NUM_INTRAOP_THREADS'] = '1'
-os.environ['TF_DISABLE_MKL'] = '1'  # Disable MKL threading
+# Host-aware thread settings ("safe" single-threading on macOS to avoid crashes)
+from .threading_policy import configure_tensorflow, ensure_threading_profile
+ensure_threading_profile()
 
 # Lazy import TensorFlow - only import when needed to avoid crashes
 tf = None
@@ -30,16 +31,12 @@ def _import_tensorflow():
     if tf is None:
         try:
             import tensorflow as tf
-            # Configure TensorFlow to use single thread
-            tf.config.threading.set_inter_op_parallelism_threads(1)
-            tf.config.threading.set_intra_op_parallelism_threads(1)
+            # Configure TensorFlow with the active threading profile
+            configure_tensorflow(tf)
         except Exception as e:
             raise RuntimeError(f"Failed to import TensorFlow: {e}")
     return tf
 
-# Import cloud LLM corrector (cloud-compatible)
-from .cloud_llm import correct_phonemes_with_groq
-
 # Phoneme class list
 PHONEMES = ['_', 'B', 'D', 'F', 'G', 'HH', 'JH', 'K', 'L', 'M', 'N', 'P', 'R', 'S', 'T', 'V', 'W', 'Y', 'Z', 'CH', 'SH', 'NG', 'DH', 'TH', 'ZH', 'WH', 'AA', 'AI(R)', 'I(R)', 'A(R)', 'ER', 'EY', 'IY', 'AY', 'OW', 'UW', 'AE', 'EH', 'IH', 'AO', 'AH', 'UH', 'OO', 'AW', 'OY']
 
@@ -48,56 +45,365 @@ MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../models/LSTM_all44_se
 X_DATA_PATH = os.path.join(os.path.dirname(__file__), '../../X_all44_3220_4_5_5.npy')
 Y_DATA_PATH = os.path.join(os.path.dirname(__file__), '../../y_all44_3220_4_5_5.npy')
 
+# Persisted prediction tables (keyed by model checksum + data file)
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'cache')
+
+# Number of alternatives kept per row in the prediction table
+TOP_K = 3
+
+# Set to a Unix socket path to use a shared inference sidecar instead of an in-process model
+SIDECAR_ENV_VAR = 'VOCL_INFERENCE_SOCKET'
+
+# Staged readiness of a pipeline being loaded in the background (in order)
+PIPELINE_STAGES = ('data_ready', 'model_loaded', 'warmed_up')
+
+# Seconds before a failed background load is retried (missing file, sidecar not up yet)
+RETRY_AFTER = 30.0
+
+# Dummy batch size used to trace the model's graph before the first real request
+WARMUP_BATCH = 1
+
+# Test split parameters (must match Model_Training_Final.ipynb)
+TEST_SIZE = 0.2
+SPLIT_SEED = 489
+
+
+def _hash_path(path, hasher=None):
+    """
+    Hash a file, or every file under a directory in sorted order.
+    
+    Args:
+        path: File or directory path
+        hasher: Optional hashlib object to update
+        
+    Returns:
+        hashlib object with the contents of path fed into it
+    """
+    hasher = hasher or hashlib.sha256()
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                hasher.update(os.path.relpath(file_path, path).encode())
+                _hash_path(file_path, hasher)
+    else:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(block)
+    return hasher
+
+
+def split_cache_path(x_path=X_DATA_PATH, y_path=Y_DATA_PATH, test_size=TEST_SIZE, seed=SPLIT_SEED):
+    """
+    Path of the persisted test split, next to the data and keyed by its contents and seed.
+    
+    Returns:
+        Path string (the file may not exist yet)
+    """
+    hasher = hashlib.sha256()
+    _hash_path(x_path, hasher)
+    _hash_path(y_path, hasher)
+    hasher.update(f"test_size={test_size};seed={seed}".encode())
+    stem = os.path.splitext(x_path)[0]
+    return f"{stem}_test_split_{hasher.hexdigest()[:16]}.npy"
+
+
+def compute_test_indices(n_samples, test_size=TEST_SIZE, seed=SPLIT_SEED):
+    """
+    Test-row indices of train_test_split(..., test_size, random_state=seed) without scikit-learn.
+    
+    Mirrors ShuffleSplit: one RandomState permutation, the first ceil(test_size * n)
+    entries are the test rows (in that order).
+    
+    Returns:
+        Array of row indices into the full data
+    """
+    n_test = int(np.ceil(test_size * n_samples))
+    return np.random.RandomState(seed).permutation(n_samples)[:n_test]
+
+
+def load_test_indices(x_path=X_DATA_PATH, y_path=Y_DATA_PATH, n_samples=None, test_size=TEST_SIZE, seed=SPLIT_SEED):
+    """
+    Load the persisted test split, computing and saving it on first use.
+    
+    Args:
+        n_samples: Number of rows in the data (read from the file header if None)
+        
+    Returns:
+        Array of row indices into the full data
+    """
+    path = split_cache_path(x_path, y_path, test_size, seed)
+    if os.path.exists(path):
+        try:
+            return np.load(path)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable split file {path}: {e}")
+    
+    if n_samples is None:
+        n_samples = np.load(x_path, mmap_mode='r').shape[0]
+    indices = compute_test_indices(n_samples, test_size, seed)
+    
+    try:
+        tmp_path = f"{path}.tmp.npy"
+        np.save(tmp_path, indices)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not persist test split: {e}")
+    return indices
+
+
+def prediction_cache_key(model_path=MODEL_PATH, data_path=X_DATA_PATH):
+    """
+    Cache key for a prediction table: model checksum + data file checksum + split parameters.
+    
+    Returns:
+        Hex digest string
+    """
+    hasher = hashlib.sha256()
+    _hash_path(model_path, hasher)
+    _hash_path(data_path, hasher)
+    hasher.update(f"test_size={TEST_SIZE};seed={SPLIT_SEED};top_k={TOP_K}".encode())
+    return hasher.hexdigest()
+
+
+class PredictionTable:
+    """
+    Precomputed model outputs for every row of the test split.
+    
+    Holds the softmax matrix, the argmax and the top-k classes per row so
+    lookups never need a model call.
+    """
+    
+    def __init__(self, probabilities, top_k=TOP_K):
+        """
+        Args:
+            probabilities: Softmax matrix of shape (N, classes)
+            top_k: Number of alternatives to keep per row
+        """
+        self.probabilities = np.asarray(probabilities, dtype=np.float32)
+        self.argmax = np.argmax(self.probabilities, axis=1)
+        self.confidence = self.probabilities[np.arange(len(self.probabilities)), self.argmax]
+        
+        # Top-k per row: argpartition then sort only the k kept columns (descending)
+        k = min(top_k, self.probabilities.shape[1])
+        top = np.argpartition(self.probabilities, -k, axis=1)[:, -k:]
+        order = np.argsort(np.take_along_axis(self.probabilities, top, axis=1), axis=1)[:, ::-1]
+        self.top_k = np.take_along_axis(top, order, axis=1)
+    
+    def __len__(self):
+        return len(self.probabilities)
+    
+    def save(self, path):
+        """Persist the table to an .npz file."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, probabilities=self.probabilities, top_k=np.int64(self.top_k.shape[1]))
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path):
+        """Load a table saved with save()."""
+        with np.load(path) as data:
+            table = cls(data['probabilities'], top_k=int(data['top_k']))
+        return table
+
+
+def load_emg_model(model_path=MODEL_PATH):
+    """
+    Load the trained EMG model.
+    
+    Returns:
+        Object with a Keras-style predict(x, verbose=0) returning softmax probabilities
+    """
+    tf = _import_tensorflow()
+    
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model not found at {model_path}")
+    
+    try:
+        # Try SavedModel format first (most likely)
+        model = tf.saved_model.load(model_path)
+        infer = model.signatures["serving_default"]
+        
+        class SavedModelWrapper:
+            def __init__(self, infer_func):
+                self.infer = infer_func
+            def predict(self, x, verbose=0):
+                if isinstance(x, np.ndarray):
+                    x = tf.constant(x, dtype=tf.float32)
+                output = self.infer(x)
+                result = list(output.values())[0]
+                return result.numpy()
+        
+        return SavedModelWrapper(infer)
+    except Exception as e1:
+        # Try Keras format as fallback
+        try:
+            return tf.keras.models.load_model(model_path, safe_mode=False)
+        except Exception as e2:
+            raise RuntimeError(f"Failed to load model: SavedModel error: {e1}, Keras error: {e2}")
+
+
+def sliding_window_timeline(signal, predict, window=5, hop=1):
+    """
+    Run a window classifier across a continuous (4, T) signal and spread its outputs over samples.
+    
+    Every hop-th window is a zero-copy view from sliding_window_view, scored in one call
+    (plus one call for the window flush with the end when the hop doesn't land on it).
+    Each sample's probabilities are the mean over every window covering it.
+    
+    Args:
+        signal: Array of shape (4, T), T >= window
+        predict: Callable mapping an (N, 4, window) batch to (N, classes) probabilities
+        window: Samples per classifier window
+        hop: Samples between window starts (1..window, so every sample is covered)
+        
+    Returns:
+        Tuple of (timeline (T, classes), window starts (N,), window probabilities (N, classes))
+    """
+    if not 1 <= hop <= window:
+        raise ValueError(f"hop must be between 1 and {window}, got {hop}")
+    
+    signal = np.asarray(signal, dtype=np.float32)
+    n_samples = signal.shape[1]
+    if n_samples < window:
+        raise ValueError(f"Signal has {n_samples} samples, fewer than one {window}-sample window")
+    
+    # (4, T - window + 1, window) views; a basic [::hop] slice keeps them views (no copy)
+    windows = np.lib.stride_tricks.sliding_window_view(signal, window, axis=1)[:, ::hop].transpose(1, 0, 2)
+    starts = np.arange(0, n_samples - window + 1, hop)
+    window_probs = np.asarray(predict(windows))
+    
+    # Score the window flush with the end separately if the hop skipped it
+    if starts[-1] != n_samples - window:
+        tail_probs = np.asarray(predict(signal[np.newaxis, :, n_samples - window:]))
+        starts = np.append(starts, n_samples - window)
+        window_probs = np.concatenate([window_probs, tail_probs])
+    
+    # Add each window's probabilities over its span via a difference array
+    delta = np.zeros((n_samples + 1, window_probs.shape[1]), dtype=np.float64)
+    coverage = np.zeros(n_samples + 1)
+    np.add.at(delta, starts, window_probs)
+    np.add.at(delta, starts + window, -window_probs)
+    np.add.at(coverage, starts, 1)
+    np.add.at(coverage, starts + window, -1)
+    
+    timeline = np.cumsum(delta[:-1], axis=0) / np.cumsum(coverage[:-1])[:, np.newaxis]
+    return timeline.astype(np.float32), starts, window_probs
+
+
+def timeline_segments(timeline):
+    """
+    Collapse a per-sample probability timeline into runs of the same predicted phoneme.
+    
+    Returns:
+        List of (phoneme, start_sample, end_sample, mean_confidence)
+    """
+    best = np.argmax(timeline, axis=1)
+    boundaries = np.flatnonzero(np.diff(best)) + 1
+    starts = np.concatenate([[0], boundaries])
+    ends = np.concatenate([boundaries, [len(best)]])
+    confidence = timeline[np.arange(len(best)), best]
+    return [
+        (PHONEMES[best[start]], int(start), int(end), float(confidence[start:end].mean()))
+        for start, end in zip(starts, ends)
+    ]
+
 
 class VOCLPipeline:
     """
     Complete VOCL pipeline: EMG → Phonemes → Text
     """
     
-    def __init__(self):
-        """Initialize the pipeline with model and LLM corrector."""
+    def __init__(self, load=True):
+        """
+        Initialize the pipeline with model and LLM corrector.
+        
+        Args:
+            load: Load everything now; pass False and call load() from a background
+                thread to get staged readiness (see start_pipeline())
+        """
         self.model = None
         self.corrector = None
         self.X_test = None
         self.y_test = None
-        self._load_model()
-        self._load_data()
-        self._load_corrector()
+        self.rows_by_phoneme = {}
+        self.prediction_table = None
+        self._table_ready = threading.Event()
+        self._table_error = None
+        self.stage = None  # Last stage reached (one of PIPELINE_STAGES)
+        self.error = None
+        self.failed_at = None  # time.monotonic() of the failure, for retries
+        self._stages = {stage: threading.Event() for stage in PIPELINE_STAGES}
+        if load:
+            self.load()
+            if self.error is not None:
+                raise self.error
     
-    def _load_model(self):
-        """Load the trained EMG model."""
-        tf = _import_tensorflow()
-        
-        if not os.path.exists(MODEL_PATH):
-            raise FileNotFoundError(f"Model not found at {MODEL_PATH}")
-        
+    def load(self):
+        """Load data, model and warm-up in order, marking each stage as it completes."""
         try:
-            # Try SavedModel format first (most likely)
-            model = tf.saved_model.load(MODEL_PATH)
-            infer = model.signatures["serving_default"]
+            self._load_data()
+            self._load_corrector()
+            self._reach('data_ready')
             
-            class SavedModelWrapper:
-                def __init__(self, infer_func):
-                    self.infer = infer_func
-                def predict(self, x, verbose=0):
-                    if isinstance(x, np.ndarray):
-                        x = tf.constant(x, dtype=tf.float32)
-                    output = self.infer(x)
-                    result = list(output.values())[0]
-                    return result.numpy()
+            self._load_model()
+            self._reach('model_loaded')
             
-            self.model = SavedModelWrapper(infer)
-        except Exception as e1:
-            # Try Keras format as fallback
-            try:
-                self.model = tf.keras.models.load_model(MODEL_PATH, safe_mode=False)
-            except Exception as e2:
-                raise RuntimeError(f"Failed to load model: SavedModel error: {e1}, Keras error: {e2}")
+            self._warm_up()
+            self._reach('warmed_up')
+        except Exception as e:
+            self.failed_at = time.monotonic()
+            self.error = e
+            self._table_error = e
+            self._table_ready.set()
+            # Wake anyone waiting on a stage that will never be reached
+            for event in self._stages.values():
+                event.set()
+            return
+        
+        # Score the whole test split once, in the background
+        self._table_thread = threading.Thread(target=self._build_prediction_table, daemon=True)
+        self._table_thread.start()
+    
+    def _reach(self, stage):
+        self.stage = stage
+        self._stages[stage].set()
+    
+    def is_ready(self, stage='warmed_up'):
+        """Whether a stage has been reached (without waiting)."""
+        return self._stages[stage].is_set() and self.error is None
+    
+    def wait_for(self, stage='warmed_up', timeout=None):
+        """
+        Block until a loading stage has been reached.
+        
+        Args:
+            stage: One of PIPELINE_STAGES
+            timeout: Seconds to wait (None waits until loading finishes)
+        """
+        if not self._stages[stage].wait(timeout):
+            raise TimeoutError(f"Pipeline has not reached '{stage}' yet (at '{self.stage}')")
+        if self.error is not None:
+            raise RuntimeError(f"Pipeline failed to load: {self.error}")
+    
+    def _warm_up(self):
+        """Run a dummy batch so graph tracing isn't paid by the first real request."""
+        self.model.predict(np.zeros((WARMUP_BATCH, 4, 5), dtype=np.float32), verbose=0)
+    
+    def _load_model(self):
+        """Load the trained EMG model (or connect to the inference sidecar)."""
+        socket_path = os.environ.get(SIDECAR_ENV_VAR)
+        if socket_path:
+            # Sidecar backend: the model lives in another process, TensorFlow is never imported here
+            from .inference_sidecar import SidecarModel
+            self.model = SidecarModel(socket_path)
+        else:
+            self.model = load_emg_model()
     
     def _load_data(self):
         """Load test data for phrase selection."""
-        from sklearn.model_selection import train_test_split
-        
         if not os.path.exists(X_DATA_PATH) or not os.path.exists(Y_DATA_PATH):
             raise FileNotFoundError(f"Data files not found: {X_DATA_PATH} or {Y_DATA_PATH}")
         
@@ -105,9 +411,113 @@ class VOCLPipeline:
         y = np.load(Y_DATA_PATH)
         X = X.reshape(-1, 4, 5)
         
-        _, self.X_test, _, self.y_test = train_test_split(
-            X, y, test_size=0.2, random_state=489
+        test_indices = load_test_indices(n_samples=len(X))
+        self.X_test = X[test_indices]
+        self.y_test = y[test_indices]
+        
+        # phoneme index -> test rows (ascending), so exemplar lookups are a dict access
+        order = np.argsort(self.y_test, kind='stable')
+        labels, starts = np.unique(self.y_test[order], return_index=True)
+        self.rows_by_phoneme = {
+            int(label): rows for label, rows in zip(labels, np.split(order, starts[1:]))
+        }
+    
+    def _build_prediction_table(self):
+        """Build (or load from disk) the prediction table for the test split."""
+        try:
+            cache_path = None
+            try:
+                key = prediction_cache_key()
+                cache_path = os.path.join(CACHE_DIR, f"predictions_{key[:16]}.npz")
+            except OSError as e:
+                print(f"Prediction cache disabled: {e}")
+            
+            if cache_path and os.path.exists(cache_path):
+                try:
+                    table = PredictionTable.load(cache_path)
+                    if len(table) == len(self.X_test):
+                        self.prediction_table = table
+                        return
+                except Exception as e:
+                    print(f"Ignoring unreadable prediction cache {cache_path}: {e}")
+            
+            # One batched forward pass over the whole test split
+            probabilities = self.model.predict(self.X_test.astype(np.float32), verbose=0)
+            self.prediction_table = PredictionTable(probabilities)
+            
+            if cache_path:
+                try:
+                    self.prediction_table.save(cache_path)
+                except OSError as e:
+                    print(f"Could not persist prediction table: {e}")
+        except Exception as e:
+            self._table_error = e
+        finally:
+            self._table_ready.set()
+    
+    def get_prediction_table(self, timeout=None):
+        """
+        Get the precomputed prediction table, waiting for the background build if needed.
+        
+        Args:
+            timeout: Seconds to wait (None waits until the build finishes)
+            
+        Returns:
+            PredictionTable for the test split
+        """
+        if not self._table_ready.wait(timeout):
+            raise TimeoutError("Prediction table is still being built")
+        if self._table_error is not None:
+            raise RuntimeError(f"Failed to build prediction table: {self._table_error}")
+        return self.prediction_table
+    
+    def predict_windows(self, windows):
+        """
+        Score a stack of EMG windows with a single model call.
+        
+        Args:
+            windows: Array of shape (N, 4, 5)
+            
+        Returns:
+            PredictionTable for the N windows
+        """
+        self.wait_for('model_loaded')
+        windows = np.asarray(windows, dtype=np.float32).reshape(-1, 4, 5)
+        return PredictionTable(self.model.predict(windows, verbose=0))
+    
+    def predict_timeline(self, emg_windows, hop=1):
+        """
+        Continuous decoding over a phoneme sequence's EMG windows joined end to end.
+        
+        Args:
+            emg_windows: List of (4, samples) arrays (e.g. from build_emg_sequence_from_library)
+            hop: Samples between classifier windows
+            
+        Returns:
+            Dict with 'signal' (4, T), 'timeline' (T, classes) per-sample probabilities,
+            'starts' and 'window_probabilities' for each classifier window, and
+            'segments' from timeline_segments()
+        """
+        signal = np.concatenate([np.asarray(w, dtype=np.float32) for w in emg_windows], axis=1)
+        timeline, starts, window_probs = sliding_window_timeline(
+            signal, lambda windows: self.predict_windows(windows).probabilities, hop=hop
         )
+        return {
+            'signal': signal,
+            'timeline': timeline,
+            'starts': starts,
+            'window_probabilities': window_probs,
+            'segments': timeline_segments(timeline),
+        }
+    
+    def _predictions_for_rows(self, rows):
+        """
+        Predictions for test-split rows: from the precomputed table when it's ready,
+        otherwise one batched model call instead of waiting for the background build.
+        """
+        if self._table_ready.is_set() and self._table_error is None:
+            return PredictionTable(self.prediction_table.probabilities[rows])
+        return self.predict_windows(self.X_test[rows])
     
     def _load_corrector(self):
         """Load LLM corrector (cloud-compatible, no initialization needed)."""
@@ -133,48 +543,30 @@ class VOCLPipeline:
         true_phoneme = PHONEMES[true_label]
         
         # Generate phoneme sequence (simulate multiple predictions)
-        phoneme_sequence = self._generate_phoneme_sequence(emg_data)
+        phoneme_sequence = self._generate_phoneme_sequence(index)
         
         return emg_data, true_phoneme, phoneme_sequence
     
-    def _generate_phoneme_sequence(self, emg_data, length=10):
+    def _generate_phoneme_sequence(self, index, length=10):
         """
-        Generate a phoneme sequence from EMG data.
+        Generate a phoneme sequence from the precomputed prediction for a test row.
         
         Args:
-            emg_data: Single EMG sample (4, 5)
+            index: Row index in the test dataset
             length: Desired sequence length
             
         Returns:
             Tuple of (phoneme_string, confidences_list)
         """
-        # Predict phoneme for this sample
-        sample = emg_data.reshape(1, 4, 5)
-        prediction = self.model.predict(sample, verbose=0)
-        predicted_idx = np.argmax(prediction[0])
-        confidence = prediction[0][predicted_idx]
-        
-        # Create a sequence by repeating with variations
-        phonemes = []
-        confidences = []
-        
-        for i in range(length):
-            # Add some variation to make it more realistic
-            if i == 0:
-                phoneme = PHONEMES[predicted_idx]
-                conf = confidence
-            else:
-                # Use top predictions for variation
-                top_indices = np.argsort(prediction[0])[-3:][::-1]
-                idx = top_indices[i % len(top_indices)]
-                phoneme = PHONEMES[idx]
-                conf = prediction[0][idx]
-            
-            if phoneme != '_':  # Skip silence
-                phonemes.append(phoneme)
-                confidences.append(conf)
+        table = self.get_prediction_table()
+        top_indices = table.top_k[index]
+        
+        # Cycle through the top predictions for variation (position 0 is the argmax)
+        indices = top_indices[np.arange(length) % len(top_indices)]
+        indices = indices[indices != 0]  # Skip silence
+        confidences = table.probabilities[index, indices]
         
-        return ' '.join(phonemes), confidences[:len(phonemes)]
+        return ' '.join(PHONEMES[i] for i in indices), confidences.tolist()
     
     def correct_phonemes(self, phoneme_sequence: str):
         """
@@ -196,7 +588,8 @@ class VOCLPipeline:
             else:
                 phoneme_list = phoneme_sequence
             
-            # Use cloud LLM function
+            # Use cloud LLM function (imported here: it pulls in streamlit)
+            from .cloud_llm import correct_phonemes_with_groq
             result = correct_phonemes_with_groq(phoneme_list, timeout=15)
             
             # Return result or None
@@ -209,78 +602,128 @@ class VOCLPipeline:
             print(f"LLM correction error: {e}")
             return None
     
-    def get_emg_for_phoneme(self, phoneme_index: int):
+    def _row_for_phoneme(self, phoneme_index: int):
         """
-        Get EMG data sample for a specific phoneme index.
+        Get the test-split row used as the exemplar for a phoneme index.
         
         Args:
             phoneme_index: Index of phoneme in PHONEMES list
             
         Returns:
-            EMG data array of shape (4, 5) or None if not found
+            Row index into X_test
         """
-        # Find first occurrence of this phoneme in test data
-        matching_indices = np.where(self.y_test == phoneme_index)[0]
+        matching_indices = self.rows_by_phoneme.get(phoneme_index)
         
-        if len(matching_indices) > 0:
-            # Return first match
-            idx = matching_indices[0]
-            return self.X_test[idx]
+        if matching_indices is not None:
+            # Return first occurrence of this phoneme in test data
+            return int(matching_indices[0])
         else:
             # Return a default/random sample if phoneme not found
-            return self.X_test[0]
+            return 0
     
-    def build_emg_sequence(self, phoneme_indices: list):
+    def get_emg_for_phoneme(self, phoneme_index: int):
         """
-        Build concatenated EMG sequence from list of phoneme indices.
+        Get EMG data sample for a specific phoneme index.
+        
+        Args:
+            phoneme_index: Index of phoneme in PHONEMES list
+            
+        Returns:
+            EMG data array of shape (4, 5) or None if not found
+        """
+        return self.X_test[self._row_for_phoneme(phoneme_index)]
+    
+    def build_emg_sequence(self, phoneme_indices: list, return_alternatives=False):
+        """
+        Build an EMG sequence from a list of phoneme indices.
         
         Args:
             phoneme_indices: List of phoneme indices
+            return_alternatives: Also return the top-k predictions for every position
             
         Returns:
-            Tuple of (concatenated_emg_data, phoneme_sequence_string, confidences)
+            Tuple of (representative_emg, phoneme_sequence_string, confidences), plus
+            a list of [(phoneme, probability), ...] per position if return_alternatives
         """
         if not phoneme_indices:
-            return None, "", []
-        
-        # Get EMG data for each phoneme
-        emg_windows = []
-        phonemes = []
-        confidences = []
+            return (None, "", [], []) if return_alternatives else (None, "", [])
         
-        for phoneme_idx in phoneme_indices:
-            emg_window = self.get_emg_for_phoneme(phoneme_idx)
-            emg_windows.append(emg_window)
-            phonemes.append(PHONEMES[phoneme_idx])
-        
-        # Concatenate EMG windows along time axis
-        # Each window is (4, 5), we'll stack them to create (4, 5*N)
-        concatenated_emg = np.concatenate(emg_windows, axis=1)
+        # One exemplar row per phoneme, gathered into a single (N, 4, 5) stack
+        rows = np.array([self._row_for_phoneme(i) for i in phoneme_indices])
+        emg_windows = self.X_test[rows]
         
         # For display, we'll use the first window (4, 5) as representative
-        # In a real scenario, you'd process the full concatenated sequence
         representative_emg = emg_windows[0]
         
-        # Generate phoneme sequence and confidences
-        phoneme_string = ' '.join(phonemes)
+        phoneme_string = ' '.join(PHONEMES[i] for i in phoneme_indices)
+        
+        # Confidence of the predicted class for each window, all positions at once
+        predictions = self._predictions_for_rows(rows)
+        confidences = predictions.confidence.tolist()
         
-        # Generate confidences by predicting each phoneme
-        for emg_window in emg_windows:
-            sample = emg_window.reshape(1, 4, 5)
-            prediction = self.model.predict(sample, verbose=0)
-            predicted_idx = np.argmax(prediction[0])
-            confidence = float(prediction[0][predicted_idx])
-            confidences.append(confidence)
+        if not return_alternatives:
+            return representative_emg, phoneme_string, confidences
         
-        return representative_emg, phoneme_string, confidences
+        top_probs = np.take_along_axis(predictions.probabilities, predictions.top_k, axis=1)
+        alternatives = [
+            [(PHONEMES[i], float(p)) for i, p in zip(indices, probs)]
+            for indices, probs in zip(predictions.top_k, top_probs)
+        ]
+        return representative_emg, phoneme_string, confidences, alternatives
 
 
-# Global pipeline instance
+# Global pipeline instance (shared by every session of the server process)
 _pipeline = None
+_pipeline_lock = threading.Lock()
 
-def get_pipeline():
-    """Get or create the global pipeline instance."""
+def start_pipeline():
+    """
+    Start loading the global pipeline in a background thread, once.
+    
+    Safe to call from every session and on every rerun; only the first call starts
+    the loader. A failed load is replaced by a fresh one once RETRY_AFTER seconds
+    have passed, so a transient failure doesn't last until the process restarts.
+    
+    Returns:
+        The global VOCLPipeline (possibly still loading, see pipeline_status())
+    """
     global _pipeline
-    if _pipeline is None:
-        _pipeline = VOCLPipeline()
-    return _pipeline
+    with _pipeline_lock:
+        failed = _pipeline is not None and _pipeline.error is not None
+        if _pipeline is None or (failed and time.monotonic() - _pipeline.failed_at >= RETRY_AFTER):
+            _pipeline = VOCLPipeline(load=False)
+            threading.Thread(target=_pipeline.load, name='vocl-pipeline-loader', daemon=True).start()
+        return _pipeline
+
+def get_pipeline(wait=True, stage='warmed_up', timeout=None):
+    """
+    Get the global pipeline instance, starting the background loader if needed.
+    
+    Args:
+        wait: Block until the pipeline reaches stage; with False, return None instead
+        stage: One of PIPELINE_STAGES
+        timeout: Seconds to wait when wait is True
+        
+    Returns:
+        VOCLPipeline, or None if wait is False and stage hasn't been reached
+    """
+    pipeline = start_pipeline()
+    if wait:
+        pipeline.wait_for(stage, timeout)
+        return pipeline
+    return pipeline if pipeline.is_ready(stage) else None
+
+def pipeline_status():
+    """
+    Loading progress of the global pipeline, for display.
+    
+    Returns:
+        Dict with 'stage' (last stage reached or None), 'progress' (0-1) and 'error' (str or None)
+    """
+    pipeline = start_pipeline()
+    reached = PIPELINE_STAGES.index(pipeline.stage) + 1 if pipeline.stage else 0
+    return {
+        'stage': pipeline.stage,
+        'progress': reached / len(PIPELINE_STAGES),
+        'error': str(pipeline.error) if pipeline.error is not None else None,
+    }
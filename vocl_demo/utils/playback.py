@@ -0,0 +1,188 @@
+"""
+Live playback of a recorded session
+
+Replays a raw OpenBCI recording at its sample rate as if it were a live headset:
+the recording is min-max normalized per channel (as in training), then a background
+thread scores each chunk's 5-sample windows in one batched model call and appends
+the decoded phonemes. The UI polls snapshot() at its own frame
+rate, so drawing never blocks the stream (and the stream never blocks the script).
+"""
+
+import os
+import time
+import threading
+
+import numpy as np
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(__file__), '../../data/chris_final')
+DEFAULT_RECORDING = os.path.join(RECORDINGS_DIR, 'ABCs', 'silent_ABCs.csv')
+
+SAMPLE_RATE = 250  # Hz (4ms per sample)
+CHANNELS = 4
+WINDOW = 5  # Samples per model window
+HEADER_LINES = 5  # OpenBCI '%' comments + column names
+CUTOFF = 10  # Bad rows at the start of a recording
+
+CHUNK = 125  # Samples streamed (and scored in one batch) per step: 0.5 s
+DISPLAY_SECONDS = 5  # Rolling chart span
+STRIP_LENGTH = 40  # Decoded phonemes kept for display
+MIN_CONFIDENCE = 0.5  # Windows below this are not added to the strip
+IDLE_TIMEOUT = 10.0  # Stop if the UI hasn't polled for this long (session closed)
+
+
+def load_recording(csv_file=DEFAULT_RECORDING):
+    """
+    Load the four EMG channels of an OpenBCI recording, min-max normalized per channel.
+
+    Returns:
+        float32 array of shape (4, T)
+    """
+    data = np.loadtxt(csv_file, delimiter=',', skiprows=HEADER_LINES, usecols=range(1, 1 + CHANNELS),
+                      dtype=np.float64)
+    data = data[CUTOFF:].T
+    low = data.min(axis=1, keepdims=True)
+    span = np.maximum(data.max(axis=1, keepdims=True) - low, 1e-12)
+    return ((data - low) / span).astype(np.float32)
+
+
+def minmax_decimate(signal, max_points):
+    """
+    Reduce a (channels, T) signal to at most max_points columns, keeping each bin's
+    min and max so spikes stay visible.
+
+    Returns:
+        Array of shape (channels, <= max_points)
+    """
+    channels, length = signal.shape
+    if length <= max_points:
+        return signal
+    bin_size = -(-2 * length // max_points)  # Two output points per bin
+    usable = length - length % bin_size
+    bins = signal[:, :usable].reshape(channels, -1, bin_size)
+    out = np.empty((channels, bins.shape[1], 2), dtype=signal.dtype)
+    out[..., 0] = bins.min(axis=2)
+    out[..., 1] = bins.max(axis=2)
+    return out.reshape(channels, -1)
+
+
+class PlaybackSession:
+    """
+    Streams a recording through a window classifier on a background thread.
+
+    Args:
+        signal: Normalized (4, T) recording (see load_recording)
+        predict: Callable mapping (N, 4, WINDOW) windows to (argmax (N,), confidence (N,))
+        phonemes: Class index -> phoneme string
+        speed: Playback speed relative to real time
+    """
+
+    def __init__(self, signal, predict, phonemes, speed=1.0):
+        self.signal = signal
+        self.predict = predict
+        self.phonemes = phonemes
+        self.speed = speed
+
+        self.position = 0  # Samples decoded so far
+        self.strip = []  # [(time in s, phoneme, confidence)], repeats collapsed
+        self.error = None
+        self.inference_ms = 0.0  # Last chunk's batch inference time
+        self._previous = None  # Last decoded phoneme (None after silence)
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._last_poll = time.monotonic()
+        self._started = None
+        self._thread = None
+
+    @property
+    def duration(self):
+        return self.signal.shape[1] / SAMPLE_RATE
+
+    def start(self):
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='vocl-playback', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def snapshot(self, display_points=500):
+        """
+        Current state for one UI frame (also keeps the stream alive).
+
+        Returns:
+            Dict with 'time' (s), 'progress' (0-1), 'signal' (4, <= display_points) of the
+            last DISPLAY_SECONDS, 'strip' phonemes, 'running', 'error' and 'inference_ms'
+        """
+        self._last_poll = time.monotonic()
+        with self._lock:
+            decoded = self.position
+            strip = list(self.strip)
+        
+        # The chart follows the playback clock; decoding catches up one chunk at a time
+        position = decoded
+        if self._started is not None and self.is_running():
+            elapsed = (self._last_poll - self._started) * self.speed
+            position = max(decoded, min(int(elapsed * SAMPLE_RATE), decoded + CHUNK))
+        position = min(position, self.signal.shape[1])
+        start = max(0, position - DISPLAY_SECONDS * SAMPLE_RATE)
+        return {
+            'time': position / SAMPLE_RATE,
+            'progress': position / self.signal.shape[1],
+            'signal': minmax_decimate(self.signal[:, start:position], display_points),
+            'strip': strip,
+            'running': self.is_running(),
+            'error': self.error,
+            'inference_ms': self.inference_ms,
+        }
+
+    def _run(self):
+        total = self.signal.shape[1]
+        next_step = time.monotonic()
+        try:
+            while self.position < total and not self._stop.is_set():
+                if time.monotonic() - self._last_poll > IDLE_TIMEOUT:
+                    break  # Nobody is watching any more
+
+                start = self.position
+                end = min(start + CHUNK, total)
+                self._process(start, end)
+                with self._lock:
+                    self.position = end
+
+                # Pace to the recording's clock, not to how fast inference runs
+                next_step += (end - start) / SAMPLE_RATE / self.speed
+                self._stop.wait(max(0.0, next_step - time.monotonic()))
+        except Exception as e:
+            self.error = str(e)
+
+    def _process(self, start, end):
+        """Score the complete windows in [start, end) with one model call."""
+        first = start - start % WINDOW
+        last = end - end % WINDOW
+        if last <= first:
+            return
+        windows = self.signal[:, first:last].reshape(CHANNELS, -1, WINDOW).transpose(1, 0, 2)
+
+        begin = time.perf_counter()
+        labels, confidences = self.predict(windows)
+        self.inference_ms = (time.perf_counter() - begin) * 1000
+
+        decoded = []
+        previous = self._previous
+        for i, (label, confidence) in enumerate(zip(labels, confidences)):
+            phoneme = self.phonemes[int(label)]
+            if phoneme == '_' or confidence < MIN_CONFIDENCE:
+                previous = None  # Silence separates repeated phonemes
+                continue
+            if phoneme != previous:
+                decoded.append(((first + i * WINDOW) / SAMPLE_RATE, phoneme, float(confidence)))
+            previous = phoneme
+        self._previous = previous
+
+        if decoded:
+            with self._lock:
+                self.strip = (self.strip + decoded)[-STRIP_LENGTH:]
@@ -0,0 +1,196 @@
+"""
+Multi-resolution min/max pyramid for long recordings
+
+Level 0 is the raw signal; every level above keeps the min and max of FACTOR bins of
+the level below. A view of any [start, end) range is served from the coarsest level
+that still gives about one bin per output point, so drawing a full session or a
+zoomed-in second costs the same (O(max_points)), whatever the recording length.
+
+The pyramid is stored next to its recording (silent_ABCs.csv -> silent_ABCs_pyramid.npz)
+together with the recording's hash, and rebuilt when the recording changes.
+
+Usage (notebook, with a DataFrame of channels as in Data_Processing_Final.ipynb):
+    import sys; sys.path.insert(0, 'vocl_demo')
+    from utils.signal_pyramid import MinMaxPyramid, plot_all_channels
+    pyramid = MinMaxPyramid.build(df[['DLI', 'OOS', 'OOI', 'Platysma']].to_numpy().T)
+    plot_all_channels(pyramid, "Silent ABCs", start=10000, end=60000,
+                      channel_names=['DLI', 'OOS', 'OOI', 'Platysma'])
+"""
+
+import os
+import hashlib
+
+import numpy as np
+
+FACTOR = 4  # Bins merged per level
+MIN_LEVEL_LENGTH = 256  # Stop adding levels below this many bins
+DEFAULT_POINTS = 2000  # Output points per channel (about the plot width in pixels)
+
+
+def pyramid_path(recording_path):
+    """Pyramid file stored next to a recording."""
+    return os.path.splitext(recording_path)[0] + '_pyramid.npz'
+
+
+def _file_digest(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+class MinMaxPyramid:
+    """
+    Per-channel min/max pyramid over a (channels, T) signal.
+
+    Attributes:
+        levels: List of (mins, maxs) arrays of shape (channels, T / FACTOR**level);
+                level 0 holds the signal itself in both
+        factor: Bins merged per level
+        length: Samples in the original signal
+    """
+
+    def __init__(self, levels, length, factor=FACTOR, source_digest=''):
+        self.levels = levels
+        self.length = length
+        self.factor = factor
+        self.source_digest = source_digest
+
+    @property
+    def channels(self):
+        return self.levels[0][0].shape[0]
+
+    @classmethod
+    def build(cls, signal, factor=FACTOR, min_length=MIN_LEVEL_LENGTH, source_digest=''):
+        """
+        Args:
+            signal: Array of shape (channels, T)
+        """
+        signal = np.ascontiguousarray(signal, dtype=np.float32)
+        levels = [(signal, signal)]
+        mins, maxs = signal, signal
+        while mins.shape[1] > min_length:
+            # Pad the tail bin with its edge value so it reduces like a full bin
+            pad = -mins.shape[1] % factor
+            if pad:
+                mins = np.pad(mins, ((0, 0), (0, pad)), mode='edge')
+                maxs = np.pad(maxs, ((0, 0), (0, pad)), mode='edge')
+            mins = mins.reshape(mins.shape[0], -1, factor).min(axis=2)
+            maxs = maxs.reshape(maxs.shape[0], -1, factor).max(axis=2)
+            levels.append((mins, maxs))
+        return cls(levels, signal.shape[1], factor=factor, source_digest=source_digest)
+
+    def save(self, path):
+        """Write all levels into one .npz (no pickled objects)."""
+        arrays = {'length': np.int64(self.length), 'factor': np.int64(self.factor),
+                  'source_digest': np.str_(self.source_digest)}
+        arrays['level0'] = self.levels[0][0]
+        for level, (mins, maxs) in enumerate(self.levels[1:], start=1):
+            arrays[f'level{level}_min'] = mins
+            arrays[f'level{level}_max'] = maxs
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            signal = data['level0']
+            levels = [(signal, signal)]
+            level = 1
+            while f'level{level}_min' in data:
+                levels.append((data[f'level{level}_min'], data[f'level{level}_max']))
+                level += 1
+            return cls(levels, int(data['length']), factor=int(data['factor']),
+                       source_digest=str(data['source_digest']))
+
+    def level_for(self, start, end, max_points=DEFAULT_POINTS):
+        """Coarsest level needed so [start, end) fits in max_points (two points per bin above 0)."""
+        span = max(end - start, 1)
+        if span <= max_points:
+            return 0
+        level = 1
+        while level < len(self.levels) - 1 and span / self.factor ** level > max_points // 2:
+            level += 1
+        return level
+
+    def view(self, start=0, end=None, max_points=DEFAULT_POINTS):
+        """
+        Points to draw for samples [start, end), at most about max_points per channel.
+
+        Returns:
+            Tuple of (sample positions (N,), values (channels, N), level). Above level 0,
+            every bin contributes its min then its max, so peaks survive the reduction.
+        """
+        end = self.length if end is None else min(end, self.length)
+        start = max(0, min(start, end - 1))
+        level = self.level_for(start, end, max_points)
+
+        if level == 0:
+            return np.arange(start, end), self.levels[0][0][:, start:end], 0
+
+        bin_size = self.factor ** level
+        first, last = start // bin_size, -(-end // bin_size)
+        mins, maxs = self.levels[level]
+        values = np.empty((self.channels, last - first, 2), dtype=mins.dtype)
+        values[..., 0] = mins[:, first:last]
+        values[..., 1] = maxs[:, first:last]
+
+        # Min at the bin start, max at its middle: keeps x increasing for line plots
+        bins = np.arange(first, last) * bin_size
+        positions = np.stack([bins, bins + bin_size // 2], axis=1).ravel()
+        return positions, values.reshape(self.channels, -1), level
+
+
+def load_or_build(recording_path, load_signal):
+    """
+    The pyramid stored next to a recording, rebuilt (and saved) if missing or stale.
+
+    Args:
+        recording_path: Recording file (its hash is checked against the stored pyramid)
+        load_signal: Callable returning the (channels, T) signal for the recording
+
+    Returns:
+        MinMaxPyramid
+    """
+    path = pyramid_path(recording_path)
+    digest = _file_digest(recording_path)
+    if os.path.exists(path):
+        try:
+            pyramid = MinMaxPyramid.load(path)
+            if pyramid.source_digest == digest:
+                return pyramid
+        except Exception as e:
+            print(f"Rebuilding unreadable pyramid {path}: {e}")
+
+    pyramid = MinMaxPyramid.build(load_signal(), source_digest=digest)
+    try:
+        pyramid.save(path)
+    except OSError as e:
+        print(f"Could not store pyramid next to the recording: {e}")
+    return pyramid
+
+
+def plot_all_channels(pyramid, title, start=None, end=None, channel_names=None, max_points=DEFAULT_POINTS):
+    """
+    Matplotlib stack of all channels for a sample range (pyramid-backed version of the
+    notebook's plot_all_channels).
+
+    Returns:
+        The matplotlib figure (not registered with pyplot, so it is freed with its last
+        reference - nothing to close after rendering it)
+    """
+    from matplotlib.figure import Figure
+
+    positions, values, _ = pyramid.view(start or 0, end, max_points)
+    names = channel_names or [f"Channel {i}" for i in range(pyramid.channels)]
+    fig = Figure(figsize=(10, 2 * pyramid.channels))
+    axes = fig.subplots(nrows=pyramid.channels, ncols=1, sharex=True, squeeze=False)
+    for ax, channel, name in zip(axes[:, 0], values, names):
+        ax.plot(positions, channel, label=name, linewidth=0.8)
+        ax.set_ylabel(name)
+        ax.legend(loc="upper left")
+    axes[-1, 0].set_xlabel("Sample Index")
+    fig.suptitle(title)
+    return fig
@@ -0,0 +1,153 @@
+"""
+Inference Threading Policy
+
+Host-aware TensorFlow/BLAS thread settings, applied before TensorFlow loads:
+- "safe": single-threaded, MKL disabled (workaround for macOS mutex crashes)
+- "latency": a few intra-op threads for single-window predictions
+- "throughput": every available core for batched inference
+
+The profile defaults to "safe" on macOS and "latency" elsewhere, and can be
+overridden with the VOCL_TF_THREADS environment variable.
+"""
+
+import os
+import sys
+import platform
+
+PROFILE_ENV_VAR = 'VOCL_TF_THREADS'
+PROFILE_NAMES = ('latency', 'throughput', 'safe')
+
+# Profile that was applied last (None until apply_threading_profile runs)
+_active_profile = None
+
+
+def detect_host():
+    """
+    Detect the platform and the number of CPUs this process may run on.
+
+    Returns:
+        Dictionary with 'system', 'machine' and 'cpu_count'
+    """
+    try:
+        # Respects container/cgroup CPU affinity on Linux
+        cpu_count = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpu_count = os.cpu_count() or 1
+
+    return {
+        'system': platform.system(),
+        'machine': platform.machine(),
+        'cpu_count': max(1, cpu_count),
+    }
+
+
+def get_profile(name, host=None):
+    """
+    Resolve a named profile into concrete thread counts for this host.
+
+    Args:
+        name: One of "latency", "throughput", "safe"
+        host: Optional host info from detect_host()
+
+    Returns:
+        Dictionary with 'name', 'intra_op', 'inter_op', 'blas' and 'disable_mkl'
+    """
+    if name not in PROFILE_NAMES:
+        raise ValueError(f"Unknown threading profile '{name}' (expected one of {PROFILE_NAMES})")
+
+    cpus = (host or detect_host())['cpu_count']
+
+    if name == 'safe':
+        intra_op, inter_op, blas, disable_mkl = 1, 1, 1, True
+    elif name == 'latency':
+        # Small (4, 5) inputs stop scaling after a handful of threads
+        intra_op, inter_op, blas, disable_mkl = min(cpus, 4), 1, min(cpus, 4), False
+    else:
+        intra_op, inter_op, blas, disable_mkl = cpus, min(cpus, 2), cpus, False
+
+    return {
+        'name': name,
+        'intra_op': intra_op,
+        'inter_op': inter_op,
+        'blas': blas,
+        'disable_mkl': disable_mkl,
+    }
+
+
+def default_profile_name(host=None):
+    """Pick the profile from VOCL_TF_THREADS, or by platform if unset."""
+    name = os.environ.get(PROFILE_ENV_VAR, '').strip().lower()
+    if name in PROFILE_NAMES:
+        return name
+
+    host = host or detect_host()
+    return 'safe' if host['system'] == 'Darwin' else 'latency'
+
+
+def apply_threading_profile(name=None):
+    """
+    Apply a threading profile through environment variables.
+
+    Must run before TensorFlow is imported for the TF_* variables to take effect;
+    configure_tensorflow() handles the case where TensorFlow is already loaded.
+
+    Args:
+        name: Profile name (default: default_profile_name())
+
+    Returns:
+        The applied profile dictionary
+    """
+    global _active_profile
+
+    profile = get_profile(name or default_profile_name())
+
+    os.environ['OMP_NUM_THREADS'] = str(profile['blas'])
+    os.environ['OPENBLAS_NUM_THREADS'] = str(profile['blas'])
+    os.environ['MKL_NUM_THREADS'] = str(profile['blas'])
+    os.environ['TF_NUM_INTRAOP_THREADS'] = str(profile['intra_op'])
+    os.environ['TF_NUM_INTEROP_THREADS'] = str(profile['inter_op'])
+
+    if profile['disable_mkl']:
+        os.environ['TF_DISABLE_MKL'] = '1'  # Disable MKL threading
+    else:
+        os.environ.pop('TF_DISABLE_MKL', None)
+
+    _active_profile = profile
+
+    if 'tensorflow' in sys.modules:
+        configure_tensorflow(sys.modules['tensorflow'])
+
+    return profile
+
+
+def ensure_threading_profile():
+    """
+    Apply the default profile once per process; later calls (e.g. every Streamlit rerun
+    of a script that calls this at the top) return the active profile untouched.
+
+    Returns:
+        The active profile dictionary
+    """
+    return _active_profile or apply_threading_profile()
+
+
+def configure_tensorflow(tf):
+    """
+    Push the active profile into TensorFlow's threading config.
+
+    Args:
+        tf: The imported tensorflow module
+    """
+    profile = ensure_threading_profile()
+
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(profile['intra_op'])
+        tf.config.threading.set_inter_op_parallelism_threads(profile['inter_op'])
+    except RuntimeError:
+        # TensorFlow runtime already initialized - settings are fixed for this process
+        pass
+
+
+def get_active_profile():
+    """Get the profile applied in this process (None if none yet)."""
+    return _active_profile